@@ -3,7 +3,8 @@ from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils import timezone
 from django.http import HttpResponse
 import csv
-from .models import User, Unit, Profile, Location, AvailabilityReport, AccessRequest, OTPToken
+from .api.response_cache import invalidate_models
+from .models import User, Unit, Profile, Location, AvailabilityReport, AccessRequest, OTPToken, ScheduledJob, JobRun
 
 
 @admin.register(User)
@@ -22,7 +23,9 @@ class UserAdmin(BaseUserAdmin):
     @admin.action(description='Approve selected users')
     def approve_users(self, request, queryset):
         """Bulk approve users"""
-        updated = queryset.update(is_approved=True)
+        # update() skips auto_now; list validators rely on updated_at
+        updated = queryset.update(is_approved=True, updated_at=timezone.now())
+        invalidate_models(User)
         self.message_user(request, f'{updated} users approved successfully.')
     
     @admin.action(description='Export selected users to CSV')
@@ -112,33 +115,11 @@ class AccessRequestAdmin(admin.ModelAdmin):
     
     @admin.action(description='Approve selected access requests')
     def approve_requests(self, request, queryset):
-        """Bulk approve access requests"""
-        from core.api.views import send_approval_notification, generate_otp_token, send_otp_email
-        from datetime import timedelta
-        from django.conf import settings
+        """Bulk approve access requests (one transaction, emails batched after commit)"""
+        from core.approvals import bulk_approve_access_requests
         
-        count = 0
-        for access_request in queryset.filter(status='pending'):
-            access_request.approve(request.user)
-            send_approval_notification(access_request.user)
-            
-            # Generate and send OTP
-            otp_token = generate_otp_token()
-            expires_at = timezone.now() + timedelta(minutes=settings.OTP_EXPIRY_MINUTES)
-            otp = OTPToken.objects.create(
-                user=access_request.user,
-                token=otp_token,
-                purpose='login',
-                expires_at=expires_at
-            )
-            email_sent, error_msg = send_otp_email(access_request.user, otp_token, purpose='login')
-            if not email_sent:
-                import logging
-                logger = logging.getLogger('core')
-                logger.error(f"Failed to send OTP email to {access_request.user.email}: {error_msg}")
-            count += 1
-        
-        self.message_user(request, f'{count} access requests approved successfully.')
+        result = bulk_approve_access_requests(queryset.values_list('id', flat=True), request.user)
+        self.message_user(request, f"{len(result['approved'])} access requests approved successfully.")
     
     @admin.action(description='Reject selected access requests')
     def reject_requests(self, request, queryset):
@@ -171,3 +152,60 @@ class OTPTokenAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('user')
+
+
+class JobRunInline(admin.TabularInline):
+    model = JobRun
+    extra = 0
+    can_delete = False
+    fields = ('started_at', 'trigger', 'status', 'duration_ms', 'worker', 'result')
+    readonly_fields = fields
+    ordering = ('-started_at',)
+    
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ScheduledJob)
+class ScheduledJobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'schedule', 'enabled', 'next_run_at', 'last_run_at', 'run_requested', 'locked_by', 'locked_until')
+    list_filter = ('enabled', 'run_requested')
+    search_fields = ('name',)
+    readonly_fields = ('name', 'schedule', 'last_run_at', 'locked_by', 'locked_until', 'created_at', 'updated_at')
+    actions = ['run_now', 'queue_run']
+    
+    @admin.action(description='Run selected jobs now')
+    def run_now(self, request, queryset):
+        """Run jobs immediately in this request, respecting leases"""
+        from core.scheduler import get_registered_jobs, acquire_lease, run_job, default_worker_id
+        
+        registry = get_registered_jobs()
+        worker_id = f"admin:{request.user.username}:{default_worker_id()}"
+        for job in queryset:
+            if job.name not in registry:
+                self.message_user(request, f'{job.name}: not registered in core/jobs.py', level='error')
+            elif not acquire_lease(job, worker_id):
+                self.message_user(request, f'{job.name}: already running on {job.locked_by}', level='warning')
+            else:
+                run = run_job(job, registry[job.name], worker_id, trigger='manual')
+                self.message_user(request, f'{job.name}: {run.status} in {run.duration_ms} ms')
+    
+    @admin.action(description='Queue selected jobs for the scheduler\'s next tick')
+    def queue_run(self, request, queryset):
+        """Ask the running scheduler to run jobs on its next tick"""
+        updated = queryset.update(run_requested=True)
+        self.message_user(request, f'{updated} jobs queued.')
+    
+    def get_inlines(self, request, obj):
+        return [JobRunInline] if obj else []
+
+
+@admin.register(JobRun)
+class JobRunAdmin(admin.ModelAdmin):
+    list_display = ('job', 'trigger', 'status', 'started_at', 'duration_ms', 'worker')
+    list_filter = ('status', 'trigger', 'job')
+    date_hierarchy = 'started_at'
+    readonly_fields = ('job', 'trigger', 'status', 'worker', 'started_at', 'finished_at', 'duration_ms', 'result', 'error')
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('job')
@@ -0,0 +1,80 @@
+"""
+Conditional GET for list endpoints.
+
+ListValidator derives an ETag and Last-Modified for a list from one
+aggregate query over the same (RBAC-filtered) queryset the view serializes:
+row count plus max(updated_at) of the rows and of every related table whose
+fields appear in the output. The ETag also covers the requesting user's
+visibility scope, the query string and the negotiated format. When the
+client's If-None-Match / If-Modified-Since still match, the view answers 304
+without serializing anything.
+
+Writes that bypass save() (queryset.update()) must set updated_at themselves
+or the validators will not notice them. Deletions change the row count, so
+they invalidate the ETag but not Last-Modified; clients that send both
+headers are judged on the ETag alone (RFC 9110).
+"""
+import hashlib
+from datetime import datetime
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from core.permissions import visibility_scope
+
+
+class ListValidator:
+    """Validators for `queryset`, whose output also shows fields of the `related` paths"""
+
+    def __init__(self, request, queryset, related=()):
+        self.request = request
+        aggregates = {'count': Count('pk'), 'latest': Max('updated_at')}
+        for path in related:
+            aggregates[f'latest_{path}'] = Max(f'{path}__updated_at')
+        values = queryset.order_by().aggregate(**aggregates)
+
+        timestamps = [value for value in values.values() if isinstance(value, datetime)]
+        self.last_modified = max(timestamps).timestamp() if timestamps else None
+
+        renderer = getattr(request, 'accepted_renderer', None)
+        key = repr((
+            visibility_scope(request.user), request.get_full_path(), getattr(renderer, 'format', None),
+            sorted((name, str(value)) for name, value in values.items()),
+        ))
+        self.etag = f'"{hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()}"'
+
+    def not_modified(self):
+        """Return a 304 (or 412) response if the client's copy is current, else None"""
+        response = get_conditional_response(
+            self.request,
+            etag=self.etag,
+            last_modified=int(self.last_modified) if self.last_modified is not None else None,
+        )
+        return self.apply(response) if response is not None else None
+
+    def apply(self, response):
+        """Attach the validators to a 200 or 304; clients must revalidate before reusing their copy"""
+        if response.status_code in (200, 304):
+            response['ETag'] = self.etag
+            if self.last_modified is not None:
+                response['Last-Modified'] = http_date(self.last_modified)
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ('Accept', 'Authorization'))
+        return response
+
+
+class ConditionalListMixin:
+    """ViewSet mixin: conditional GET on list(); `conditional_related` names related paths shown in the output"""
+    conditional_related = ()
+
+    def get_conditional_queryset(self):
+        """Rows whose changes can alter the list (defaults to the filtered list queryset)"""
+        return self.filter_queryset(self.get_queryset())
+
+    def list(self, request, *args, **kwargs):
+        validator = ListValidator(request, self.get_conditional_queryset(), self.conditional_related)
+        not_modified = validator.not_modified()
+        if not_modified is not None:
+            return not_modified
+        return validator.apply(super().list(request, *args, **kwargs))
@@ -0,0 +1,139 @@
+"""
+Eager loading derived from serializer field sources.
+
+EagerLoadingMixin walks a serializer's declared fields (dotted `source=`
+paths and nested serializers) once per class and turns the relations they
+traverse into select_related / prefetch_related paths. Relations read only
+inside SerializerMethodFields cannot be discovered and are declared with
+`eager_select_related` / `eager_prefetch_related`.
+
+With settings.SERIALIZER_QUERY_CHECKS (on under tests), serializing a list
+fails loudly if any row issues a query, so a new field that forgets its
+relation shows up as a test failure instead of an N+1 in production.
+"""
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connection
+from django.db.models import QuerySet
+from django.db.models.manager import BaseManager
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers
+
+
+def _follow_relations(model, attrs, prefix, in_prefetch, select, prefetch, back_relation=None):
+    """
+    Add the relations along attrs (starting at model) to select/prefetch.
+    Returns (model, path, in_prefetch, relation) where the relation chain ended,
+    or None if no relation was traversed.
+    """
+    path = prefix
+    followed = None
+    for attr in attrs:
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            break
+        if not field.is_relation:
+            break
+        if followed is None and back_relation is not None and field.remote_field is back_relation:
+            # Pointing back to the parent object, which Django already caches
+            break
+        path = f'{path}__{attr}' if path else attr
+        # Once a path goes through a to-many relation everything below it is prefetched
+        in_prefetch = in_prefetch or field.many_to_many or field.one_to_many
+        (prefetch if in_prefetch else select).add(path)
+        model = field.related_model
+        followed = field
+    return (model, path, in_prefetch, followed) if followed else None
+
+
+def _collect_eager_paths(serializer, model, prefix, in_prefetch, select, prefetch, back_relation=None):
+    for hint_paths, many in (
+        (getattr(serializer, 'eager_select_related', ()), False),
+        (getattr(serializer, 'eager_prefetch_related', ()), True),
+    ):
+        for hint in hint_paths:
+            _follow_relations(model, hint.split('__'), prefix, in_prefetch or many, select, prefetch)
+
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+        attrs = field.source_attrs
+        if isinstance(field, serializers.RelatedField) and field.use_pk_only_optimization():
+            # Primary key fields read the local <name>_id column
+            attrs = attrs[:-1]
+        end = _follow_relations(model, attrs, prefix, in_prefetch, select, prefetch, back_relation)
+        if end is None:
+            continue
+        if isinstance(field, serializers.ListSerializer):
+            field = field.child
+        if isinstance(field, serializers.BaseSerializer):
+            related_model, path, nested_in_prefetch, relation = end
+            _collect_eager_paths(field, related_model, path, nested_in_prefetch, select, prefetch, relation)
+
+
+class EagerLoadingListSerializer(serializers.ListSerializer):
+    """List serializer that eager-loads querysets and (in test mode) forbids per-row queries"""
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, BaseManager) else data
+        if isinstance(iterable, QuerySet) and iterable._result_cache is None:
+            iterable = self.child.setup_eager_loading(iterable)
+        if not getattr(settings, 'SERIALIZER_QUERY_CHECKS', False):
+            return [self.child.to_representation(item) for item in iterable]
+
+        items = list(iterable)
+        with CaptureQueriesContext(connection) as queries:
+            result = [self.child.to_representation(item) for item in items]
+        if queries.captured_queries:
+            raise AssertionError(
+                f"{type(self.child).__name__} issued {len(queries.captured_queries)} queries while "
+                f"serializing {len(items)} rows; load the relation eagerly (first query: "
+                f"{queries.captured_queries[0]['sql']})"
+            )
+        return result
+
+
+class EagerLoadingMixin:
+    """
+    Serializer mixin: setup_eager_loading(queryset) applies the select_related /
+    prefetch_related paths needed by the declared fields. Lists serialized with
+    many=True are eager-loaded automatically when given an unevaluated queryset.
+    """
+    eager_select_related = ()
+    eager_prefetch_related = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        meta = cls.__dict__.get('Meta')
+        if meta is not None and not hasattr(meta, 'list_serializer_class'):
+            meta.list_serializer_class = EagerLoadingListSerializer
+
+    @classmethod
+    def get_eager_paths(cls):
+        """Return (select_related, prefetch_related) path lists, computed once per class"""
+        if '_eager_paths' not in cls.__dict__:
+            select, prefetch = set(), set()
+            _collect_eager_paths(cls(), cls.Meta.model, '', False, select, prefetch)
+            cls._eager_paths = (sorted(select), sorted(prefetch))
+        return cls._eager_paths
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        select, prefetch = cls.get_eager_paths()
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
+
+
+class EagerLoadingViewSetMixin:
+    """ViewSet mixin: eager-load get_queryset() for the view's serializer class"""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if hasattr(serializer_class, 'setup_eager_loading'):
+            queryset = serializer_class.setup_eager_loading(queryset)
+        return queryset
@@ -0,0 +1,118 @@
+"""
+Read-only fast path for large list endpoints.
+
+A FastReadSerializer declares its output fields once as ORM lookup paths.
+They compile to a single values_list() projection (joins included), and
+each row is turned into a plain dict without creating model instances or
+DRF field objects per row. Choice labels come from lookup tables built once
+per class. Dates and datetimes are formatted exactly as DRF does, so the
+JSON stays identical to the matching ModelSerializer's output.
+"""
+from rest_framework import fields as drf_fields
+
+
+class Display:
+    """Output the display label of a choices field (like get_<field>_display)"""
+
+    def __init__(self, path):
+        self.path = path
+
+
+class Nested:
+    """Output a nested object from a related model, or None if the relation is empty"""
+
+    def __init__(self, serializer, path):
+        self.serializer = serializer
+        self.path = path
+
+
+def _resolve_field(model, path):
+    """Return the model field at the end of an ORM lookup path"""
+    field = None
+    for attr in path.split('__'):
+        field = model._meta.get_field(attr)
+        if field.is_relation and attr != path.split('__')[-1]:
+            model = field.related_model
+    return field
+
+
+def _converter(field):
+    """Per-value formatter matching DRF's ModelSerializer output for this field"""
+    internal_type = field.get_internal_type()
+    if internal_type == 'DateTimeField':
+        return drf_fields.DateTimeField().to_representation
+    if internal_type == 'DateField':
+        return drf_fields.DateField().to_representation
+    return None
+
+
+class FastReadSerializer:
+    """
+    Declare `model` and `fields`: an ordered mapping of output name to an ORM
+    path ('user__email'), Display('status') or Nested(OtherFastSerializer, 'profile').
+    """
+    model = None
+    fields = {}
+
+    @classmethod
+    def _compile(cls, model, prefix, paths):
+        """Build the row -> dict plan for this class, appending value paths to `paths`"""
+        plan = []
+        for name, spec in cls.fields.items():
+            if isinstance(spec, Nested):
+                relation = model._meta.get_field(spec.path)
+                nested_prefix = f'{prefix}{spec.path}__'
+                pk_index = len(paths)
+                paths.append(f'{nested_prefix}{relation.related_model._meta.pk.name}')
+                nested_plan = spec.serializer._compile(relation.related_model, nested_prefix, paths)
+                plan.append((name, 'nested', pk_index, nested_plan))
+                continue
+            if isinstance(spec, Display):
+                field = _resolve_field(model, spec.path)
+                labels = {value: str(label) for value, label in field.flatchoices}
+                path = spec.path
+                convert = lambda value, labels=labels: labels.get(value, value)
+            else:
+                path = spec
+                convert = _converter(_resolve_field(model, path))
+            plan.append((name, 'value', len(paths), convert))
+            paths.append(f'{prefix}{path}')
+        return plan
+
+    @classmethod
+    def get_plan(cls):
+        """Return (value paths, row plan), compiled once per class"""
+        if '_plan' not in cls.__dict__:
+            paths = []
+            plan = cls._compile(cls.model, '', paths)
+            cls._plan = (paths, plan)
+        return cls._plan
+
+    @classmethod
+    def project(cls, queryset):
+        """Return the values_list() queryset that feeds to_rows()"""
+        paths, plan = cls.get_plan()
+        return queryset.values_list(*paths)
+
+    @classmethod
+    def _build(cls, plan, row):
+        item = {}
+        for name, kind, index, extra in plan:
+            value = row[index]
+            if kind == 'nested':
+                item[name] = None if value is None else cls._build(extra, row)
+            elif extra is None or value is None:
+                item[name] = value
+            else:
+                item[name] = extra(value)
+        return item
+
+    @classmethod
+    def to_rows(cls, rows):
+        """Turn projected tuples into output dicts"""
+        paths, plan = cls.get_plan()
+        return [cls._build(plan, row) for row in rows]
+
+    @classmethod
+    def serialize(cls, queryset):
+        return cls.to_rows(cls.project(queryset))
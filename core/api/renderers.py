@@ -0,0 +1,144 @@
+import codecs
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser, get_encoding
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the stock json-based classes
+    orjson = None
+
+_drf_default = JSONEncoder().default
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Renderer for Server-Sent Events endpoints.
+    Streaming views return their own response; this only lets clients send
+    `Accept: text/event-stream` and renders error payloads as JSON.
+    """
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return json.dumps(data, cls=DjangoJSONEncoder).encode(self.charset)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson when it is installed.
+    Output is byte-for-byte what JSONRenderer produces: values orjson would
+    format differently (datetimes, Decimals, lazy translation strings,
+    querysets, ...) go through DRF's JSONEncoder.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            # Pretty-printed or ASCII-only output is left to the json module
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data,
+            default=_drf_default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        )
+        # Same escaping as JSONRenderer, keeping the output a strict javascript subset
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser backed by orjson for UTF-8 request bodies"""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = get_encoding(parser_context or {})
+        # orjson reads UTF-8 only and always rejects NaN/Infinity, as strict mode does
+        if orjson is None or not self.strict or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+# A string column is dictionary-encoded when it has at most this many distinct
+# values and at most one distinct value per two rows
+COLUMNAR_DICTIONARY_MAX_SIZE = 256
+
+
+def _is_rows(value):
+    return isinstance(value, list) and all(isinstance(item, dict) for item in value)
+
+
+def _flatten(item, prefix, out):
+    for key, value in item.items():
+        name = f'{prefix}{key}'
+        if isinstance(value, dict):
+            _flatten(value, f'{name}.', out)
+        else:
+            out[name] = value
+    return out
+
+
+def to_columnar(items):
+    """
+    Turn a list of dicts into {'columns', 'dictionaries', 'rows'}.
+    Nested objects become dotted columns ('profile.role'); a nested object that
+    was null has all its columns null. Values of dictionary-encoded columns are
+    indexes into dictionaries[column] (null stays null).
+    """
+    flat = [_flatten(item, '', {}) for item in items]
+    columns = dict.fromkeys(name for item in flat for name in item)
+    # A null nested object shows up as its own column next to its dotted ones
+    parents = {name.rsplit('.', 1)[0] for name in columns if '.' in name}
+    columns = [name for name in columns if name not in parents]
+    dictionaries = {}
+    values_by_column = []
+    for name in columns:
+        values = [item.get(name) for item in flat]
+        if not all(value is None or isinstance(value, str) for value in values):
+            values_by_column.append(values)
+            continue
+        distinct = dict.fromkeys(value for value in values if value is not None)
+        if distinct and len(distinct) <= COLUMNAR_DICTIONARY_MAX_SIZE and len(distinct) * 2 <= len(values):
+            index = {value: position for position, value in enumerate(distinct)}
+            dictionaries[name] = list(distinct)
+            values = [None if value is None else index[value] for value in values]
+        values_by_column.append(values)
+    return {
+        'columns': columns,
+        'dictionaries': dictionaries,
+        'rows': [list(row) for row in zip(*values_by_column)],
+    }
+
+
+class ColumnarJSONRenderer(FastJSONRenderer):
+    """
+    Opt-in `?format=columnar` rendering of list responses.
+    A list, or the `results` of a {'count', 'results', ...} payload, is sent as
+    columns plus row arrays (see to_columnar); other keys are kept as they are.
+    Anything else (single objects, errors) renders as plain JSON.
+    """
+    format = 'columnar'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if _is_rows(data):
+            data = to_columnar(data)
+        elif isinstance(data, dict) and _is_rows(data.get('results')):
+            data = {
+                **{key: value for key, value in data.items() if key != 'results'},
+                **to_columnar(data['results']),
+            }
+        return super().render(data, accepted_media_type, renderer_context)
@@ -0,0 +1,88 @@
+"""
+Per-view response cache keyed by visibility scope.
+
+cache_response(*models) caches a view's response data under a key built
+from the caller's visibility scope (core.permissions.visibility_scope: role
+and unit for managers, the user for everyone else), the view, the
+normalized query string, the negotiated format and a version counter per
+model the response is built from. Managers of the same unit therefore share
+one entry.
+
+Entries are never deleted: saving or deleting a model bumps its version on
+the cache bus (see core.signals and core.cachebus), so every key that
+included the old version simply stops being read, in every worker, and
+expires after RESPONSE_CACHE_TIMEOUT. Writes that bypass signals
+(queryset.update(), bulk_create) call invalidate_models() themselves.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from core.cachebus import cache_bus, model_namespace
+from core.permissions import visibility_scope
+
+CACHED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control', 'Vary')
+
+
+def get_model_versions(models):
+    """Return the current cache bus version of each model"""
+    return cache_bus.versions([model_namespace(model) for model in models])
+
+
+def invalidate_models(*models):
+    """Bump the version of each model once the current transaction commits"""
+    cache_bus.bump(*[model_namespace(model) for model in models])
+
+
+def response_cache_key(request, view_name, models):
+    query = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+    renderer = getattr(request, 'accepted_renderer', None)
+    key = repr((
+        view_name, visibility_scope(request.user), query,
+        getattr(renderer, 'format', None), get_model_versions(models),
+    ))
+    return f'response-cache:{hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()}'
+
+
+def cache_response(*models, timeout=None):
+    """
+    Cache successful responses of a DRF view (function view or ViewSet action)
+    per visibility scope. `models` are the models the response is built from.
+    Apply below @api_view / @action so the caller is already authenticated.
+    """
+    def decorator(view_func):
+        view_name = f'{view_func.__module__}.{view_func.__qualname__}'
+
+        @wraps(view_func)
+        def wrapper(*args, **kwargs):
+            request = next(arg for arg in args if isinstance(arg, Request))
+            key = response_cache_key(request, view_name, models)
+            entry = cache.get(key)
+            if entry is not None:
+                response = Response(entry['data'], status=entry['status'])
+                for name, value in entry['headers'].items():
+                    response[name] = value
+                not_modified = get_conditional_response(
+                    request,
+                    etag=response.get('ETag'),
+                    last_modified=parse_http_date_safe(response.get('Last-Modified', '')),
+                    response=response,
+                )
+                return not_modified if not_modified is not None else response
+
+            response = view_func(*args, **kwargs)
+            if response.status_code == 200 and isinstance(response, Response):
+                cache.set(key, {
+                    'data': response.data,
+                    'status': response.status_code,
+                    'headers': {name: response[name] for name in CACHED_HEADERS if response.has_header(name)},
+                }, timeout if timeout is not None else settings.RESPONSE_CACHE_TIMEOUT)
+            return response
+        return wrapper
+    return decorator
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate, get_user_model
 from django.contrib.auth.password_validation import validate_password
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
 from core.models import (
@@ -12,12 +13,15 @@ from core.models import (
     AccessRequest, 
     OTPToken
 )
+from core.users import get_user_by_email
+from core.api.eager import EagerLoadingMixin
+from core.api.fast import FastReadSerializer, Display, Nested
 from django.conf import settings
 
 User = get_user_model()
 
 
-class LocationSerializer(serializers.ModelSerializer):
+class LocationSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for Location model"""
     location_type_display = serializers.CharField(source='get_location_type_display', read_only=True)
     
@@ -30,8 +34,24 @@ class LocationSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class UnitSerializer(serializers.ModelSerializer):
+class LocationFastSerializer(FastReadSerializer):
+    """Read-only projection of LocationSerializer"""
+    model = Location
+    fields = {
+        'id': 'id',
+        'name': 'name',
+        'name_he': 'name_he',
+        'location_type': 'location_type',
+        'location_type_display': Display('location_type'),
+        'region': 'region',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    }
+
+
+class UnitSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for Unit model"""
+    eager_prefetch_related = ('children',)
     parent_name = serializers.CharField(source='parent.name', read_only=True)
     children_count = serializers.SerializerMethodField()
     
@@ -47,7 +67,7 @@ class UnitSerializer(serializers.ModelSerializer):
         return obj.children.count()
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for Profile model"""
     user_username = serializers.CharField(source='user.username', read_only=True)
     user_email = serializers.CharField(source='user.email', read_only=True)
@@ -74,7 +94,35 @@ class ProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class UserSerializer(serializers.ModelSerializer):
+class ProfileFastSerializer(FastReadSerializer):
+    """Read-only projection of ProfileSerializer"""
+    model = Profile
+    fields = {
+        'id': 'id',
+        'user': 'user',
+        'user_username': 'user__username',
+        'user_email': 'user__email',
+        'user_first_name': 'user__first_name',
+        'user_last_name': 'user__last_name',
+        'user_phone': 'user__phone',
+        'unit': 'unit',
+        'unit_name': 'unit__name',
+        'unit_name_he': 'unit__name_he',
+        'role': 'role',
+        'role_display': Display('role'),
+        'service_type': 'service_type',
+        'address': 'address',
+        'city': 'city',
+        'city_name': 'city__name',
+        'city_name_he': 'city__name_he',
+        'contact_name': 'contact_name',
+        'contact_phone': 'contact_phone',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    }
+
+
+class UserSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Basic user serializer"""
     profile = ProfileSerializer(read_only=True)
     
@@ -91,6 +139,26 @@ class UserSerializer(serializers.ModelSerializer):
         ]
 
 
+class UserFastSerializer(FastReadSerializer):
+    """Read-only projection of UserSerializer"""
+    model = User
+    fields = {
+        'id': 'id',
+        'username': 'username',
+        'email': 'email',
+        'first_name': 'first_name',
+        'last_name': 'last_name',
+        'phone': 'phone',
+        'is_approved': 'is_approved',
+        'is_staff': 'is_staff',
+        'is_superuser': 'is_superuser',
+        'date_joined': 'date_joined',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+        'profile': Nested(ProfileFastSerializer, 'profile'),
+    }
+
+
 class UserSignupSerializer(serializers.ModelSerializer):
     """Serializer for user registration"""
     password = serializers.CharField(
@@ -140,8 +208,8 @@ class UserSignupSerializer(serializers.ModelSerializer):
         }
     
     def validate_email(self, value):
-        """Ensure email is unique"""
-        if User.objects.filter(email=value).exists():
+        """Ensure email is unique (case-insensitive)"""
+        if get_user_by_email(value, self.context.get('request')):
             raise serializers.ValidationError("A user with this email already exists.")
         return value
     
@@ -152,78 +220,81 @@ class UserSignupSerializer(serializers.ModelSerializer):
             if attrs['password'] != attrs['password2']:
                 raise serializers.ValidationError({"password": "Password fields didn't match."})
         
+        # Keep the loaded objects so create() does not fetch them again
         unit_id = attrs.get('unit_id')
         if unit_id:
-            try:
-                Unit.objects.get(id=unit_id)
-            except Unit.DoesNotExist:
+            attrs['unit'] = Unit.objects.filter(id=unit_id).first()
+            if attrs['unit'] is None:
                 raise serializers.ValidationError({"unit_id": "Unit does not exist."})
         
         city_id = attrs.get('city_id')
         if city_id:
-            try:
-                Location.objects.get(id=city_id)
-            except Location.DoesNotExist:
+            attrs['city'] = Location.objects.filter(id=city_id).first()
+            if attrs['city'] is None:
                 raise serializers.ValidationError({"city_id": "City does not exist."})
         
         return attrs
     
+    @staticmethod
+    def generate_username(email):
+        """Email prefix as username, suffixed with the first free counter (one query)"""
+        username_base = email.split('@')[0] if email else 'user'
+        taken = set(User.objects.filter(username__startswith=username_base).values_list('username', flat=True))
+        username = username_base
+        counter = 1
+        while username in taken:
+            username = f"{username_base}{counter}"
+            counter += 1
+        return username
+    
     def create(self, validated_data):
-        """Create user, profile, and access request"""
+        """Create user, profile, and access request in one transaction"""
         # Get password (or generate one if not provided - for OTP-based systems)
         password = validated_data.pop('password', None)
         validated_data.pop('password2', None)
-        unit_id = validated_data.pop('unit_id', None)
+        validated_data.pop('unit_id', None)
+        validated_data.pop('city_id', None)
+        unit = validated_data.pop('unit', None)
+        city = validated_data.pop('city', None)
         role = validated_data.pop('role', 'user')
         service_type = validated_data.pop('service_type', '')
         address = validated_data.pop('address', '')
-        city_id = validated_data.pop('city_id', None)
         contact_name = validated_data.pop('contact_name', '')
         contact_phone = validated_data.pop('contact_phone', '')
         
         # Generate username from email if not provided
-        if 'username' not in validated_data or not validated_data.get('username'):
-            email = validated_data.get('email', '')
-            # Use email prefix as username, or generate unique one
-            username_base = email.split('@')[0] if email else 'user'
-            username = username_base
-            counter = 1
-            while User.objects.filter(username=username).exists():
-                username = f"{username_base}{counter}"
-                counter += 1
-            validated_data['username'] = username
+        if not validated_data.get('username'):
+            validated_data['username'] = self.generate_username(validated_data.get('email', ''))
         
         # Generate random password if not provided (users will use OTP to login)
         if not password:
             import secrets
             password = secrets.token_urlsafe(32)  # Generate secure random password
         
-        # Create user
-        user = User.objects.create_user(**validated_data)
-        user.set_password(password)
-        user.is_active = True
-        user.is_approved = False  # Requires admin approval
-        user.save()
-        
-        # Create profile
-        unit = Unit.objects.get(id=unit_id) if unit_id else None
-        city = Location.objects.get(id=city_id) if city_id else None
-        Profile.objects.create(
-            user=user,
-            unit=unit,
-            role=role,
-            service_type=service_type,
-            address=address,
-            city=city,
-            contact_name=contact_name,
-            contact_phone=contact_phone
-        )
-        
-        # Create access request
-        AccessRequest.objects.create(
-            user=user,
-            status='pending'
-        )
+        with transaction.atomic():
+            # Password is hashed once, user inserted once
+            user = User.objects.create_user(
+                password=password,
+                is_active=True,
+                is_approved=False,  # Requires admin approval
+                **validated_data
+            )
+            
+            Profile.objects.create(
+                user=user,
+                unit=unit,
+                role=role,
+                service_type=service_type,
+                address=address,
+                city=city,
+                contact_name=contact_name,
+                contact_phone=contact_phone
+            )
+            
+            self.access_request = AccessRequest.objects.create(
+                user=user,
+                status='pending'
+            )
         
         return user
 
@@ -238,9 +309,8 @@ class UserLoginSerializer(serializers.Serializer):
         password = attrs.get('password')
         
         if email and password:
-            try:
-                user = User.objects.get(email=email)
-            except User.DoesNotExist:
+            user = get_user_by_email(email, self.context.get('request'))
+            if not user:
                 raise serializers.ValidationError('Invalid credentials.')
             
             user = authenticate(
@@ -268,9 +338,8 @@ class OTPSerializer(serializers.Serializer):
     
     def validate_email(self, value):
         """Ensure user exists and is approved"""
-        try:
-            user = User.objects.get(email=value)
-        except User.DoesNotExist:
+        user = get_user_by_email(value, self.context.get('request'))
+        if not user:
             raise serializers.ValidationError("User with this email does not exist.")
         
         if not user.is_approved:
@@ -285,32 +354,24 @@ class OTPVerifySerializer(serializers.Serializer):
     token = serializers.CharField(max_length=6, min_length=6)
     
     def validate(self, attrs):
+        """Consumes the OTP: a valid code can only be verified once"""
         email = attrs.get('email')
         token = attrs.get('token')
         
-        try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
-            raise serializers.ValidationError({"email": "User with this email does not exist."})
-        
-        # Find valid, unused OTP
-        otp = OTPToken.objects.filter(
-            user=user,
-            token=token,
-            used=False,
-            expires_at__gt=timezone.now()
-        ).order_by('-created_at').first()
-        
-        if not otp:
+        user = OTPToken.consume(email, token)
+        if user is None:
+            # Failure path only: work out which error to report
+            if not get_user_by_email(email, self.context.get('request')):
+                raise serializers.ValidationError({"email": "User with this email does not exist."})
             raise serializers.ValidationError({"token": "Invalid or expired OTP code."})
         
         attrs['user'] = user
-        attrs['otp'] = otp
         return attrs
 
 
-class AvailabilityReportSerializer(serializers.ModelSerializer):
+class AvailabilityReportSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for AvailabilityReport"""
+    eager_select_related = ('location',)
     user_username = serializers.CharField(source='user.username', read_only=True)
     user_email = serializers.CharField(source='user.email', read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
@@ -341,7 +402,101 @@ class AvailabilityReportSerializer(serializers.ModelSerializer):
         return value
 
 
-class AccessRequestSerializer(serializers.ModelSerializer):
+class AvailabilityReportFastSerializer(FastReadSerializer):
+    """Read-only projection of AvailabilityReportSerializer"""
+    model = AvailabilityReport
+    fields = {
+        'id': 'id',
+        'user': 'user',
+        'user_username': 'user__username',
+        'user_email': 'user__email',
+        'date': 'date',
+        'status': 'status',
+        'status_display': Display('status'),
+        'location': 'location',
+        'location_name': 'location__name',
+        'location_text': 'location_text',
+        'notes': 'notes',
+        'submitted_at': 'submitted_at',
+        'updated_at': 'updated_at',
+    }
+
+
+class AvailabilityReportRangeSerializer(serializers.Serializer):
+    """Serializer for submitting the same availability for a range of days"""
+    MAX_RANGE_DAYS = 366
+    
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+    status = serializers.ChoiceField(choices=AvailabilityReport.STATUS_CHOICES)
+    location = serializers.PrimaryKeyRelatedField(
+        queryset=Location.objects.all(), required=False, allow_null=True
+    )
+    location_text = serializers.CharField(max_length=200, required=False, allow_blank=True, default='')
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+    
+    def validate(self, attrs):
+        """Ensure the range is ordered, bounded and not in the future"""
+        if attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError({"date_to": "End date must be on or after start date."})
+        if attrs['date_to'] > timezone.now().date():
+            raise serializers.ValidationError({"date_to": "Date cannot be in the future."})
+        if (attrs['date_to'] - attrs['date_from']).days + 1 > self.MAX_RANGE_DAYS:
+            raise serializers.ValidationError(
+                {"date_to": f"Range cannot exceed {self.MAX_RANGE_DAYS} days."}
+            )
+        return attrs
+
+
+class ReportSyncMutationSerializer(serializers.Serializer):
+    """A single queued report change made by an offline client"""
+    date = serializers.DateField()
+    status = serializers.ChoiceField(choices=AvailabilityReport.STATUS_CHOICES, required=False, default='pending')
+    location = serializers.PrimaryKeyRelatedField(
+        queryset=Location.objects.all(), required=False, allow_null=True
+    )
+    location_text = serializers.CharField(max_length=200, required=False, allow_blank=True, default='')
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+    deleted = serializers.BooleanField(required=False, default=False)
+    client_updated_at = serializers.DateTimeField()
+    
+    def validate_date(self, value):
+        """Ensure date is not in the future"""
+        if value > timezone.now().date():
+            raise serializers.ValidationError("Date cannot be in the future.")
+        return value
+
+
+class ReportSyncSerializer(serializers.Serializer):
+    """Serializer for a batch of queued offline report changes"""
+    MAX_MUTATIONS = 500
+    
+    mutations = ReportSyncMutationSerializer(many=True)
+    
+    def validate_mutations(self, value):
+        """Ensure the batch is bounded"""
+        if len(value) > self.MAX_MUTATIONS:
+            raise serializers.ValidationError(f"Cannot sync more than {self.MAX_MUTATIONS} changes at once.")
+        return value
+
+
+class ReportReminderSerializer(serializers.Serializer):
+    """Serializer for reminding users who have not reported for a date"""
+    date = serializers.DateField(required=False)
+    unit_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+
+class AccessRequestBulkApproveSerializer(serializers.Serializer):
+    """Serializer for approving many access requests at once"""
+    MAX_IDS = 1000
+    
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), min_length=1, max_length=MAX_IDS
+    )
+    send_otp = serializers.BooleanField(default=True)
+
+
+class AccessRequestSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for AccessRequest - includes all user and profile details for approval"""
     # User fields from registration
     user_username = serializers.CharField(source='user.username', read_only=True)
@@ -1,19 +1,28 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import TokenRefreshView
 from .views import (
     # Authentication
     register_view,
     login_view,
     request_otp_view,
     verify_otp_view,
+    ThrottledTokenRefreshView,
+    # User Import
+    import_users_view,
     # Access Requests
     list_access_requests_view,
     approve_access_request_view,
+    bulk_approve_access_requests_view,
     reject_access_request_view,
     # Reports
     list_reports_view,
     create_report_view,
+    upsert_my_report_view,
+    submit_report_range_view,
+    sync_reports_view,
+    report_changes_view,
+    report_stream_view,
+    remind_non_reporters_view,
     export_reports_view,
     # Alerts
     send_alert_view,
@@ -42,16 +51,26 @@ urlpatterns = [
     path('auth/login/', login_view, name='login'),
     path('auth/request-otp/', request_otp_view, name='request-otp'),
     path('auth/verify-otp/', verify_otp_view, name='verify-otp'),
-    path('auth/token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
+    path('auth/token/refresh/', ThrottledTokenRefreshView.as_view(), name='token-refresh'),
+    
+    # User import (staff)
+    path('users/import/', import_users_view, name='import-users'),
     
     # Access Request endpoints
     path('access-requests/', list_access_requests_view, name='list-access-requests'),
+    path('access-requests/bulk-approve/', bulk_approve_access_requests_view, name='bulk-approve-access-requests'),
     path('access-requests/<int:request_id>/approve/', approve_access_request_view, name='approve-access-request'),
     path('access-requests/<int:request_id>/reject/', reject_access_request_view, name='reject-access-request'),
     
     # Reports endpoints
     path('reports/', list_reports_view, name='list-reports'),
     path('reports/create/', create_report_view, name='create-report'),
+    path('reports/me/<str:report_date>/', upsert_my_report_view, name='upsert-my-report'),
+    path('reports/range/', submit_report_range_view, name='submit-report-range'),
+    path('reports/sync/', sync_reports_view, name='sync-reports'),
+    path('reports/changes/', report_changes_view, name='report-changes'),
+    path('reports/stream/', report_stream_view, name='report-stream'),
+    path('reports/remind/', remind_non_reporters_view, name='remind-non-reporters'),
     path('reports/export/', export_reports_view, name='export-reports'),
     
     # Alerts endpoint
@@ -1,68 +1,235 @@
 from rest_framework import status, viewsets, permissions
-from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.decorators import api_view, permission_classes, renderer_classes, throttle_classes, action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
 from django.utils import timezone
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from django.core.cache import cache
-from django.core.mail import send_mail
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.mail import send_mail, get_connection, EmailMultiAlternatives
 from django.template.loader import render_to_string
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from datetime import timedelta
+import hashlib
+import json
 import random
+import time
 import pandas as pd
 from io import BytesIO
-from django.db.models import Q, Count, Prefetch
-from django.db import IntegrityError
+from django.db.models import Q, Count, Prefetch, Exists, OuterRef
+from django.db import IntegrityError, transaction
+from django.utils.dateparse import parse_date, parse_datetime
 from django.contrib.auth import get_user_model
 
 from core.models import (
     User, Profile, Unit, Location, AvailabilityReport, 
-    AccessRequest, OTPToken
+    AccessRequest, OTPToken, ReportTombstone
 )
+from core.events import (
+    report_events, report_event, tombstone_event, publish_reports, format_watermark,
+    report_stream_slots,
+)
+from core.ratelimit import sliding_window_hit, AUTH_THROTTLES, PUBLIC_THROTTLES
+from core.users import get_user_by_email, get_users_by_email, email_taken
+from core.enrollment import read_user_rows, import_users
+from core.approvals import bulk_approve_access_requests
+from core.units import unit_subtree_ids
+from core.archive import with_archived_reports
 from core.permissions import (
     IsApproved, IsManager, IsUnitManager,
     IsBranchManager, IsSectionManager, IsTeamManager
 )
+from core.api.renderers import EventStreamRenderer, FastJSONRenderer, ColumnarJSONRenderer
+from core.api.conditional import ListValidator, ConditionalListMixin
+from core.api.response_cache import cache_response, invalidate_models
+from core.api.eager import EagerLoadingViewSetMixin
 from core.api.serializers import (
     UserSignupSerializer,
     UserLoginSerializer,
     UserSerializer,
+    UserFastSerializer,
     ProfileSerializer,
     UnitSerializer,
     LocationSerializer,
+    LocationFastSerializer,
     OTPSerializer,
     OTPVerifySerializer,
     AvailabilityReportSerializer,
+    AvailabilityReportFastSerializer,
+    AvailabilityReportRangeSerializer,
+    ReportSyncSerializer,
+    ReportReminderSerializer,
     AccessRequestSerializer,
+    AccessRequestBulkApproveSerializer,
     AlertSendSerializer
 )
 from django.conf import settings
 
 User = get_user_model()
 
+# Bulk list endpoints also answer ?format=columnar
+COLUMNAR_RENDERERS = [*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarJSONRenderer]
+
 
 # ==================== Helper Functions ====================
 
+def get_report_scope_user_ids(user):
+    """
+    Return the ids of users whose reports the given user may see.
+    Returns None when the user may see all reports.
+    Regular users see only their own reports; managers see their unit based on role.
+    """
+    if not (user.is_staff or hasattr(user, 'profile') and user.profile.is_manager()):
+        return [user.id]
+    
+    if not (hasattr(user, 'profile') and user.profile.unit):
+        return None
+    
+    user_role = user.profile.role
+    user_unit = user.profile.unit
+    
+    # System manager and unit manager see all reports (no filtering)
+    if user_role in ['system_manager', 'unit_manager']:
+        return None
+    
+    if user_role in ['section_manager', 'team_manager']:
+        # Section and team managers see only their own unit (not descendants)
+        return Profile.objects.filter(unit=user_unit).values_list('user_id', flat=True)
+    
+    # Other managers (branch_manager) see their unit and descendants
+    all_units = unit_subtree_ids(user_unit.pk)
+    return Profile.objects.filter(unit__in=all_units).values_list('user_id', flat=True)
+
+
 def generate_otp_token():
     """Generate a 6-digit OTP token"""
     return str(random.randint(100000, 999999))
 
 
+def otp_rate_limit_hit(user):
+    """Count an OTP request for the user, returns (allowed, retry_after_seconds)"""
+    return sliding_window_hit(f'otp:user:{user.id}', settings.OTP_RATE_LIMIT, 3600)
+
+
 def check_otp_rate_limit(user):
-    """Check if user has exceeded OTP rate limit"""
-    cache_key = f'otp_rate_limit_{user.id}'
-    count = cache.get(cache_key, 0)
+    """Check if user has exceeded OTP rate limit (atomic sliding window, 1 hour)"""
+    allowed, retry_after = otp_rate_limit_hit(user)
+    return allowed
+
+
+def take_reminder_slots(users):
+    """
+    Return the users who have not been sent a reminder within
+    REPORT_REMINDER_COOLDOWN_SECONDS and start their cooldown.
+    Two cache round trips for the whole batch; two managers reminding the
+    same users at the same moment may both get through.
+    """
+    keys = {user.id: f'reminder:user:{user.id}' for user in users}
+    recent = cache.get_many(list(keys.values()))
+    allowed = [user for user in users if keys[user.id] not in recent]
+    cache.set_many({keys[user.id]: True for user in allowed}, settings.REPORT_REMINDER_COOLDOWN_SECONDS)
+    return allowed
+
+
+OTP_EMAIL_SUBJECT = 'Your OTP Code for Account Verification'
+
+
+def render_otp_email(user, otp_token):
+    """Render the OTP email body, returns (plain_message, html_message)"""
+    import logging
+    logger = logging.getLogger('core')
     
-    if count >= settings.OTP_RATE_LIMIT:
-        return False
+    # Try to load HTML template, fallback to plain text
+    try:
+        html_message = render_to_string('otp_login.html', {
+            'user': user,
+            'otp_code': otp_token,
+            'expiry_minutes': settings.OTP_EXPIRY_MINUTES,
+        })
+        return None, html_message
+    except Exception as e:
+        logger.warning(f"Template error: {e}")
+        message = f'''
+        Hello {user.get_full_name() or user.username},
+        
+        Your OTP code for account verification is: {otp_token}
+        
+        This code will expire in {settings.OTP_EXPIRY_MINUTES} minutes.
+        
+        If you did not request this code, please ignore this email.
+        
+        Best regards,
+        Yirok Team
+        '''
+        return message, None
+
+
+def build_email(user, subject, plain_message, html_message):
+    """Build one outgoing message for a user"""
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=plain_message or '',
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[user.email],
+    )
+    if html_message:
+        email.attach_alternative(html_message, 'text/html')
+    return email
+
+
+def send_bulk_emails(build_messages, label):
+    """
+    Build and send many emails in a background thread.
+    All messages go out over a single reused mail connection.
+    build_messages: callable returning the list of messages (rendered on the thread).
+    """
+    import logging
+    import threading
+    logger = logging.getLogger('core')
+    
+    def _send_emails():
+        messages = build_messages()
+        try:
+            with get_connection(fail_silently=False) as connection:
+                sent = connection.send_messages(messages)
+            logger.info(f"[{label}] Sent {sent} of {len(messages)} emails")
+        except Exception as e:
+            logger.error(f"[{label}] Error sending emails: {e}", exc_info=True)
     
-    cache.set(cache_key, count + 1, 3600)  # 1 hour expiry
-    return True
+    thread = threading.Thread(target=_send_emails, daemon=True)
+    thread.start()
+    return thread
+
+
+def send_bulk_otp_emails(user_tokens):
+    """
+    Send OTP emails to many users in a background thread, over one connection.
+    user_tokens: list of (user, otp_token) pairs.
+    """
+    return send_bulk_emails(lambda: [
+        build_email(user, OTP_EMAIL_SUBJECT, *render_otp_email(user, otp_token))
+        for user, otp_token in user_tokens
+    ], 'BULK OTP')
+
+
+def send_bulk_approval_emails(users, user_tokens=()):
+    """
+    Send approval notifications (and login OTPs, if given) to many users
+    in a background thread, over one connection.
+    user_tokens: list of (user, otp_token) pairs.
+    """
+    return send_bulk_emails(lambda: [
+        build_email(user, APPROVAL_EMAIL_SUBJECT, *render_approval_notification(user))
+        for user in users
+    ] + [
+        build_email(user, OTP_EMAIL_SUBJECT, *render_otp_email(user, otp_token))
+        for user, otp_token in user_tokens
+    ], 'BULK APPROVAL')
 
 
 def send_otp_email(user, otp_token, purpose='login'):
@@ -73,34 +240,11 @@ def send_otp_email(user, otp_token, purpose='login'):
     
     def _send_email():
         try:
-            # Try to load HTML template, fallback to plain text
-            try:
-                template_name = 'otp_login.html'
-                html_message = render_to_string(template_name, {
-                    'user': user,
-                    'otp_code': otp_token,
-                    'expiry_minutes': settings.OTP_EXPIRY_MINUTES,
-                })
-                message = None
-            except Exception as e:
-                logger.warning(f"Template error: {e}")
-                html_message = None
-                message = f'''
-                Hello {user.get_full_name() or user.username},
-                
-                Your OTP code for account verification is: {otp_token}
-                
-                This code will expire in {settings.OTP_EXPIRY_MINUTES} minutes.
-                
-                If you did not request this code, please ignore this email.
-                
-                Best regards,
-                Yirok Team
-                '''
+            message, html_message = render_otp_email(user, otp_token)
             
             # Use simple from email format (Gmail requires exact match with EMAIL_HOST_USER)
             result = send_mail(
-                subject='Your OTP Code for Account Verification',
+                subject=OTP_EMAIL_SUBJECT,
                 message=message,
                 from_email=settings.DEFAULT_FROM_EMAIL,
                 recipient_list=[user.email],
@@ -127,29 +271,36 @@ def send_otp_email(user, otp_token, purpose='login'):
         return False, error_msg
 
 
+APPROVAL_EMAIL_SUBJECT = 'Access Request Approved'
+
+
+def render_approval_notification(user):
+    """Render the approval email body, returns (plain_message, html_message)"""
+    try:
+        html_message = render_to_string('approval_notification.html', {
+            'user': user,
+        })
+        return None, html_message
+    except:
+        message = f'''
+        Hello {user.get_full_name() or user.username},
+        
+        Your access request has been approved!
+        
+        You can now log in to the system using your credentials.
+        
+        Best regards,
+        Yirok Team
+        '''
+        return message, None
+
+
 def send_approval_notification(user):
     """Send approval notification email"""
     try:
-        try:
-            html_message = render_to_string('approval_notification.html', {
-                'user': user,
-            })
-            message = None
-        except:
-            html_message = None
-            message = f'''
-            Hello {user.get_full_name() or user.username},
-            
-            Your access request has been approved!
-            
-            You can now log in to the system using your credentials.
-            
-            Best regards,
-            Yirok Team
-            '''
-        
+        message, html_message = render_approval_notification(user)
         send_mail(
-            subject='Access Request Approved',
+            subject=APPROVAL_EMAIL_SUBJECT,
             message=message,
             from_email=settings.DEFAULT_FROM_EMAIL,
             recipient_list=[user.email],
@@ -166,6 +317,7 @@ def send_approval_notification(user):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes(AUTH_THROTTLES)
 def register_view(request):
     """
     User registration endpoint.
@@ -174,12 +326,10 @@ def register_view(request):
     import logging
     logger = logging.getLogger('core')
     
-    serializer = UserSignupSerializer(data=request.data)
+    serializer = UserSignupSerializer(data=request.data, context={'request': request})
     if serializer.is_valid():
         user = serializer.save()
-        
-        # Get the created access request
-        access_request = AccessRequest.objects.filter(user=user).latest('submitted_at')
+        access_request = serializer.access_request
         
         # Send notification to admins (non-blocking)
         logger.info(f"[REGISTRATION] New user registered: {user.email}, sending admin notification...")
@@ -208,6 +358,7 @@ def register_view(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes(AUTH_THROTTLES)
 def request_otp_view(request):
     """
     Request OTP endpoint.
@@ -219,7 +370,7 @@ def request_otp_view(request):
     logger.debug(f"[OTP REQUEST] Received: {request.data}")
     logger.debug(f"[OTP REQUEST] Headers: {dict(request.headers)}")
     
-    serializer = OTPSerializer(data=request.data)
+    serializer = OTPSerializer(data=request.data, context={'request': request})
     if not serializer.is_valid():
         logger.warning(f"[OTP REQUEST] Validation failed: {serializer.errors}")
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -227,24 +378,13 @@ def request_otp_view(request):
     email = serializer.validated_data['email']
     logger.debug(f"[OTP REQUEST] Looking for user with email: {email}")
     
-    # Log all users in database for debugging
-    try:
-        all_users = User.objects.all()
-        user_count = all_users.count()
-        logger.debug(f"[DB QUERY] Total users in database: {user_count}")
-        if user_count > 0:
-            logger.debug(f"[DB QUERY] User emails in DB: {[u.email for u in all_users[:10]]}")
-    except Exception as e:
-        logger.error(f"[DB QUERY] Error fetching all users: {e}")
-    
-    try:
-        user = User.objects.get(email=email)
-        logger.debug(f"[DB QUERY] User found: {user.email}, ID: {user.id}, Approved: {user.is_approved}")
-    except User.DoesNotExist:
+    user = get_user_by_email(email, request)
+    if not user:
         logger.warning(f"[DB QUERY] User not found with email: {email}")
         return Response({
             'error': 'User with this email does not exist.'
         }, status=status.HTTP_404_NOT_FOUND)
+    logger.debug(f"[DB QUERY] User found: {user.email}, ID: {user.id}, Approved: {user.is_approved}")
     
     # Check if user is approved (serializer should catch this, but double-check)
     if not user.is_approved:
@@ -254,10 +394,11 @@ def request_otp_view(request):
         }, status=status.HTTP_403_FORBIDDEN)
     
     # Check rate limit
-    if not check_otp_rate_limit(user):
+    allowed, retry_after = otp_rate_limit_hit(user)
+    if not allowed:
         return Response({
             'error': 'Rate limit exceeded. Please try again later.'
-        }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+        }, status=status.HTTP_429_TOO_MANY_REQUESTS, headers={'Retry-After': str(retry_after)})
     
     # Generate OTP
     otp_token = generate_otp_token()
@@ -292,20 +433,18 @@ def request_otp_view(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes(AUTH_THROTTLES)
 def verify_otp_view(request):
     """
     Verify OTP endpoint.
     Validates token → returns JWT access + refresh tokens.
     """
-    serializer = OTPVerifySerializer(data=request.data)
+    serializer = OTPVerifySerializer(data=request.data, context={'request': request})
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
+    # The OTP was consumed atomically during validation
     user = serializer.validated_data['user']
-    otp = serializer.validated_data['otp']
-    
-    # Mark OTP as used
-    otp.mark_as_used()
     
     # Generate JWT tokens
     refresh = RefreshToken.for_user(user)
@@ -322,6 +461,7 @@ def verify_otp_view(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes(AUTH_THROTTLES)
 def login_view(request):
     """
     Login endpoint (email + password).
@@ -354,6 +494,58 @@ def login_view(request):
     }, status=status.HTTP_200_OK)
 
 
+class ThrottledTokenRefreshView(TokenRefreshView):
+    """Token refresh is public too, so it gets the same per-IP and global limits as login"""
+    throttle_classes = AUTH_THROTTLES
+
+
+# ==================== User Import ====================
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def import_users_view(request):
+    """
+    Bulk-enrol users from an uploaded CSV/XLSX file (staff only).
+    Form fields: file, dry_run (validate only), approve (create approved accounts).
+    Returns counts and a per-row error report; valid rows are created even if others fail.
+    Runs within the request, so files with more than USER_IMPORT_API_MAX_PASSWORDS
+    passwords to hash are refused; use `python manage.py import_users` for those.
+    """
+    if not request.user.is_staff:
+        return Response({
+            'error': 'Only staff members can import users.'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    upload = request.FILES.get('file')
+    if not upload:
+        return Response({'error': 'A .csv or .xlsx file is required.'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        rows = read_user_rows(upload, upload.name)
+    except Exception as e:
+        return Response({'error': f'Could not read file: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    passwords = sum(1 for row in rows if row.get('password'))
+    if passwords > settings.USER_IMPORT_API_MAX_PASSWORDS:
+        return Response({
+            'error': f'The file has {passwords} passwords to hash; the limit here is '
+                     f'{settings.USER_IMPORT_API_MAX_PASSWORDS}. Use "python manage.py import_users" instead.'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    def flag(name):
+        return str(request.data.get(name, '')).lower() in ('1', 'true', 'yes')
+    
+    report = import_users(
+        rows,
+        approve=flag('approve'),
+        approved_by=request.user,
+        dry_run=flag('dry_run'),
+        # Hash in this thread: no process pool forked from a threaded web worker
+        workers=1,
+    )
+    return Response(report, status=status.HTTP_200_OK)
+
+
 # ==================== Access Request Endpoints ====================
 
 @api_view(['GET'])
@@ -393,8 +585,7 @@ def list_access_requests_view(request):
                     unit_user_ids = Profile.objects.filter(unit=user_unit).values_list('user_id', flat=True)
                 else:
                     # Other managers (branch_manager) see their unit and descendants
-                    descendant_units = user_unit.get_descendants()
-                    all_units = [user_unit] + descendant_units
+                    all_units = unit_subtree_ids(user_unit.pk)
                     unit_user_ids = Profile.objects.filter(unit__in=all_units).values_list('user_id', flat=True)
                 
                 # Also include users without a unit (unit=None) for pending requests
@@ -408,8 +599,7 @@ def list_access_requests_view(request):
     if unit_id:
         try:
             unit = Unit.objects.get(id=unit_id)
-            descendant_units = unit.get_descendants()
-            all_units = [unit] + descendant_units
+            all_units = unit_subtree_ids(unit.pk)
             unit_user_ids = Profile.objects.filter(unit__in=all_units).values_list('user_id', flat=True)
             queryset = queryset.filter(user_id__in=unit_user_ids)
         except Unit.DoesNotExist:
@@ -447,6 +637,12 @@ def approve_access_request_view(request, request_id):
             'error': 'Access request already approved.'
         }, status=status.HTTP_400_BAD_REQUEST)
     
+    # Emails are unique regardless of case; check before anything is saved
+    if 'email' in request.data and email_taken(request.data['email'], access_request.user):
+        return Response({
+            'error': 'Another user already has this email address.'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
     # Approve the request
     access_request.approve(request.user)
     
@@ -513,6 +709,34 @@ def approve_access_request_view(request, request_id):
     return Response(response_data, status=status.HTTP_200_OK)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_approve_access_requests_view(request):
+    """
+    Approve many pending access requests in one transaction.
+    Body: ids (access request ids), send_otp (default true).
+    Approval emails and OTPs go out after commit as one batch.
+    """
+    if not (request.user.is_staff or hasattr(request.user, 'profile') and request.user.profile.is_manager()):
+        return Response({
+            'error': 'Only staff members and managers can approve access requests.'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    serializer = AccessRequestBulkApproveSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    result = bulk_approve_access_requests(
+        serializer.validated_data['ids'],
+        request.user,
+        send_otp=serializer.validated_data['send_otp'],
+    )
+    return Response({
+        'message': f"{len(result['approved'])} access requests approved.",
+        **result
+    }, status=status.HTTP_200_OK)
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def reject_access_request_view(request, request_id):
@@ -544,6 +768,8 @@ def reject_access_request_view(request, request_id):
 
 @api_view(['GET'])
 @permission_classes([IsApproved])
+@renderer_classes(COLUMNAR_RENDERERS)
+@cache_response(AvailabilityReport, User, Profile, Unit, Location)
 def list_reports_view(request):
     """
     List availability reports.
@@ -551,41 +777,17 @@ def list_reports_view(request):
     """
     queryset = AvailabilityReport.objects.select_related('user').all()
     
-    # Regular users see only their own reports
-    if not (request.user.is_staff or hasattr(request.user, 'profile') and request.user.profile.is_manager()):
-        queryset = queryset.filter(user=request.user)
-    else:
-        # Managers see reports from their unit based on role
-        if hasattr(request.user, 'profile') and request.user.profile.unit:
-            user_role = request.user.profile.role
-            user_unit = request.user.profile.unit
-            
-            # System manager and unit manager see all reports (no filtering)
-            if user_role in ['system_manager', 'unit_manager']:
-                # No filtering - see all reports
-                pass
-            elif user_role == 'section_manager':
-                # Section manager sees only reports from their section (not descendants)
-                unit_user_ids = Profile.objects.filter(unit=user_unit).values_list('user_id', flat=True)
-                queryset = queryset.filter(user_id__in=unit_user_ids)
-            elif user_role == 'team_manager':
-                # Team manager sees only reports from their team (not descendants)
-                unit_user_ids = Profile.objects.filter(unit=user_unit).values_list('user_id', flat=True)
-                queryset = queryset.filter(user_id__in=unit_user_ids)
-            else:
-                # Other managers (branch_manager) see their unit and descendants
-                descendant_units = user_unit.get_descendants()
-                all_units = [user_unit] + descendant_units
-                unit_user_ids = Profile.objects.filter(unit__in=all_units).values_list('user_id', flat=True)
-                queryset = queryset.filter(user_id__in=unit_user_ids)
+    # Regular users see only their own reports, managers see their unit based on role
+    visible_user_ids = get_report_scope_user_ids(request.user)
+    if visible_user_ids is not None:
+        queryset = queryset.filter(user_id__in=visible_user_ids)
     
     # Filter by unit
     unit_id = request.query_params.get('unit', None)
     if unit_id:
         try:
             unit = Unit.objects.get(id=unit_id)
-            descendant_units = unit.get_descendants()
-            all_units = [unit] + descendant_units
+            all_units = unit_subtree_ids(unit.pk)
             unit_user_ids = Profile.objects.filter(unit__in=all_units).values_list('user_id', flat=True)
             queryset = queryset.filter(user_id__in=unit_user_ids)
         except Unit.DoesNotExist:
@@ -604,11 +806,18 @@ def list_reports_view(request):
     if date_to:
         queryset = queryset.filter(date__lte=date_to)
     
-    serializer = AvailabilityReportSerializer(queryset.order_by('-date', '-submitted_at'), many=True)
-    return Response({
-        'count': len(serializer.data),
-        'results': serializer.data
-    }, status=status.HTTP_200_OK)
+    # Unchanged since the client's copy: answer 304 before serializing anything
+    validator = ListValidator(request, queryset, related=('user', 'location'))
+    not_modified = validator.not_modified()
+    if not_modified is not None:
+        return not_modified
+    
+    # Read-only listing: project straight to dicts instead of building model instances
+    results = AvailabilityReportFastSerializer.serialize(queryset.order_by('-date', '-submitted_at'))
+    return validator.apply(Response({
+        'count': len(results),
+        'results': results
+    }, status=status.HTTP_200_OK))
 
 
 @api_view(['POST'])
@@ -637,35 +846,512 @@ def create_report_view(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+REPORT_IDEMPOTENCY_TTL = 24 * 3600  # Replay window for Idempotency-Key (seconds)
+REPORT_UPSERT_FIELDS = ['status', 'location', 'location_text', 'notes', 'updated_at', 'client_updated_at']
+
+
+def report_etag(report):
+    """Build the ETag for a report from its updated_at timestamp"""
+    return f'"{report.updated_at.isoformat()}"'
+
+
+def bulk_upsert_reports(reports):
+    """
+    Insert reports in one statement, overwriting any existing (user, date) rows.
+    Relies on the unique index on (user, date); submitted_at is preserved on overwrite.
+    """
+    # bulk_create sends no signals
+    invalidate_models(AvailabilityReport)
+    return AvailabilityReport.objects.bulk_create(
+        reports,
+        update_conflicts=True,
+        unique_fields=['user', 'date'],
+        update_fields=REPORT_UPSERT_FIELDS,
+    )
+
+
+def parse_if_match(header_value):
+    """
+    Parse an If-Match header into an updated_at datetime.
+    Returns '*' for a wildcard and None if the value cannot be parsed.
+    """
+    value = header_value.strip()
+    if value == '*':
+        return '*'
+    if value.startswith('W/'):
+        value = value[2:]
+    return parse_datetime(value.strip('"'))
+
+
+def idempotency_fingerprint(request, report_date):
+    """Hash of the date, If-Match and body an Idempotency-Key was first used with"""
+    payload = json.dumps(
+        [report_date, request.headers.get('If-Match'), request.data],
+        sort_keys=True, cls=DjangoJSONEncoder,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@api_view(['PUT'])
+@permission_classes([IsApproved])
+def upsert_my_report_view(request, report_date):
+    """
+    Create or replace the current user's availability report for a date.
+    Upserts on (user, date) against the unique index, so resubmitting after a
+    dropped connection is a single UPDATE instead of insert/lookup/patch.
+    Supports If-Match (report ETag) and Idempotency-Key headers; reusing a key
+    for a different date or body gets 422.
+    """
+    idempotency_key = request.headers.get('Idempotency-Key')
+    idempotency_cache_key = None
+    if idempotency_key:
+        idempotency_cache_key = f'report_idempotency_{request.user.id}_{idempotency_key}'
+        fingerprint = idempotency_fingerprint(request, report_date)
+        cached = cache.get(idempotency_cache_key)
+        if cached is not None:
+            # A reused key with a different date or body is a client bug, not a retry
+            if cached.get('fingerprint') != fingerprint:
+                return Response({
+                    'error': 'Idempotency-Key was already used for a different request.'
+                }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+            response = Response(cached['data'], status=cached['status'])
+            response['ETag'] = cached['etag']
+            response['Idempotent-Replayed'] = 'true'
+            return response
+    
+    if_match = None
+    if 'If-Match' in request.headers:
+        if_match = parse_if_match(request.headers['If-Match'])
+        if if_match is None:
+            return Response({
+                'error': 'Invalid If-Match header.'
+            }, status=status.HTTP_400_BAD_REQUEST)
+    
+    # A JSON list or scalar body parses fine but is not a report
+    if not isinstance(request.data, dict):
+        return Response({
+            'error': 'Request body must be a JSON object.'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    data = {key: value for key, value in request.data.items()}
+    data['date'] = report_date
+    serializer = AvailabilityReportSerializer(data=data, context={'request': request})
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    # PUT replaces the whole report, so omitted fields fall back to model defaults
+    validated = serializer.validated_data
+    report_day = validated['date']
+    values = {
+        'status': validated.get('status', 'pending'),
+        'location': validated.get('location'),
+        'location_text': validated.get('location_text', ''),
+        'notes': validated.get('notes', ''),
+        'updated_at': timezone.now(),
+        'client_updated_at': None,
+    }
+    
+    with transaction.atomic():
+        existing = AvailabilityReport.objects.filter(user=request.user, date=report_day)
+        if if_match is not None and if_match != '*':
+            existing = existing.filter(updated_at=if_match)
+        updated = existing.update(**values)
+        if updated:
+            invalidate_models(AvailabilityReport)
+        created = False
+        
+        if not updated:
+            if if_match is not None:
+                return Response({
+                    'error': 'הדוח עודכן או נמחק מאז שנטען. יש לטעון אותו מחדש.'
+                }, status=status.HTTP_412_PRECONDITION_FAILED)
+            # No row yet: insert, falling back to update if a concurrent request won the race
+            bulk_upsert_reports([AvailabilityReport(user=request.user, date=report_day, **values)])
+            created = True
+    
+    report = AvailabilityReport.objects.select_related('user', 'location').get(
+        user=request.user, date=report_day
+    )
+    publish_reports([report], 'report.created' if created else 'report.updated')
+    response_status = status.HTTP_201_CREATED if created else status.HTTP_200_OK
+    response_data = AvailabilityReportSerializer(report).data
+    etag = report_etag(report)
+    
+    if idempotency_cache_key:
+        cache.set(idempotency_cache_key, {
+            'fingerprint': fingerprint,
+            'status': response_status,
+            'data': response_data,
+            'etag': etag,
+        }, REPORT_IDEMPOTENCY_TTL)
+    
+    response = Response(response_data, status=response_status)
+    response['ETag'] = etag
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([IsApproved])
+def submit_report_range_view(request):
+    """
+    Submit the same availability for every day in a date range.
+    All rows are written with a single upsert on (user, date); the response
+    lists which days were newly created and which existing reports were overwritten.
+    """
+    serializer = AvailabilityReportRangeSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    data = serializer.validated_data
+    date_from = data['date_from']
+    date_to = data['date_to']
+    days = [date_from + timedelta(days=offset) for offset in range((date_to - date_from).days + 1)]
+    now = timezone.now()
+    
+    with transaction.atomic():
+        existing_dates = set(
+            AvailabilityReport.objects.filter(
+                user=request.user, date__gte=date_from, date__lte=date_to
+            ).values_list('date', flat=True)
+        )
+        bulk_upsert_reports([
+            AvailabilityReport(
+                user=request.user,
+                date=day,
+                status=data['status'],
+                location=data.get('location'),
+                location_text=data.get('location_text', ''),
+                notes=data.get('notes', ''),
+                updated_at=now,
+            )
+            for day in days
+        ])
+    
+    if report_events.has_subscribers():
+        publish_reports(
+            AvailabilityReport.objects.select_related('user', 'location').filter(
+                user=request.user, date__gte=date_from, date__lte=date_to
+            )
+        )
+    
+    created = [day.isoformat() for day in days if day not in existing_dates]
+    overwritten = [day.isoformat() for day in days if day in existing_dates]
+    return Response({
+        'message': f'{len(days)} days reported.',
+        'count': len(days),
+        'created': created,
+        'overwritten': overwritten,
+    }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([IsApproved])
+def sync_reports_view(request):
+    """
+    Apply a batch of report changes queued by an offline client.
+    Changes are applied in one transaction with last-writer-wins: a change is
+    dropped if the server row holds a later edit than the client's, comparing
+    when each edit was made (the device's time for synced edits), not when it
+    reached the server.
+    Returns the canonical rows for every touched date plus a server watermark.
+    """
+    serializer = ReportSyncSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    # Keep only the latest queued change per date
+    latest = {}
+    for mutation in serializer.validated_data['mutations']:
+        current = latest.get(mutation['date'])
+        if current is None or mutation['client_updated_at'] >= current['client_updated_at']:
+            latest[mutation['date']] = mutation
+    
+    now = timezone.now()
+    conflicts = []
+    to_write = []
+    to_delete = []
+    
+    with transaction.atomic():
+        existing = {
+            report.date: report
+            for report in AvailabilityReport.objects.select_for_update().filter(
+                user=request.user, date__in=list(latest)
+            )
+        }
+        for day, mutation in latest.items():
+            report = existing.get(day)
+            # Compare edit times, not sync times; a device clock ahead of ours counts as now
+            edited_at = min(mutation['client_updated_at'], now)
+            if report is not None and report.edited_at > edited_at:
+                conflicts.append(day.isoformat())
+                continue
+            if mutation['deleted']:
+                if report is not None:
+                    to_delete.append(day)
+                continue
+            to_write.append(AvailabilityReport(
+                user=request.user,
+                date=day,
+                status=mutation['status'],
+                location=mutation.get('location'),
+                location_text=mutation['location_text'],
+                notes=mutation['notes'],
+                updated_at=now,
+                client_updated_at=edited_at,
+            ))
+        
+        if to_write:
+            bulk_upsert_reports(to_write)
+        if to_delete:
+            AvailabilityReport.objects.filter(user=request.user, date__in=to_delete).delete()
+    
+    canonical = AvailabilityReport.objects.select_related('user', 'location').filter(
+        user=request.user, date__in=list(latest)
+    ).order_by('date')
+    publish_reports(canonical)
+    return Response({
+        'applied': len(to_write) + len(to_delete),
+        'conflicts': conflicts,
+        'deleted': [day.isoformat() for day in to_delete],
+        'results': AvailabilityReportSerializer(canonical, many=True).data,
+        'watermark': format_watermark(lagged_watermark(now)),
+    }, status=status.HTTP_200_OK)
+
+
+def get_report_changes(user, since, inclusive=False):
+    """
+    Return (reports, tombstones) changed after `since` within the user's RBAC scope.
+    With inclusive=True, changes made exactly at `since` are included as well.
+    """
+    lookup = 'gte' if inclusive else 'gt'
+    queryset = AvailabilityReport.objects.select_related('user', 'location').filter(
+        **{f'updated_at__{lookup}': since}
+    )
+    tombstones = ReportTombstone.objects.filter(**{f'deleted_at__{lookup}': since})
+    visible_user_ids = get_report_scope_user_ids(user)
+    if visible_user_ids is not None:
+        queryset = queryset.filter(user_id__in=visible_user_ids)
+        tombstones = tombstones.filter(user_id__in=visible_user_ids)
+    return queryset, tombstones
+
+
+def lagged_watermark(moment):
+    """
+    Hold a watermark back by REPORT_CHANGES_SAFETY_LAG_SECONDS.
+    updated_at is stamped before commit, so a slow transaction can become visible
+    with an updated_at older than a watermark already handed out; the lag keeps
+    it inside the next poll's window.
+    """
+    return moment - timedelta(seconds=settings.REPORT_CHANGES_SAFETY_LAG_SECONDS)
+
+
+def parse_watermark(value):
+    """Parse a watermark into an aware datetime, or None if invalid"""
+    moment = parse_datetime(value) if value else None
+    if moment is not None and timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+@api_view(['GET'])
+@permission_classes([IsApproved])
+def report_changes_view(request):
+    """
+    List reports created, updated or deleted after a watermark.
+    RBAC applied like list_reports_view. Pass the returned watermark as
+    ?since= on the next poll. The watermark trails the server clock by
+    REPORT_CHANGES_SAFETY_LAG_SECONDS, so consecutive polls overlap and may
+    repeat rows; dedupe by id + updated_at. A watermark older than
+    RETENTION_REPORT_TOMBSTONE_DAYS gets 410 with resync_required, since the
+    deletions before it have been purged.
+    """
+    since = parse_watermark(request.query_params.get('since', None))
+    if since is None:
+        return Response({
+            'error': 'A valid "since" watermark (ISO 8601 datetime) is required.'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    # Tombstones older than the retention window are purged, so deletions before it are lost
+    now = timezone.now()
+    if since < now - timedelta(days=settings.RETENTION_REPORT_TOMBSTONE_DAYS):
+        return Response({
+            'error': 'The "since" watermark is older than the deletion history; reload all reports.',
+            'resync_required': True,
+        }, status=status.HTTP_410_GONE)
+    
+    # Capture the watermark before querying so changes made meanwhile are picked up next poll
+    watermark = lagged_watermark(now)
+    queryset, tombstones = get_report_changes(request.user, since)
+    
+    serializer = AvailabilityReportSerializer(queryset.order_by('updated_at'), many=True)
+    deleted = [
+        {
+            'id': tombstone['report_id'],
+            'user': tombstone['user_id'],
+            'date': tombstone['date'],
+            'deleted_at': tombstone['deleted_at'],
+        }
+        for tombstone in tombstones.order_by('deleted_at').values('report_id', 'user_id', 'date', 'deleted_at')
+    ]
+    return Response({
+        'count': len(serializer.data),
+        'results': serializer.data,
+        'deleted': deleted,
+        'watermark': format_watermark(watermark),
+    }, status=status.HTTP_200_OK)
+
+
+def format_sse(event):
+    """Format an event dict as a Server-Sent Events message"""
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'], cls=DjangoJSONEncoder)}\n\n"
+
+
+def report_event_stream(user, last_event_id=None):
+    """
+    Generate SSE messages for report changes visible to the user.
+    Replays changes since last_event_id from the database, then follows the
+    process-wide event hub, sending heartbeats while idle. The stream ends
+    after REPORT_STREAM_MAX_SECONDS so the client reconnects with Last-Event-ID.
+    """
+    visible_user_ids = get_report_scope_user_ids(user)
+    if visible_user_ids is not None:
+        visible_user_ids = set(visible_user_ids)
+    
+    subscription = report_events.subscribe()
+    try:
+        yield f"retry: {settings.REPORT_STREAM_RETRY_MS}\n\n"
+        
+        since = parse_watermark(last_event_id)
+        if since is not None:
+            reports, tombstones = get_report_changes(user, since, inclusive=True)
+            replay = [(report.updated_at, report_event(report)) for report in reports]
+            replay += [(tombstone.deleted_at, tombstone_event(tombstone)) for tombstone in tombstones]
+            for _, event in sorted(replay, key=lambda item: item[0]):
+                yield format_sse(event)
+        
+        deadline = time.monotonic() + settings.REPORT_STREAM_MAX_SECONDS
+        while time.monotonic() < deadline and not subscription.overflowed:
+            events = subscription.get(timeout=settings.REPORT_STREAM_HEARTBEAT_SECONDS)
+            if not events:
+                yield ": heartbeat\n\n"
+                continue
+            for event in events:
+                if visible_user_ids is None or event['user_id'] in visible_user_ids:
+                    yield format_sse(event)
+    finally:
+        subscription.close()
+
+
+@api_view(['GET'])
+@permission_classes([IsApproved])
+@renderer_classes([FastJSONRenderer, EventStreamRenderer])
+def report_stream_view(request):
+    """
+    Server-Sent Events stream of report creates, updates and deletes.
+    RBAC applied like list_reports_view. Supports resuming via the
+    Last-Event-ID header (or ?last_event_id=). Each process serves at most
+    REPORT_STREAM_MAX_CONNECTIONS streams at once; beyond that it answers
+    503 with Retry-After.
+    """
+    if not report_stream_slots.acquire(settings.REPORT_STREAM_MAX_CONNECTIONS):
+        response = Response({
+            'error': 'Too many live streams open on this server. Try again later.'
+        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        # Spread reconnects out so refused clients do not all come back at once
+        response['Retry-After'] = str(random.randint(1, 2) * settings.REPORT_STREAM_BUSY_RETRY_SECONDS)
+        return response
+    
+    last_event_id = request.headers.get('Last-Event-ID') or request.query_params.get('last_event_id')
+    response = StreamingHttpResponse(
+        report_stream_slots.hold(report_event_stream(request.user, last_event_id)),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([IsManager])
+def remind_non_reporters_view(request):
+    """
+    Send a login OTP to every approved user in scope who has not reported for a date.
+    Non-reporters are found with a single anti-join, OTPs are bulk-inserted and
+    the emails go out in the background over one mail connection.
+    RBAC applied like list_reports_view; unit_ids narrows to those units and descendants.
+    """
+    serializer = ReportReminderSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    report_date = serializer.validated_data.get('date') or timezone.now().date()
+    unit_ids = serializer.validated_data.get('unit_ids')
+    
+    users = User.objects.filter(is_approved=True, is_active=True).exclude(email='').filter(
+        ~Exists(AvailabilityReport.objects.filter(user=OuterRef('pk'), date=report_date))
+    )
+    visible_user_ids = get_report_scope_user_ids(request.user)
+    if visible_user_ids is not None:
+        users = users.filter(id__in=visible_user_ids)
+    if unit_ids:
+        all_units = set()
+        for unit_id in unit_ids:
+            all_units.update(unit_subtree_ids(unit_id))
+        users = users.filter(profile__unit__in=all_units)
+    
+    non_reporters = list(users.distinct())
+    # Reminders have their own cooldown, so they do not use up users' OTP login requests
+    recipients = take_reminder_slots(non_reporters)
+    
+    expires_at = timezone.now() + timedelta(minutes=settings.OTP_EXPIRY_MINUTES)
+    user_tokens = [(user, generate_otp_token()) for user in recipients]
+    OTPToken.objects.bulk_create([
+        OTPToken(user=user, token=otp_token, purpose='login', expires_at=expires_at)
+        for user, otp_token in user_tokens
+    ])
+    if user_tokens:
+        send_bulk_otp_emails(user_tokens)
+    
+    return Response({
+        'message': f'Reminder queued for {len(recipients)} users.',
+        'date': report_date,
+        'non_reporters_count': len(non_reporters),
+        'queued_count': len(recipients),
+        'rate_limited_count': len(non_reporters) - len(recipients),
+    }, status=status.HTTP_202_ACCEPTED)
+
+
 @api_view(['GET'])
 @permission_classes([IsApproved])
 def export_reports_view(request):
     """
-    Export availability reports to Excel.
+    Export availability reports to Excel, including archived months in range.
     RBAC applied: users export their own, managers export their unit's reports.
     """
     queryset = AvailabilityReport.objects.select_related('user', 'user__profile', 'user__profile__unit').all()
     
-    # Apply same filters as list_reports_view
+    # Apply same filters as list_reports_view; archived reports get the same user restrictions
+    user_filters = []
     if not (request.user.is_staff or hasattr(request.user, 'profile') and request.user.profile.is_manager()):
         queryset = queryset.filter(user=request.user)
+        user_filters.append([request.user.id])
     else:
         if hasattr(request.user, 'profile') and request.user.profile.unit:
             user_unit = request.user.profile.unit
-            descendant_units = user_unit.get_descendants()
-            all_units = [user_unit] + descendant_units
+            all_units = unit_subtree_ids(user_unit.pk)
             unit_user_ids = Profile.objects.filter(unit__in=all_units).values_list('user_id', flat=True)
             queryset = queryset.filter(user_id__in=unit_user_ids)
+            user_filters.append(unit_user_ids)
     
     # Filter by unit
     unit_id = request.query_params.get('unit', None)
     if unit_id:
         try:
             unit = Unit.objects.get(id=unit_id)
-            descendant_units = unit.get_descendants()
-            all_units = [unit] + descendant_units
+            all_units = unit_subtree_ids(unit.pk)
             unit_user_ids = Profile.objects.filter(unit__in=all_units).values_list('user_id', flat=True)
             queryset = queryset.filter(user_id__in=unit_user_ids)
+            user_filters.append(unit_user_ids)
         except Unit.DoesNotExist:
             pass
     
@@ -677,9 +1363,17 @@ def export_reports_view(request):
     if date_to:
         queryset = queryset.filter(date__lte=date_to)
     
+    # Older months live in the report archive (core.archive)
+    reports = with_archived_reports(
+        list(queryset),
+        date_from=parse_date(date_from) if date_from else None,
+        date_to=parse_date(date_to) if date_to else None,
+        user_filters=user_filters,
+    )
+    
     # Prepare data for Excel
     data = []
-    for report in queryset:
+    for report in reports:
         unit_name = report.user.profile.unit.name if hasattr(report.user, 'profile') and report.user.profile.unit else 'N/A'
         data.append({
             'User': report.user.username,
@@ -688,7 +1382,8 @@ def export_reports_view(request):
             'Date': report.date,
             'Status': report.get_status_display(),
             'Notes': report.notes,
-            'Submitted At': report.submitted_at,
+            # Excel has no time zones: write local wall-clock time
+            'Submitted At': timezone.localtime(report.submitted_at).replace(tzinfo=None),
         })
     
     # Create Excel file
@@ -728,8 +1423,7 @@ def send_alert_view(request):
     recipients = []
     if unit_id:
         unit = Unit.objects.get(id=unit_id)
-        descendant_units = unit.get_descendants()
-        all_units = [unit] + descendant_units
+        all_units = unit_subtree_ids(unit.pk)
         
         if 'all' in send_to or 'users' in send_to:
             user_profiles = Profile.objects.filter(unit__in=all_units)
@@ -769,10 +1463,12 @@ def send_alert_view(request):
     from hashlib import md5
     from datetime import datetime
     
+    users_by_email = get_users_by_email(recipients, request)
+    
     sent_count = 0
     for email in recipients:
         try:
-            user = User.objects.get(email=email)
+            user = users_by_email[email.strip().lower()]
             # Generate a simple token for one-click login (in production, use proper JWT or signed token)
             token = md5(f"{user.id}{datetime.now().isoformat()}{settings.SECRET_KEY}".encode()).hexdigest()[:16]
             
@@ -814,6 +1510,7 @@ def send_alert_view(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes(PUBLIC_THROTTLES)
 def health_check_view(request):
     """
     Simple health check endpoint for API availability.
@@ -847,7 +1544,7 @@ def health_check_view(request):
 
 # ==================== ViewSets ====================
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(EagerLoadingViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for User model"""
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -866,7 +1563,8 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer = UserSerializer(request.user)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
-    @action(detail=False, methods=['get'], url_path='approved')
+    @action(detail=False, methods=['get'], url_path='approved', renderer_classes=COLUMNAR_RENDERERS)
+    @cache_response(User, Profile, Unit, Location)
     def approved(self, request):
         """List all approved users"""
         if not (request.user.is_staff or hasattr(request.user, 'profile') and request.user.profile.is_manager()):
@@ -895,16 +1593,20 @@ class UserViewSet(viewsets.ModelViewSet):
                 users = users.filter(id__in=unit_user_ids)
             else:
                 # Other managers (branch_manager) see their unit and descendants
-                descendant_units = user_unit.get_descendants()
-                all_units = [user_unit] + descendant_units
+                all_units = unit_subtree_ids(user_unit.pk)
                 unit_user_ids = Profile.objects.filter(unit__in=all_units).values_list('user_id', flat=True)
                 users = users.filter(id__in=unit_user_ids)
         
-        serializer = UserSerializer(users.order_by('-date_joined'), many=True)
-        return Response({
-            'count': len(serializer.data),
-            'results': serializer.data
-        }, status=status.HTTP_200_OK)
+        validator = ListValidator(request, users, related=('profile', 'profile__unit', 'profile__city'))
+        not_modified = validator.not_modified()
+        if not_modified is not None:
+            return not_modified
+        
+        results = UserFastSerializer.serialize(users.order_by('-date_joined'))
+        return validator.apply(Response({
+            'count': len(results),
+            'results': results
+        }, status=status.HTTP_200_OK))
     
     @action(detail=True, methods=['patch'], url_path='update-permissions')
     def update_permissions(self, request, pk=None):
@@ -951,11 +1653,12 @@ class UserViewSet(viewsets.ModelViewSet):
         }, status=status.HTTP_200_OK)
 
 
-class ProfileViewSet(viewsets.ModelViewSet):
+class ProfileViewSet(ConditionalListMixin, EagerLoadingViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for Profile model"""
     queryset = Profile.objects.select_related('user', 'unit').all()
     serializer_class = ProfileSerializer
     permission_classes = [IsAuthenticated]
+    conditional_related = ('user', 'unit', 'city')
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -977,17 +1680,25 @@ class ProfileViewSet(viewsets.ModelViewSet):
         if 'phone' in user_data:
             user.phone = user_data['phone']
         if 'email' in user_data:
+            # Emails are unique regardless of case; a clash is a 400, not an IntegrityError
+            if email_taken(user_data['email'], user):
+                raise ValidationError({'email': 'Another user already has this email address.'})
             user.email = user_data['email']
         user.save()
         
         serializer.save()
 
 
-class UnitViewSet(viewsets.ModelViewSet):
+class UnitViewSet(ConditionalListMixin, EagerLoadingViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for Unit model"""
     queryset = Unit.objects.prefetch_related('children', 'members').all()
     serializer_class = UnitSerializer
     permission_classes = [IsAuthenticated]
+    renderer_classes = COLUMNAR_RENDERERS
+    
+    def get_conditional_queryset(self):
+        # parent_name and children_count read other units: any unit change counts
+        return Unit.objects.all()
     
     @action(detail=True, methods=['get'])
     def members(self, request, pk=None):
@@ -997,7 +1708,7 @@ class UnitViewSet(viewsets.ModelViewSet):
         serializer = ProfileSerializer(members, many=True)
         return Response(serializer.data)
     
-    @action(detail=False, methods=['get'], url_path='by-parent', permission_classes=[AllowAny])
+    @action(detail=False, methods=['get'], url_path='by-parent', permission_classes=[AllowAny], throttle_classes=PUBLIC_THROTTLES)
     def by_parent(self, request):
         """Get units by parent ID and/or unit type - AllowAny for registration page"""
         parent_id = request.query_params.get('parent_id', None)
@@ -1039,11 +1750,13 @@ class LocationPagination(PageNumberPagination):
     max_page_size = 10000  # Allow up to 10,000 locations per page
 
 
-class LocationViewSet(viewsets.ReadOnlyModelViewSet):
+class LocationViewSet(EagerLoadingViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for Location model (cities, towns, kibbutzim)"""
     queryset = Location.objects.all()
     serializer_class = LocationSerializer
     permission_classes = [AllowAny]  # Anyone can view locations
+    throttle_classes = PUBLIC_THROTTLES
+    renderer_classes = COLUMNAR_RENDERERS
     pagination_class = LocationPagination  # Use custom pagination
     
     def get_queryset(self):
@@ -1058,9 +1771,17 @@ class LocationViewSet(viewsets.ReadOnlyModelViewSet):
             queryset = queryset.filter(Q(name__icontains=search) | Q(name_he__icontains=search))
         # Order by Hebrew name for better user experience
         return queryset.order_by('name_he', 'name')
+    
+    def list(self, request, *args, **kwargs):
+        """Paginate a values_list() projection; locations are read in pages of up to 10,000"""
+        queryset = LocationFastSerializer.project(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(LocationFastSerializer.to_rows(page))
+        return Response(LocationFastSerializer.to_rows(queryset))
 
 
-class AvailabilityReportViewSet(viewsets.ModelViewSet):
+class AvailabilityReportViewSet(EagerLoadingViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for AvailabilityReport model"""
     queryset = AvailabilityReport.objects.select_related('user').all()
     serializer_class = AvailabilityReportSerializer
@@ -1077,7 +1798,7 @@ class AvailabilityReportViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class AccessRequestViewSet(viewsets.ReadOnlyModelViewSet):
+class AccessRequestViewSet(EagerLoadingViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for AccessRequest model (read-only, use custom actions for approve/reject)"""
     queryset = AccessRequest.objects.select_related('user', 'approved_by').all()
     serializer_class = AccessRequestSerializer
@@ -0,0 +1,74 @@
+"""
+Bulk approval of access requests.
+
+Approving many requests one by one costs several saves, a synchronous
+approval email and an OTP email per request. Here the whole batch is one
+transaction: one UPDATE for the requests, one for the users and one bulk
+insert for the OTPs, and all emails go out together after commit over a
+single mail connection.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.api.response_cache import invalidate_models
+from core.models import User, AccessRequest, OTPToken
+
+logger = logging.getLogger('core')
+
+
+def bulk_approve_access_requests(access_request_ids, approver, send_otp=True):
+    """
+    Approve the pending requests among access_request_ids.
+    Requests that are missing or no longer pending are skipped (and reported).
+    With send_otp=True each approved user also gets a login OTP (subject to
+    the per-user OTP rate limit). Bypasses the pre_save approval signal, so
+    no per-request OTP is sent on top of the batch.
+    Returns {'approved': [ids], 'skipped': [ids], 'otp_count': n}.
+    """
+    from core.api.views import generate_otp_token, check_otp_rate_limit, send_bulk_approval_emails
+
+    access_request_ids = set(access_request_ids)
+    now = timezone.now()
+
+    with transaction.atomic():
+        # Lock the pending rows so concurrent approvals cannot double-process them
+        pending = dict(
+            AccessRequest.objects.select_for_update()
+            .filter(id__in=access_request_ids, status='pending')
+            .values_list('id', 'user_id')
+        )
+        AccessRequest.objects.filter(id__in=pending).update(
+            status='approved',
+            approved_by=approver,
+            approved_at=now,
+        )
+        users = list(User.objects.filter(id__in=set(pending.values())))
+        User.objects.filter(id__in=[user.id for user in users]).update(is_approved=True, updated_at=now)
+        invalidate_models(User)
+
+        user_tokens = []
+        if send_otp:
+            expires_at = now + timedelta(minutes=settings.OTP_EXPIRY_MINUTES)
+            user_tokens = [
+                (user, generate_otp_token())
+                for user in users if user.email and check_otp_rate_limit(user)
+            ]
+            OTPToken.objects.bulk_create([
+                OTPToken(user=user, token=otp_token, purpose='login', expires_at=expires_at)
+                for user, otp_token in user_tokens
+            ])
+
+        recipients = [user for user in users if user.email]
+        if recipients:
+            transaction.on_commit(lambda: send_bulk_approval_emails(recipients, user_tokens))
+
+    logger.info(f"[BULK APPROVE] {len(pending)} access requests approved by {approver}")
+    return {
+        'approved': sorted(pending),
+        'skipped': sorted(access_request_ids - set(pending)),
+        'otp_count': len(user_tokens),
+    }
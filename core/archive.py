@@ -0,0 +1,241 @@
+"""
+Cold storage for old availability reports.
+
+archive_reports (python manage.py archive_reports) moves whole months of
+reports older than a cutoff out of the database into one compressed file
+per month under REPORT_ARCHIVE_DIR:
+
+    year=2026/month=01/reports.parquet   (pandas + pyarrow)
+    year=2026/month=01/reports.csv.gz    (fallback when pyarrow is missing)
+
+The file is written (to a temporary name, then renamed) before the rows are
+deleted, in the same transaction that holds them locked, so a crash can
+leave a report in both places but never in neither. Deletes bypass the
+model signals: archived reports are not deleted for sync clients, so they
+get no tombstones.
+
+read_archived_reports() is the read side. Callers merge its rows with the
+database's for the same range; when a report exists in both, the database
+copy wins (see merge_reports and with_archived_reports). Ranges that start
+after the newest archived month never read an archive file.
+"""
+import gzip
+import importlib.util
+import logging
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils import timezone
+
+from core.api.response_cache import invalidate_models
+from core.models import AvailabilityReport, User
+
+logger = logging.getLogger('core')
+
+PARQUET = 'parquet'
+CSV = 'csv'
+FILENAMES = {PARQUET: 'reports.parquet', CSV: 'reports.csv.gz'}
+DELETE_BATCH_SIZE = 1000
+
+
+def _to_int(value):
+    return None if value is None or value == '' or pd.isna(value) else int(value)
+
+
+def _to_text(value):
+    return '' if value is None or pd.isna(value) else str(value)
+
+
+def _to_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def _to_datetime(value):
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+# Archived columns and how to read each back from either file format
+COLUMNS = {
+    'id': _to_int,
+    'user_id': _to_int,
+    'date': _to_date,
+    'status': _to_text,
+    'location_id': _to_int,
+    'location_text': _to_text,
+    'notes': _to_text,
+    'submitted_at': _to_datetime,
+    'updated_at': _to_datetime,
+}
+
+
+def parquet_available():
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def default_format():
+    return PARQUET if parquet_available() else CSV
+
+
+def archive_root():
+    return Path(settings.REPORT_ARCHIVE_DIR)
+
+
+def month_directory(month):
+    return archive_root() / f'year={month.year}' / f'month={month.month:02d}'
+
+
+def month_end(month):
+    return month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1)
+
+
+def archived_months():
+    """First day of every month that has an archive file, oldest first"""
+    months = set()
+    for filename in FILENAMES.values():
+        for path in archive_root().glob(f'year=*/month=*/{filename}'):
+            months.add(date(int(path.parent.parent.name[5:]), int(path.parent.name[6:]), 1))
+    return sorted(months)
+
+
+def read_month(month):
+    """Return the archived rows of `month` as dicts of Python values ([] if not archived)"""
+    directory = month_directory(month)
+    parquet_path, csv_path = directory / FILENAMES[PARQUET], directory / FILENAMES[CSV]
+    if parquet_path.exists():
+        if not parquet_available():
+            raise ImproperlyConfigured(f'{parquet_path} needs pyarrow to be read')
+        frame = pd.read_parquet(parquet_path)
+    elif csv_path.exists():
+        frame = pd.read_csv(csv_path, dtype=str, keep_default_na=False, compression='gzip')
+    else:
+        return []
+    return [
+        {column: convert(record[column]) for column, convert in COLUMNS.items()}
+        for record in frame.to_dict('records')
+    ]
+
+
+def write_month(month, rows, file_format):
+    """Atomically replace the archive file of `month` with `rows`"""
+    directory = month_directory(month)
+    directory.mkdir(parents=True, exist_ok=True)
+    frame = pd.DataFrame.from_records(rows, columns=list(COLUMNS))
+    # Nullable integer, so neither format turns location ids into floats
+    frame['location_id'] = frame['location_id'].astype('Int64')
+    path = directory / FILENAMES[file_format]
+    temporary = path.with_name(f'.{path.name}.tmp')
+    if file_format == PARQUET:
+        frame.to_parquet(temporary, compression='zstd', index=False)
+    else:
+        with gzip.open(temporary, 'wt', newline='') as output:
+            frame.to_csv(output, index=False)
+    with open(temporary, 'rb') as written:
+        os.fsync(written.fileno())
+    os.replace(temporary, path)
+    # A month is kept in one format; drop the other after switching
+    for other_format, filename in FILENAMES.items():
+        if other_format != file_format and (directory / filename).exists():
+            (directory / filename).unlink()
+    return path
+
+
+def merge_reports(current, archived):
+    """Rows of both lists, one per (user_id, date); `current` wins over `archived`"""
+    merged = {(row['user_id'], row['date']): row for row in archived}
+    merged.update({(row['user_id'], row['date']): row for row in current})
+    return list(merged.values())
+
+
+def archive_month(month, file_format=None, dry_run=False):
+    """Move the reports of `month` into its archive file; returns the number of reports moved"""
+    start, end = month, month_end(month)
+    with transaction.atomic():
+        queryset = AvailabilityReport.objects.select_for_update().filter(date__gte=start, date__lt=end)
+        rows = list(queryset.order_by('date', 'user_id').values(*COLUMNS))
+        if dry_run or not rows:
+            return len(rows)
+        write_month(month, merge_reports(rows, read_month(month)), file_format or default_format())
+        ids = [row['id'] for row in rows]
+        deleted = 0
+        for offset in range(0, len(ids), DELETE_BATCH_SIZE):
+            # Raw delete: no signals, so no tombstones. The date range keeps PostgreSQL on
+            # this month's partition; the ids spare reports added since they were read.
+            deleted += AvailabilityReport.objects.filter(
+                date__gte=start, date__lt=end, pk__in=ids[offset:offset + DELETE_BATCH_SIZE]
+            )._raw_delete(queryset.db)
+        invalidate_models(AvailabilityReport)
+    logger.info(f"[ARCHIVE] Archived {deleted} reports of {month:%Y-%m}")
+    return deleted
+
+
+def archive_reports(before=None, file_format=None, dry_run=False):
+    """
+    Archive every whole month that ends on or before `before` (default:
+    REPORT_ARCHIVE_AFTER_DAYS ago). Returns {month: reports moved}.
+    """
+    before = before or timezone.localdate() - timedelta(days=settings.REPORT_ARCHIVE_AFTER_DAYS)
+    # Months whose last day is on or before `before`
+    boundary = (before + timedelta(days=1)).replace(day=1)
+    months = AvailabilityReport.objects.filter(date__lt=boundary).dates('date', 'month')
+    return {month: archive_month(month, file_format, dry_run) for month in months}
+
+
+def read_archived_reports(date_from=None, date_to=None, user_ids=None):
+    """
+    Archived rows with date_from <= date <= date_to, optionally only for
+    `user_ids`. Returns [] without touching the disk when the range starts
+    after the newest archived month.
+    """
+    months = archived_months()
+    if not months or (date_from and date_from >= month_end(months[-1])):
+        return []
+    rows = []
+    for month in months:
+        if (date_from and month_end(month) <= date_from) or (date_to and month > date_to):
+            continue
+        rows.extend(
+            row for row in read_month(month)
+            if (not date_from or row['date'] >= date_from)
+            and (not date_to or row['date'] <= date_to)
+            and (user_ids is None or row['user_id'] in user_ids)
+        )
+    return rows
+
+
+def with_archived_reports(reports, date_from=None, date_to=None, user_filters=()):
+    """
+    Add the archived reports in range to `reports` (database instances),
+    as unsaved AvailabilityReport instances with user, profile and unit
+    loaded. Each of `user_filters` is an iterable of user ids (e.g. a
+    values_list queryset) the report's user must be in; they are only
+    evaluated when the range reaches the archive. Sorted like the model's
+    default ordering when any reports were added.
+    """
+    current = {(report.user_id, report.date) for report in reports}
+    rows = [
+        row for row in read_archived_reports(date_from, date_to)
+        if (row['user_id'], row['date']) not in current
+    ]
+    if rows and user_filters:
+        allowed = set.intersection(*(set(user_ids) for user_ids in user_filters))
+        rows = [row for row in rows if row['user_id'] in allowed]
+    if not rows:
+        return reports
+    users = User.objects.select_related('profile', 'profile__unit').in_bulk({row['user_id'] for row in rows})
+    archived = []
+    for row in rows:
+        # Reports of deleted users are gone from the database too
+        if row['user_id'] in users:
+            report = AvailabilityReport(**row)
+            report.user = users[row['user_id']]
+            archived.append(report)
+    return sorted([*reports, *archived], key=lambda report: (report.date, report.submitted_at), reverse=True)
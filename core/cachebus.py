@@ -0,0 +1,185 @@
+"""
+Cross-worker cache invalidation bus.
+
+Every in-process cache is tagged with one or more namespaces (model labels
+such as 'core.unit'). Writers bump the namespace's counter in the
+CacheVersion table right after their transaction commits, in a statement
+of its own: bumping inside the transaction would hold the counter row's
+lock until commit and serialize every concurrent writer of the model. The
+price is a brief window between the commit and the bump in which other
+workers can still serve (and cache under the old version) the previous
+data; the bump then invalidates it. Readers compare versions from a
+process-local snapshot that is refreshed with one query for all namespaces
+at most every CACHE_BUS_CHECK_INTERVAL_MS, which bounds how stale another
+worker's cache can be. Snapshots are kept per database alias
+(see core.routers), so a request reading from the replica compares its
+cache against the replica's counters.
+
+With CACHE_BUS_LISTEN on PostgreSQL, bumps also send a NOTIFY and each
+worker keeps a LISTEN connection in a background thread that marks the
+snapshot stale as soon as one arrives, so the next read reloads it;
+polling then only runs every CACHE_BUS_LISTEN_POLL_MS as a safety net for
+missed notifications.
+"""
+import logging
+import select
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connection, connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import CacheVersion
+
+logger = logging.getLogger('core')
+
+NOTIFY_CHANNEL = 'cache_versions'
+LISTEN_RETRY_SECONDS = 5
+
+
+def model_namespace(model):
+    return model._meta.label_lower
+
+
+class CacheVersionBus:
+    """Process-wide view of the CacheVersion counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # {database alias: (monotonic time loaded, {namespace: version})}
+        self._snapshots = {}
+        self._listener = None
+        self._listening = False
+
+    def _check_interval(self, using):
+        # NOTIFY fires on the primary's commit, before a replica may have the new row
+        if self._listening and using == DEFAULT_DB_ALIAS:
+            return settings.CACHE_BUS_LISTEN_POLL_MS / 1000
+        return settings.CACHE_BUS_CHECK_INTERVAL_MS / 1000
+
+    def refresh(self, using=DEFAULT_DB_ALIAS):
+        """Reload every counter from one database with a single query"""
+        versions = dict(CacheVersion.objects.using(using).values_list('namespace', 'version'))
+        with self._lock:
+            self._snapshots[using] = (time.monotonic(), versions)
+        return versions
+
+    def invalidate(self):
+        """Drop the snapshots so the next read reloads them"""
+        with self._lock:
+            self._snapshots = {}
+
+    def versions(self, namespaces):
+        """
+        Return the current version of each namespace (0 if never bumped), as
+        seen by the database the caller reads from, so versions and data match.
+        """
+        if settings.CACHE_BUS_LISTEN:
+            self._ensure_listener()
+        using = router.db_for_read(CacheVersion)
+        checked_at, versions = self._snapshots.get(using, (None, None))
+        if checked_at is None or time.monotonic() - checked_at >= self._check_interval(using):
+            versions = self.refresh(using)
+        return tuple(versions.get(namespace, 0) for namespace in namespaces)
+
+    def version(self, namespace):
+        return self.versions([namespace])[0]
+
+    def bump(self, *namespaces):
+        """
+        Increment the counters once the current transaction commits (at once
+        outside one). This process sees the change on its next read; others
+        within the check interval (or at once via NOTIFY).
+        """
+        namespaces = sorted(set(namespaces))
+        if namespaces:
+            transaction.on_commit(lambda: self._increment(namespaces), using=DEFAULT_DB_ALIAS)
+
+    def _increment(self, namespaces):
+        # Runs in autocommit, so concurrent writers never queue on the counter rows
+        counters = CacheVersion.objects.filter(namespace__in=namespaces)
+        if counters.update(version=F('version') + 1, updated_at=timezone.now()) < len(namespaces):
+            existing = set(counters.values_list('namespace', flat=True))
+            missing = [namespace for namespace in namespaces if namespace not in existing]
+            # Start new counters from the clock so a re-created row never repeats an old version.
+            # A concurrent insert wins the conflict; the update then waits for it and still counts.
+            start = time.time_ns() // 1000
+            CacheVersion.objects.bulk_create(
+                [CacheVersion(namespace=namespace, version=start) for namespace in missing], ignore_conflicts=True
+            )
+            counters.filter(namespace__in=missing).update(version=F('version') + 1, updated_at=timezone.now())
+        if connection.vendor == 'postgresql' and settings.CACHE_BUS_LISTEN:
+            with connection.cursor() as cursor:
+                for namespace in namespaces:
+                    cursor.execute('SELECT pg_notify(%s, %s)', [NOTIFY_CHANNEL, namespace])
+        # Re-read on next access
+        self.invalidate()
+
+    def _ensure_listener(self):
+        wrapper = connections['default']
+        if self._listener is not None or wrapper.vendor != 'postgresql':
+            return
+        if wrapper.Database.__name__ != 'psycopg2':
+            logger.warning("[CACHE BUS] LISTEN mode needs psycopg2, polling only")
+            self._listener = False
+            return
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen_forever, name='cache-bus-listener', daemon=True)
+                self._listener.start()
+
+    def _listen_forever(self):
+        while True:
+            try:
+                self._listen()
+            except Exception as e:
+                logger.warning(f"[CACHE BUS] LISTEN connection lost, falling back to polling: {e}")
+            self._listening = False
+            time.sleep(LISTEN_RETRY_SECONDS)
+
+    def _listen(self):
+        wrapper = connections['default']
+        listen_connection = wrapper.Database.connect(**wrapper.get_connection_params())
+        try:
+            listen_connection.autocommit = True
+            with listen_connection.cursor() as cursor:
+                cursor.execute(f'LISTEN {NOTIFY_CHANNEL}')
+            self._listening = True
+            # Anything bumped before LISTEN took effect is picked up by a full reload
+            self.invalidate()
+            while True:
+                if not select.select([listen_connection], [], [], LISTEN_RETRY_SECONDS)[0]:
+                    continue
+                listen_connection.poll()
+                if listen_connection.notifies:
+                    listen_connection.notifies.clear()
+                    # One reload picks up every namespace bumped since, whatever the payloads
+                    self.invalidate()
+        finally:
+            listen_connection.close()
+
+
+cache_bus = CacheVersionBus()
+
+
+class ProcessCache:
+    """
+    Process-local dict that empties itself whenever one of its namespaces is
+    bumped anywhere, so it can live as long as the worker.
+    """
+
+    def __init__(self, *namespaces):
+        self.namespaces = namespaces
+        self._versions = None
+        self._data = {}
+
+    def get(self, key, compute):
+        versions = cache_bus.versions(self.namespaces)
+        if versions != self._versions:
+            self._data = {}
+            self._versions = versions
+        if key not in self._data:
+            self._data[key] = compute()
+        return self._data[key]
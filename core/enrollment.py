@@ -0,0 +1,296 @@
+"""
+Bulk user enrolment from CSV / XLSX files.
+
+Columns (header row, any order): email, city and address are required;
+first_name, last_name, phone, unit_code, service_type, role, contact_name,
+contact_phone, username and password are optional. Without a password the
+account is OTP-only.
+
+Used by `python manage.py import_users` and the staff import endpoint.
+All rows are validated up front against in-memory indexes (unit codes,
+location names, existing emails and usernames), passwords are hashed (in a
+process pool for the management command only: forking a multi-threaded web
+worker is unsafe), and valid rows are inserted with bulk_create in chunks, one
+transaction per chunk. Invalid rows are skipped and reported by row number.
+"""
+import csv
+import io
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from core.api.response_cache import invalidate_models
+from core.models import User, Profile, Unit, Location, AccessRequest
+from core.users import normalize_email, get_users_by_email
+
+logger = logging.getLogger('core')
+
+USER_FIELDS = ['first_name', 'last_name', 'phone']
+PROFILE_FIELDS = ['address', 'service_type', 'role', 'contact_name', 'contact_phone']
+DEFAULT_BATCH_SIZE = 500
+# Below this many passwords, starting worker processes costs more than it saves
+PARALLEL_HASH_THRESHOLD = 50
+
+
+def read_user_rows(fileobj, filename):
+    """Read rows (dicts keyed by lower-case column name) from a .csv or .xlsx file"""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.xlsx':
+        from openpyxl import load_workbook
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+        values = workbook.active.iter_rows(values_only=True)
+        header = next(values, None) or []
+        rows = [dict(zip(header, row)) for row in values if any(cell is not None for cell in row)]
+        workbook.close()
+    elif extension == '.csv':
+        content = fileobj.read()
+        if isinstance(content, bytes):
+            content = content.decode('utf-8-sig')
+        rows = list(csv.DictReader(io.StringIO(content)))
+    else:
+        raise ValueError(f"Unsupported file type {extension!r}, expected .csv or .xlsx")
+
+    return [
+        {
+            str(key).strip().lower(): _cell_to_str(value)
+            for key, value in row.items() if key is not None
+        }
+        for row in rows
+    ]
+
+
+def _cell_to_str(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        # Excel stores phone numbers and codes as floats
+        value = int(value)
+    return str(value).strip()
+
+
+def _init_hash_worker(settings_module):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def hash_passwords(passwords, workers=None):
+    """
+    Hash passwords with the configured hasher, in parallel worker processes.
+    Empty passwords become unusable passwords (OTP-only accounts) without hashing.
+    """
+    hashes = [None if password else make_password(None) for password in passwords]
+    pending = [index for index, password in enumerate(passwords) if password]
+    workers = workers or os.cpu_count() or 1
+
+    if workers <= 1 or len(pending) < PARALLEL_HASH_THRESHOLD:
+        for index in pending:
+            hashes[index] = make_password(passwords[index])
+        return hashes
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_hash_worker,
+        initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'yirok_project.settings'),),
+    ) as pool:
+        results = pool.map(
+            make_password,
+            [passwords[index] for index in pending],
+            chunksize=max(1, len(pending) // (workers * 4)),
+        )
+        for index, hashed in zip(pending, results):
+            hashes[index] = hashed
+    return hashes
+
+
+class UserImportIndex:
+    """In-memory lookups used to validate every row without per-row queries"""
+
+    def __init__(self, emails):
+        self.units = dict(Unit.objects.exclude(code__isnull=True).exclude(code='').values_list('code', 'id'))
+        self.locations = {}
+        for location_id, name, name_he in Location.objects.values_list('id', 'name', 'name_he'):
+            for value in (name_he, name):
+                if value:
+                    self.locations.setdefault(value.strip(), location_id)
+        self.existing_emails = set(get_users_by_email(emails))
+        # All usernames: generated names need the full set to pick free suffixes
+        self.usernames = set(User.objects.values_list('username', flat=True))
+
+    def claim_username(self, username, email):
+        """Reserve the requested username, or generate one from the email prefix"""
+        if username:
+            if username in self.usernames:
+                return None
+            self.usernames.add(username)
+            return username
+        username_base = email.split('@')[0] or 'user'
+        username = username_base
+        counter = 1
+        while username in self.usernames:
+            username = f"{username_base}{counter}"
+            counter += 1
+        self.usernames.add(username)
+        return username
+
+
+def _clean_field(model, name, value, errors):
+    try:
+        return model._meta.get_field(name).clean(value, None)
+    except ValidationError as e:
+        errors[name] = ' '.join(e.messages)
+        return value
+
+
+def validate_user_rows(rows):
+    """
+    Validate rows against the database and each other.
+    Returns (valid, errors): valid is a list of (row_number, cleaned) and
+    errors a list of {'row', 'email', 'errors'} entries.
+    Row numbers count the header as row 1, as in a spreadsheet.
+    """
+    index = UserImportIndex([row.get('email', '') for row in rows])
+    seen_emails = set()
+    valid = []
+    errors = []
+
+    for position, row in enumerate(rows):
+        row_number = position + 2
+        row_errors = {}
+        email = normalize_email(row.get('email'))
+
+        if not email:
+            row_errors['email'] = 'This field is required.'
+        else:
+            try:
+                validate_email(email)
+            except ValidationError:
+                row_errors['email'] = 'Enter a valid email address.'
+            if email in index.existing_emails:
+                row_errors['email'] = 'A user with this email already exists.'
+            elif email in seen_emails:
+                row_errors['email'] = 'Duplicate email in file.'
+        seen_emails.add(email)
+
+        cleaned = {'email': email, 'password': row.get('password', '')}
+        for name in USER_FIELDS:
+            cleaned[name] = _clean_field(User, name, row.get(name, ''), row_errors)
+        for name in PROFILE_FIELDS:
+            value = row.get(name, '')
+            if name == 'role':
+                value = value or 'user'
+            cleaned[name] = _clean_field(Profile, name, value, row_errors)
+
+        unit_code = row.get('unit_code', '')
+        cleaned['unit_id'] = None
+        if unit_code:
+            cleaned['unit_id'] = index.units.get(unit_code)
+            if cleaned['unit_id'] is None:
+                row_errors['unit_code'] = f'Unit with code {unit_code!r} does not exist.'
+
+        city = row.get('city', '')
+        cleaned['city_id'] = index.locations.get(city)
+        if not city:
+            row_errors['city'] = 'This field is required.'
+        elif cleaned['city_id'] is None:
+            row_errors['city'] = f'City {city!r} does not exist.'
+
+        if not row_errors:
+            cleaned['username'] = index.claim_username(row.get('username', ''), email)
+            if cleaned['username'] is None:
+                row_errors['username'] = 'A user with that username already exists.'
+
+        if row_errors:
+            errors.append({'row': row_number, 'email': email, 'errors': row_errors})
+        else:
+            valid.append((row_number, cleaned))
+
+    return valid, errors
+
+
+def _insert_chunk(chunk, hashes, approve, approved_by, now):
+    with transaction.atomic():
+        users = User.objects.bulk_create([
+            User(
+                username=cleaned['username'],
+                email=cleaned['email'],
+                password=password_hash,
+                first_name=cleaned['first_name'],
+                last_name=cleaned['last_name'],
+                phone=cleaned['phone'],
+                is_active=True,
+                is_approved=approve,
+            )
+            for (row_number, cleaned), password_hash in zip(chunk, hashes)
+        ])
+        Profile.objects.bulk_create([
+            Profile(
+                user=user,
+                unit_id=cleaned['unit_id'],
+                city_id=cleaned['city_id'],
+                **{name: cleaned[name] for name in PROFILE_FIELDS}
+            )
+            for user, (row_number, cleaned) in zip(users, chunk)
+        ])
+        AccessRequest.objects.bulk_create([
+            AccessRequest(
+                user=user,
+                status='approved' if approve else 'pending',
+                approved_by=approved_by if approve else None,
+                approved_at=now if approve else None,
+            )
+            for user in users
+        ])
+        invalidate_models(User, Profile)
+    return len(users)
+
+
+def import_users(rows, approve=False, approved_by=None, dry_run=False,
+                 batch_size=DEFAULT_BATCH_SIZE, workers=None):
+    """
+    Validate and insert users (with profile and access request) from parsed rows.
+    With approve=True accounts are created approved; no approval emails are sent.
+    Returns a report: counts, duration and per-row errors.
+    """
+    started = time.monotonic()
+    valid, errors = validate_user_rows(rows)
+    created = 0
+
+    if valid and not dry_run:
+        hashes = hash_passwords([cleaned['password'] for row_number, cleaned in valid], workers)
+        now = timezone.now()
+        for start in range(0, len(valid), batch_size):
+            chunk = valid[start:start + batch_size]
+            try:
+                created += _insert_chunk(chunk, hashes[start:start + batch_size], approve, approved_by, now)
+            except IntegrityError as e:
+                # Another writer took an email/username since validation: report and move on
+                logger.warning(f"[IMPORT] Chunk starting at row {chunk[0][0]} failed: {e}")
+                errors.extend(
+                    {'row': row_number, 'email': cleaned['email'],
+                     'errors': {'non_field_errors': 'Conflicts with a concurrently created user, please retry.'}}
+                    for row_number, cleaned in chunk
+                )
+        errors.sort(key=lambda error: error['row'])
+
+    report = {
+        'total': len(rows),
+        'valid': len(valid),
+        'created': created,
+        'failed': len(errors),
+        'dry_run': dry_run,
+        'duration_ms': int((time.monotonic() - started) * 1000),
+        'errors': errors,
+    }
+    logger.info(
+        f"[IMPORT] {report['created']} created, {report['failed']} failed "
+        f"of {report['total']} rows in {report['duration_ms']} ms"
+    )
+    return report
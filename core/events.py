@@ -0,0 +1,164 @@
+"""
+In-process fan-out of availability report change events.
+
+Report saves and deletes are published once per process (after commit) and
+copied to every live subscriber, so any number of dashboard streams share a
+single feed instead of each one polling the database.
+"""
+import queue
+import threading
+from datetime import timezone as dt_timezone
+
+
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+
+def format_watermark(moment):
+    """Format a sync watermark as a URL-safe ISO 8601 UTC timestamp"""
+    return moment.astimezone(dt_timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+class Subscription:
+    """A single subscriber's queue of pending events"""
+
+    def __init__(self, hub):
+        self.hub = hub
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+
+    def get(self, timeout):
+        """Wait up to timeout seconds and return all pending events (possibly empty)"""
+        events = []
+        try:
+            events.append(self.queue.get(timeout=timeout))
+            while True:
+                events.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+        return events
+
+    def close(self):
+        self.hub.unsubscribe(self)
+
+
+class ReportEventHub:
+    """Process-wide broadcaster of report events to SSE subscribers"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+
+    def subscribe(self):
+        subscription = Subscription(self)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def has_subscribers(self):
+        return bool(self._subscribers)
+
+    def publish(self, event):
+        """
+        Copy an event to every subscriber.
+        Subscribers that fall too far behind are dropped; they resume from the
+        database using Last-Event-ID when they reconnect.
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(event)
+            except queue.Full:
+                subscription.overflowed = True
+                self.unsubscribe(subscription)
+
+
+report_events = ReportEventHub()
+
+
+class StreamSlots:
+    """
+    Per-process count of open event streams. Each stream holds a worker
+    thread for up to REPORT_STREAM_MAX_SECONDS, so callers refuse new streams
+    past a limit instead of starving regular requests of threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.active = 0
+
+    def acquire(self, limit):
+        """Take a slot if fewer than `limit` are in use; returns whether one was taken"""
+        with self._lock:
+            if self.active >= limit:
+                return False
+            self.active += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.active -= 1
+
+    def hold(self, stream):
+        """Wrap a taken slot's stream so closing the response gives the slot back"""
+        return _SlotStream(self, stream)
+
+
+class _SlotStream:
+    def __init__(self, slots, stream):
+        self.slots = slots
+        self.stream = stream
+        self.released = False
+
+    def __iter__(self):
+        return iter(self.stream)
+
+    def close(self):
+        # Called by the server when the response ends, even if it was never iterated
+        if not self.released:
+            self.released = True
+            self.slots.release()
+            if hasattr(self.stream, 'close'):
+                self.stream.close()
+
+
+report_stream_slots = StreamSlots()
+
+
+def report_event(report, event_type='report.updated'):
+    """Build a change event for a saved report"""
+    from core.api.serializers import AvailabilityReportSerializer
+
+    return {
+        'id': format_watermark(report.updated_at),
+        'event': event_type,
+        'user_id': report.user_id,
+        'data': AvailabilityReportSerializer(report).data,
+    }
+
+
+def tombstone_event(tombstone):
+    """Build a change event for a deleted report"""
+    return {
+        'id': format_watermark(tombstone.deleted_at),
+        'event': 'report.deleted',
+        'user_id': tombstone.user_id,
+        'data': {
+            'id': tombstone.report_id,
+            'user': tombstone.user_id,
+            'date': tombstone.date.isoformat(),
+            'deleted_at': tombstone.deleted_at.isoformat(),
+        },
+    }
+
+
+def publish_reports(reports, event_type='report.updated'):
+    """Publish change events for reports written outside of save() (bulk upserts)"""
+    if not report_events.has_subscribers():
+        return
+    for report in reports:
+        report_events.publish(report_event(report, event_type))
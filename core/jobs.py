@@ -0,0 +1,37 @@
+"""
+Periodic maintenance jobs, run by `python manage.py run_scheduler`.
+Register new jobs here with @scheduled_job('<cron expression>').
+"""
+from core.partitions import ensure_report_partitions
+from core.retention import get_retention_policies, purge
+from core.scheduler import scheduled_job
+
+
+@scheduled_job('15 * * * *')
+def purge_expired_otp_tokens():
+    """Apply the OTP token retention policy"""
+    return purge(get_retention_policies()['otp_tokens'])
+
+
+@scheduled_job('0 2 * * *')
+def purge_rejected_access_requests():
+    """Apply the rejected access request retention policy"""
+    return purge(get_retention_policies()['rejected_access_requests'])
+
+
+@scheduled_job('30 2 * * *')
+def purge_report_tombstones():
+    """Delete report tombstones older than any client is expected to poll from"""
+    return purge(get_retention_policies()['report_tombstones'])
+
+
+@scheduled_job('45 2 * * *')
+def purge_job_runs():
+    """Trim scheduler run history"""
+    return purge(get_retention_policies()['job_runs'])
+
+
+@scheduled_job('0 1 * * *')
+def maintain_report_partitions():
+    """Create the coming months' report partitions and BRIN-index old ones"""
+    return ensure_report_partitions()
@@ -0,0 +1,53 @@
+"""
+Django management command to move old availability reports to the archive.
+Run: python manage.py archive_reports
+     python manage.py archive_reports --dry-run
+     python manage.py archive_reports --before 2026-03-31 --format csv
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from core.archive import CSV, PARQUET, archive_reports, default_format, parquet_available
+
+
+class Command(BaseCommand):
+    help = 'Moves whole months of old availability reports into compressed per-month archive files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--before',
+            help=f'Archive months that end on or before this date (YYYY-MM-DD). '
+                 f'Default: {settings.REPORT_ARCHIVE_AFTER_DAYS} days ago',
+        )
+        parser.add_argument(
+            '--format',
+            choices=[PARQUET, CSV],
+            help='Archive file format. Default: parquet when pyarrow is installed, else gzip CSV',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count the reports that would be archived without moving anything',
+        )
+
+    def handle(self, *args, **options):
+        before = None
+        if options['before']:
+            before = parse_date(options['before'])
+            if before is None:
+                raise CommandError(f"Invalid date: {options['before']}")
+        file_format = options['format'] or default_format()
+        if file_format == PARQUET and not parquet_available():
+            raise CommandError('Parquet archives need pyarrow; install it or use --format csv')
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('Dry run - nothing will be archived\n'))
+
+        moved = archive_reports(before=before, file_format=file_format, dry_run=options['dry_run'])
+        verb = 'would archive' if options['dry_run'] else 'archived'
+        for month, count in moved.items():
+            self.stdout.write(self.style.SUCCESS(f"  ✓ {month:%Y-%m}: {verb} {count} reports ({file_format})"))
+        if not moved:
+            self.stdout.write('  Nothing to archive')
@@ -0,0 +1,134 @@
+"""
+Django management command to benchmark JSON rendering and compression on the list endpoints.
+Run: python manage.py benchmark_responses
+     python manage.py benchmark_responses --seed 2000 --repeat 10
+     python manage.py benchmark_responses --user admin
+
+With --seed, synthetic users (with profiles and a week of reports each) are
+created inside a transaction that is rolled back afterwards.
+"""
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from django.urls import resolve, reverse
+from django.utils import timezone
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.api.renderers import FastJSONRenderer, ColumnarJSONRenderer, orjson
+from core.middleware import CompressionMiddleware, brotli
+from core.models import User, Profile, Location, AvailabilityReport
+
+ENDPOINTS = [
+    ('reports', 'list-reports', {}),
+    ('approved users', 'user-approved', {}),
+    ('locations', 'location-list', {'page_size': 10000}),
+]
+
+
+def timed(func, repeat):
+    """Run func `repeat` times; return (median ms, last result)"""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        durations.append((time.perf_counter() - started) * 1000)
+    return statistics.median(durations), result
+
+
+class Command(BaseCommand):
+    help = 'Times stock, fast and columnar JSON rendering and gzip/brotli compression on the report, user and location lists'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Username to request as (default: first superuser)')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement, median reported (default: 5)')
+        parser.add_argument('--seed', type=int, default=0, help='Create this many synthetic users first (rolled back)')
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"orjson: {'yes' if orjson is not None else 'no (stock json)'}, "
+            f"brotli: {'yes' if brotli is not None else 'no (gzip only)'}\n"
+        )
+        with transaction.atomic():
+            if options['seed']:
+                self.seed(options['seed'])
+            user = self.get_user(options['user'])
+            # Pagination builds absolute URLs from the request host
+            with override_settings(ALLOWED_HOSTS=['*']):
+                for label, url_name, params in ENDPOINTS:
+                    self.benchmark(label, reverse(url_name), params, user, options['repeat'])
+            transaction.set_rollback(True)
+
+    def get_user(self, username):
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f'User {username!r} does not exist')
+        user = User.objects.filter(is_superuser=True).order_by('id').first()
+        if user is None:
+            user = User.objects.create_user(
+                username=f'bench-{uuid.uuid4().hex[:8]}', is_staff=True, is_superuser=True, is_approved=True
+            )
+        return user
+
+    def seed(self, count):
+        prefix = f'bench-{uuid.uuid4().hex[:8]}'
+        city = Location.objects.order_by('id').first() or Location.objects.create(name=f'{prefix}-city')
+        users = User.objects.bulk_create([
+            User(username=f'{prefix}-{index}', email=f'{prefix}-{index}@example.com',
+                 password='!', is_approved=True, first_name='Bench', last_name=str(index))
+            for index in range(count)
+        ])
+        Profile.objects.bulk_create([Profile(user=user, city=city, address='Bench St 1') for user in users])
+        today = timezone.now().date()
+        statuses = [value for value, label in AvailabilityReport.STATUS_CHOICES]
+        AvailabilityReport.objects.bulk_create([
+            AvailabilityReport(user=user, date=today - timedelta(days=day),
+                               status=statuses[(user.id + day) % len(statuses)], location=city)
+            for user in users for day in range(7)
+        ], batch_size=1000)
+        self.stdout.write(f'Seeded {count} users and {count * 7} reports (rolled back afterwards)\n')
+
+    def benchmark(self, label, url, params, user, repeat):
+        factory = APIRequestFactory()
+        match = resolve(url)
+
+        def fetch():
+            request = factory.get(url, params)
+            force_authenticate(request, user=user)
+            return match.func(request, *match.args, **match.kwargs).data
+
+        view_ms, data = timed(fetch, repeat)
+        json_ms, body = timed(lambda: JSONRenderer().render(data), repeat)
+        fast_ms, fast_body = timed(lambda: FastJSONRenderer().render(data), repeat)
+        if fast_body != body:
+            self.stdout.write(self.style.ERROR(f'  ✗ {label}: fast renderer output differs'))
+
+        rows = data.get('count', len(data)) if isinstance(data, dict) else len(data)
+        self.stdout.write(self.style.SUCCESS(f'{label} ({url}): {rows} rows, {len(body):,} bytes'))
+        self.stdout.write(f'  view (query + serialize): {view_ms:8.2f} ms')
+        self.stdout.write(f'  render json:              {json_ms:8.2f} ms')
+        self.stdout.write(f'  render fast:              {fast_ms:8.2f} ms  ({json_ms / max(fast_ms, 1e-6):.1f}x)')
+
+        columnar_ms, columnar_body = timed(lambda: ColumnarJSONRenderer().render(data), repeat)
+        self.stdout.write(f'  render columnar:          {columnar_ms:8.2f} ms  {len(columnar_body):,} bytes '
+                          f'({len(columnar_body) / max(len(body), 1):.0%}, '
+                          f'{len(compress_string(columnar_body)):,} gzipped)')
+
+        gzip_ms, gzipped = timed(
+            lambda: compress_string(body, max_random_bytes=CompressionMiddleware.max_random_bytes), repeat
+        )
+        self.stdout.write(f'  gzip:                     {gzip_ms:8.2f} ms  {len(gzipped):,} bytes '
+                          f'({len(gzipped) / max(len(body), 1):.0%})')
+        if brotli is not None:
+            br_ms, compressed = timed(lambda: brotli.compress(body, quality=5), repeat)
+            self.stdout.write(f'  brotli:                   {br_ms:8.2f} ms  {len(compressed):,} bytes '
+                              f'({len(compressed) / max(len(body), 1):.0%})')
+        self.stdout.write('')
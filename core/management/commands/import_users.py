@@ -0,0 +1,85 @@
+"""
+Django management command to enrol users in bulk from a CSV or XLSX file.
+Run: python manage.py import_users users.xlsx
+     python manage.py import_users users.csv --dry-run
+     python manage.py import_users users.csv --approve --errors errors.csv
+"""
+import csv
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.enrollment import read_user_rows, import_users, DEFAULT_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Creates users with profiles and access requests from a CSV/XLSX file, reporting invalid rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path to a .csv or .xlsx file')
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate all rows without creating anything',
+        )
+        parser.add_argument(
+            '--approve',
+            action='store_true',
+            help='Create the accounts already approved (no approval emails are sent)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Rows per bulk insert transaction (default: {DEFAULT_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Password hashing processes (default: number of CPUs)',
+        )
+        parser.add_argument(
+            '--errors',
+            help='Write the per-row error report to this CSV file',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], 'rb') as f:
+                rows = read_user_rows(f, options['path'])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('Dry run - nothing will be created\n'))
+
+        report = import_users(
+            rows,
+            approve=options['approve'],
+            dry_run=options['dry_run'],
+            batch_size=options['batch_size'],
+            workers=options['workers'],
+        )
+
+        for error in report['errors'][:20]:
+            self.stdout.write(self.style.ERROR(
+                f"  ✗ row {error['row']} ({error['email'] or 'no email'}): {json.dumps(error['errors'], ensure_ascii=False)}"
+            ))
+        if len(report['errors']) > 20:
+            self.stdout.write(self.style.ERROR(f"  ... and {len(report['errors']) - 20} more"))
+
+        if options['errors'] and report['errors']:
+            with open(options['errors'], 'w', newline='', encoding='utf-8-sig') as f:
+                writer = csv.writer(f)
+                writer.writerow(['row', 'email', 'field', 'error'])
+                for error in report['errors']:
+                    for field, message in error['errors'].items():
+                        writer.writerow([error['row'], error['email'], field, message])
+            self.stdout.write(f"  Error report written to {options['errors']}")
+
+        verb = 'valid' if options['dry_run'] else 'created'
+        count = report['valid'] if options['dry_run'] else report['created']
+        self.stdout.write(self.style.SUCCESS(
+            f"  ✓ {count} of {report['total']} users {verb}, {report['failed']} failed ({report['duration_ms']} ms)"
+        ))
@@ -0,0 +1,62 @@
+"""
+Django management command to purge rows past their retention period.
+Run: python manage.py purge_retention
+     python manage.py purge_retention --dry-run
+     python manage.py purge_retention --policy otp_tokens --batch-size 500
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.retention import get_retention_policies, purge
+
+
+class Command(BaseCommand):
+    help = 'Deletes expired OTP tokens, old rejected access requests and other stale rows in bounded chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--policy',
+            action='append',
+            help='Only apply this policy (can be repeated). Default: all policies',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count matching rows without deleting anything',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.RETENTION_BATCH_SIZE,
+            help=f'Primary-key window per DELETE (default: {settings.RETENTION_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=settings.RETENTION_BATCH_SLEEP_SECONDS,
+            help=f'Seconds to sleep between batches (default: {settings.RETENTION_BATCH_SLEEP_SECONDS})',
+        )
+
+    def handle(self, *args, **options):
+        policies = get_retention_policies()
+        names = options['policy'] or list(policies)
+        unknown = [name for name in names if name not in policies]
+        if unknown:
+            raise CommandError(f'Unknown policy: {", ".join(unknown)}. Available: {", ".join(policies)}')
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('Dry run - nothing will be deleted\n'))
+
+        for name in names:
+            metrics = purge(
+                policies[name],
+                batch_size=options['batch_size'],
+                sleep_seconds=options['sleep'],
+                dry_run=options['dry_run'],
+            )
+            verb = 'would delete' if options['dry_run'] else 'deleted'
+            self.stdout.write(self.style.SUCCESS(
+                f"  ✓ {name}: {verb} {metrics['matched']} rows older than {metrics['cutoff']} "
+                f"in {metrics['batches']} batches ({metrics['duration_ms']} ms)"
+            ))
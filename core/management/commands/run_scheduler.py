@@ -0,0 +1,56 @@
+"""
+Django management command to run periodic maintenance jobs.
+Run: python manage.py run_scheduler
+     python manage.py run_scheduler --once   (run due jobs once and exit)
+"""
+
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.scheduler import sync_jobs, run_due_jobs, default_worker_id
+
+logger = logging.getLogger('core')
+
+
+class Command(BaseCommand):
+    help = 'Runs registered periodic jobs (see core/jobs.py) with DB-backed leases'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run due jobs once and exit',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=settings.SCHEDULER_TICK_SECONDS,
+            help=f'Seconds between checks for due jobs (default: {settings.SCHEDULER_TICK_SECONDS})',
+        )
+
+    def handle(self, *args, **options):
+        worker_id = default_worker_id()
+        sync_jobs()
+        self.stdout.write(self.style.SUCCESS(f'Scheduler started ({worker_id})'))
+
+        try:
+            while True:
+                # Drop connections the database closed or that outlived CONN_MAX_AGE
+                close_old_connections()
+                try:
+                    for run in run_due_jobs(worker_id):
+                        style = self.style.SUCCESS if run.status == 'succeeded' else self.style.ERROR
+                        self.stdout.write(style(f'  {run.job.name}: {run.status} in {run.duration_ms} ms'))
+                except Exception:
+                    # e.g. the database restarting; try again on the next tick
+                    logger.error('[SCHEDULER] Tick failed', exc_info=True)
+                    self.stdout.write(self.style.ERROR('  Tick failed, retrying next tick'))
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Scheduler stopped'))
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_add_scheduled_job_and_job_run'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='otptoken',
+            index=models.Index(condition=models.Q(('used', False)), fields=['user', 'token', 'expires_at'], name='core_otp_unused_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:07
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def resolve_duplicate_emails(apps, schema_editor):
+    """
+    Make emails unique regardless of case before adding the constraint.
+    Per address, the approved / most recently active (then oldest) account keeps it;
+    the others get a "+dup<id>" tag so their data is kept and stays traceable.
+    """
+    User = apps.get_model('core', 'User')
+    
+    accounts = {}
+    for user in User.objects.exclude(email='').only('id', 'email', 'is_approved', 'last_login'):
+        accounts.setdefault(user.email.strip().lower(), []).append(user)
+    
+    for email, users in accounts.items():
+        if len(users) < 2:
+            continue
+        users.sort(key=lambda u: (not u.is_approved, -(u.last_login.timestamp() if u.last_login else 0), u.id))
+        local, _, domain = email.partition('@')
+        for user in users[1:]:
+            User.objects.filter(pk=user.pk).update(email=f"{local}+dup{user.pk}@{domain}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0019_add_otp_unused_partial_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(resolve_duplicate_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), condition=models.Q(('email', ''), _negated=True), name='core_user_email_ci_unique'),
+        ),
+    ]
@@ -0,0 +1,102 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:35
+
+from django.db import migrations, models
+
+# The rebuild copies the whole table under an ACCESS EXCLUSIVE lock held until the
+# migration commits, blocking all report reads and writes; see README (Run migrations).
+TABLE = 'core_availabilityreport'
+
+
+def get_table_definition(cursor, table):
+    """Constraints and standalone indexes of `table`, to be recreated on the rebuilt table"""
+    cursor.execute(
+        "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'f', 'c') ORDER BY contype = 'p' DESC, conname",
+        [table],
+    )
+    constraints = cursor.fetchall()
+    cursor.execute(
+        "SELECT pg_get_indexdef(index.indexrelid) FROM pg_index index "
+        "WHERE index.indrelid = %s::regclass AND NOT EXISTS ("
+        "  SELECT 1 FROM pg_constraint c WHERE c.conrelid = index.indrelid AND c.conindid = index.indexrelid"
+        ")",
+        [table],
+    )
+    # A partitioned parent reports its indexes as ON ONLY; recreate them on the whole table
+    indexes = [row[0].replace(' ON ONLY ', ' ON ', 1) for row in cursor.fetchall()]
+    cursor.execute("SELECT attidentity <> '' FROM pg_attribute WHERE attrelid = %s::regclass AND attname = 'id'", [table])
+    identity = cursor.fetchone()[0]
+    return constraints, indexes, identity
+
+
+def rebuild_table(cursor, partitioned):
+    """Recreate the reports table (partitioned by month or plain) with the same data, keys and indexes"""
+    quote = cursor.db.ops.quote_name
+    old = f'{TABLE}_rebuild'
+    constraints, indexes, identity = get_table_definition(cursor, TABLE)
+    cursor.execute(f'ALTER TABLE {quote(TABLE)} RENAME TO {quote(old)}')
+
+    partition_by = ' PARTITION BY RANGE (date)' if partitioned else ''
+    cursor.execute(f'CREATE TABLE {quote(TABLE)} (LIKE {quote(old)} INCLUDING DEFAULTS INCLUDING IDENTITY){partition_by}')
+    if partitioned:
+        cursor.execute(f'CREATE TABLE {quote(TABLE + "_default")} PARTITION OF {quote(TABLE)} DEFAULT')
+        cursor.execute(f"SELECT DISTINCT date_trunc('month', date)::date FROM {quote(old)}")
+        for (month,) in cursor.fetchall():
+            end = month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1)
+            cursor.execute(
+                f"CREATE TABLE {quote(f'{TABLE}_p{month:%Y_%m}')} PARTITION OF {quote(TABLE)} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+            )
+    cursor.execute(f'INSERT INTO {quote(TABLE)} SELECT * FROM {quote(old)}')
+
+    if identity:
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE(MAX(id), 0) + 1, false) FROM {quote(TABLE)}",
+            [TABLE],
+        )
+    else:
+        # Keep the serial sequence alive when the old table is dropped
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [old])
+        cursor.execute(f'ALTER SEQUENCE {cursor.fetchone()[0]} OWNED BY {quote(TABLE)}.id')
+    cursor.execute(f'DROP TABLE {quote(old)} CASCADE')
+
+    for name, kind, definition in constraints:
+        if kind == 'p':
+            # Every unique key of a partitioned table must include the partition key
+            definition = 'PRIMARY KEY (id, date)' if partitioned else 'PRIMARY KEY (id)'
+        cursor.execute(f'ALTER TABLE {quote(TABLE)} ADD CONSTRAINT {quote(name)} {definition}')
+    for definition in indexes:
+        cursor.execute(definition)
+
+
+def partition_reports(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from core.partitions import ensure_report_partitions
+
+    with schema_editor.connection.cursor() as cursor:
+        rebuild_table(cursor, partitioned=True)
+    ensure_report_partitions(using=schema_editor.connection.alias)
+
+
+def unpartition_reports(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        rebuild_table(cursor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_cacheversion'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='availabilityreport',
+            name='date',
+            field=models.DateField(),
+        ),
+        migrations.RunPython(partition_reports, unpartition_reports),
+    ]
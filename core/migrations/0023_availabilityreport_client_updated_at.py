@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_partition_availabilityreport_by_month'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='availabilityreport',
+            name='client_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
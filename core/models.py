@@ -1,10 +1,78 @@
+import copy
+
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, connection
+from django.db.models.functions import Lower
 from django.utils import timezone
 from django.core.validators import RegexValidator
 
 
-class User(AbstractUser):
+class DirtyFieldsMixin(models.Model):
+    """
+    Track which fields changed since the instance was loaded or last saved.
+    save() on a loaded instance writes only changed_fields (plus auto_now
+    fields) and skips the write entirely when nothing changed. Passing
+    update_fields explicitly keeps the normal Django behaviour.
+    """
+    
+    class Meta:
+        abstract = True
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot()
+        return instance
+    
+    def _snapshot(self, fields=None):
+        loaded = self.__dict__
+        fields = fields or [f for f in self._meta.concrete_fields if f.attname in loaded]
+        snapshot = getattr(self, '_loaded_values', {})
+        for field in fields:
+            value = loaded[field.attname]
+            # Copy mutable values (JSON) so in-place changes are detected
+            snapshot[field.attname] = copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+        self._loaded_values = snapshot
+    
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._snapshot([self._meta.get_field(name) for name in fields] if fields else None)
+    
+    def get_loaded_value(self, field_name, default=None):
+        """Value of a field as loaded from (or last saved to) the database"""
+        return getattr(self, '_loaded_values', {}).get(self._meta.get_field(field_name).attname, default)
+    
+    @property
+    def changed_fields(self):
+        """Names of loaded fields whose value differs from the snapshot"""
+        snapshot = getattr(self, '_loaded_values', {})
+        return [
+            field.name for field in self._meta.concrete_fields
+            if not field.primary_key and field.attname in snapshot
+            and getattr(self, field.attname) != snapshot[field.attname]
+        ]
+    
+    def save(self, *args, **kwargs):
+        incremental = (
+            not args and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert') and not self._state.adding
+            and hasattr(self, '_loaded_values')
+        )
+        if incremental:
+            changed = self.changed_fields
+            if not changed:
+                return
+            auto_now = [
+                field.name for field in self._meta.concrete_fields
+                if getattr(field, 'auto_now', False) and field.name not in changed
+            ]
+            kwargs['update_fields'] = changed + auto_now
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        self._snapshot([self._meta.get_field(name) for name in update_fields] if update_fields else None)
+
+
+class User(DirtyFieldsMixin, AbstractUser):
     """Custom User model with approval workflow"""
     is_approved = models.BooleanField(default=False, help_text="User must be approved by admin to access system")
     phone = models.CharField(
@@ -19,6 +87,14 @@ class User(AbstractUser):
         verbose_name = "User"
         verbose_name_plural = "Users"
         ordering = ['-date_joined']
+        constraints = [
+            # One account per address regardless of case (also the index for email lookups)
+            models.UniqueConstraint(
+                Lower('email'),
+                condition=~models.Q(email=''),
+                name='core_user_email_ci_unique',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.username} ({self.email})"
@@ -71,7 +147,7 @@ class Unit(models.Model):
         return descendants
 
 
-class Profile(models.Model):
+class Profile(DirtyFieldsMixin, models.Model):
     """Extended user profile with organizational role and unit assignment"""
     ROLE_CHOICES = [
         ('user', 'User'),
@@ -145,7 +221,7 @@ class Location(models.Model):
         return f"{self.name} ({self.get_location_type_display()})"
 
 
-class AvailabilityReport(models.Model):
+class AvailabilityReport(DirtyFieldsMixin, models.Model):
     """User availability report submission"""
     STATUS_CHOICES = [
         ('available', 'Available'),
@@ -155,13 +231,18 @@ class AvailabilityReport(models.Model):
     ]
     
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='availability_reports')
-    date = models.DateField(db_index=True)
+    # Range-partitioned by month on PostgreSQL (see core.partitions); date ranges use the
+    # (date, status) index, and BRIN indexes on old partitions
+    date = models.DateField()
     status = models.CharField(max_length=50, choices=STATUS_CHOICES, default='pending')
     location = models.ForeignKey(Location, null=True, blank=True, on_delete=models.SET_NULL, related_name='reports', help_text="מיקום (עיר/ישוב/קיבוץ)")
     location_text = models.CharField(max_length=200, blank=True, help_text="מיקום טקסטואלי (בסיס, בית, או מיקום אחר)")
     notes = models.TextField(blank=True, help_text="Additional notes or comments")
     submitted_at = models.DateTimeField(auto_now_add=True, db_index=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Device time of the edit when it arrived through offline sync (never later than
+    # updated_at); NULL for edits made online, which happen at updated_at
+    client_updated_at = models.DateTimeField(null=True, blank=True)
     
     class Meta:
         verbose_name = "Availability Report"
@@ -175,9 +256,52 @@ class AvailabilityReport(models.Model):
     
     def __str__(self):
         return f"{self.user.username} - {self.date} - {self.get_status_display()}"
+    
+    @property
+    def edited_at(self):
+        """When the current content was edited, for last-writer-wins against offline changes"""
+        return self.client_updated_at or self.updated_at
+    
+    def save(self, *args, **kwargs):
+        # Any other edit replaces the synced one, and happens now
+        changed = self.changed_fields
+        if changed and 'client_updated_at' not in changed:
+            self.client_updated_at = None
+        super().save(*args, **kwargs)
+
+
+class ReportTombstone(models.Model):
+    """Record of a deleted availability report, used by the changes feed"""
+    report_id = models.BigIntegerField()
+    # Plain column rather than a FK: reports deleted by a user cascade must still leave a tombstone
+    user_id = models.BigIntegerField(db_index=True)
+    date = models.DateField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    class Meta:
+        verbose_name = "Report Tombstone"
+        verbose_name_plural = "Report Tombstones"
+        ordering = ['-deleted_at']
+    
+    def __str__(self):
+        return f"Deleted report #{self.report_id} - {self.user_id} - {self.date}"
+
+
+class CacheVersion(models.Model):
+    """Per-namespace change counter shared by all workers (see core.cachebus)"""
+    namespace = models.CharField(max_length=100, primary_key=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Cache Version"
+        verbose_name_plural = "Cache Versions"
+    
+    def __str__(self):
+        return f"{self.namespace} v{self.version}"
 
 
-class AccessRequest(models.Model):
+class AccessRequest(DirtyFieldsMixin, models.Model):
     """User access request requiring admin approval"""
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -228,7 +352,7 @@ class AccessRequest(models.Model):
         self.save()
 
 
-class OTPToken(models.Model):
+class OTPToken(DirtyFieldsMixin, models.Model):
     """OTP token for email verification and login"""
     PURPOSE_CHOICES = [
         ('login', 'Login'),
@@ -249,6 +373,12 @@ class OTPToken(models.Model):
         indexes = [
             models.Index(fields=['user', 'used', 'expires_at']),
             models.Index(fields=['token', 'used']),
+            # Only live tokens are ever looked up for verification
+            models.Index(
+                fields=['user', 'token', 'expires_at'],
+                condition=models.Q(used=False),
+                name='core_otp_unused_idx',
+            ),
         ]
     
     def __str__(self):
@@ -261,4 +391,95 @@ class OTPToken(models.Model):
     def mark_as_used(self):
         """Mark OTP as used"""
         self.used = True
-        self.save()
+        self.save(update_fields=['used'])
+    
+    @classmethod
+    def consume(cls, email, token, now=None):
+        """
+        Atomically mark a valid, unused OTP for the user with this email (any case) as used.
+        Runs as a single UPDATE ... FROM ... RETURNING that also returns the user's row,
+        so of two concurrent verifications with the same code only one can succeed, and
+        the success path needs no second query. Returns the User, or None if there was
+        no valid token.
+        """
+        quote = connection.ops.quote_name
+        otp_table, user_table = quote(cls._meta.db_table), quote(User._meta.db_table)
+        columns = [quote(field.column) for field in User._meta.concrete_fields]
+        if connection.vendor == 'sqlite':
+            # SQLite's RETURNING cannot read the FROM table; look each column up by primary key
+            returning = ', '.join(
+                f"(SELECT {column} FROM {user_table} returned WHERE returned.{quote('id')} = "
+                f"{otp_table}.{quote('user_id')}) AS {column}"
+                for column in columns
+            )
+        else:
+            returning = ', '.join(f"{user_table}.{column}" for column in columns)
+        users = User.objects.raw(
+            f"UPDATE {otp_table} SET {quote('used')} = %s FROM {user_table} "
+            f"WHERE {otp_table}.{quote('user_id')} = {user_table}.{quote('id')} "
+            # email <> '' lets the planner use the partial core_user_email_ci_unique index
+            f"AND LOWER({user_table}.{quote('email')}) = %s AND {user_table}.{quote('email')} <> %s "
+            f"AND {otp_table}.{quote('token')} = %s AND {otp_table}.{quote('used')} = %s "
+            f"AND {otp_table}.{quote('expires_at')} > %s "
+            f"RETURNING {returning}",
+            [True, email.strip().lower(), '', token, False, connection.ops.adapt_datetimefield_value(now or timezone.now())],
+            using=connection.alias,
+        )
+        # Iterate once: every iteration of a raw queryset runs the statement again
+        return next(iter(users), None)
+
+
+class ScheduledJob(models.Model):
+    """Periodic maintenance job registered in core.jobs, with a DB-backed run lease"""
+    name = models.CharField(max_length=100, unique=True)
+    schedule = models.CharField(max_length=100, help_text="Cron expression (minute hour day month weekday)")
+    enabled = models.BooleanField(default=True)
+    next_run_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    run_requested = models.BooleanField(default=False, help_text="Run on the scheduler's next tick regardless of schedule")
+    locked_by = models.CharField(max_length=200, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Scheduled Job"
+        verbose_name_plural = "Scheduled Jobs"
+        ordering = ['name']
+    
+    def __str__(self):
+        return f"{self.name} ({self.schedule})"
+
+
+class JobRun(models.Model):
+    """Run history of a scheduled job"""
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+    TRIGGER_CHOICES = [
+        ('schedule', 'Schedule'),
+        ('manual', 'Manual'),
+    ]
+    
+    job = models.ForeignKey(ScheduledJob, on_delete=models.CASCADE, related_name='runs')
+    trigger = models.CharField(max_length=20, choices=TRIGGER_CHOICES, default='schedule')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running')
+    worker = models.CharField(max_length=200, blank=True)
+    started_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration_ms = models.PositiveIntegerField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    
+    class Meta:
+        verbose_name = "Job Run"
+        verbose_name_plural = "Job Runs"
+        ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['job', 'started_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.job.name} @ {self.started_at} - {self.get_status_display()}"
@@ -0,0 +1,124 @@
+"""
+Monthly range partitioning of the availability reports table (PostgreSQL).
+
+Migration 0022 turns core_availabilityreport into a table partitioned by
+month on `date`, so range filters (`from`/`to` on the report list and
+export views) only scan the partitions they overlap. Django keeps treating
+it as a plain table; the one visible difference is that the database
+primary key is (id, date), because PostgreSQL requires the partition key in
+every unique constraint. Ids still come from a single sequence.
+
+Every month that has reports gets its own partition, as do the next
+REPORT_PARTITION_MONTHS_AHEAD months. Rows for any other month land in the
+DEFAULT partition until ensure_report_partitions(), run daily from
+core.jobs, gives them one. Partitions that ended more than
+REPORT_PARTITION_BRIN_AFTER_MONTHS months ago no longer change and are
+stored in date order, so they also get a BRIN index on `date`.
+
+On other databases (SQLite in development) the table stays unpartitioned
+and all of this is a no-op.
+"""
+import re
+from datetime import date
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from core.models import AvailabilityReport
+
+REPORTS_TABLE = AvailabilityReport._meta.db_table
+DEFAULT_PARTITION = f'{REPORTS_TABLE}_default'
+PARTITION_NAME_RE = re.compile(rf'^{REPORTS_TABLE}_p(\d{{4}})_(\d{{2}})$')
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'{REPORTS_TABLE}_p{month:%Y_%m}'
+
+
+def partition_month(name):
+    """Return the first day of the month a partition holds, or None for the default partition"""
+    match = PARTITION_NAME_RE.match(name)
+    return date(int(match[1]), int(match[2]), 1) if match else None
+
+
+def is_partitioned(connection):
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)', [REPORTS_TABLE])
+        return cursor.fetchone() is not None
+
+
+def get_partitions(cursor):
+    cursor.execute(
+        'SELECT child.relname FROM pg_inherits JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+        'WHERE pg_inherits.inhparent = to_regclass(%s)',
+        [REPORTS_TABLE],
+    )
+    return {row[0] for row in cursor.fetchall()}
+
+
+def create_partition(cursor, month):
+    """Create and attach the partition for `month`, moving its rows out of the default partition"""
+    quote = cursor.db.ops.quote_name
+    name = partition_name(month)
+    # Bounds are dates we built ourselves; partition bounds take literals only
+    start, end = f"'{month.isoformat()}'", f"'{add_months(month, 1).isoformat()}'"
+    cursor.execute(f'CREATE TABLE {quote(name)} (LIKE {quote(REPORTS_TABLE)} INCLUDING DEFAULTS)')
+    cursor.execute(
+        f'WITH moved AS (DELETE FROM {quote(DEFAULT_PARTITION)} WHERE date >= {start} AND date < {end} RETURNING *) '
+        f'INSERT INTO {quote(name)} SELECT * FROM moved'
+    )
+    # Attaching builds the partitioned indexes and constraints on the new table
+    cursor.execute(
+        f'ALTER TABLE {quote(REPORTS_TABLE)} ATTACH PARTITION {quote(name)} FOR VALUES FROM ({start}) TO ({end})'
+    )
+    return name
+
+
+def add_brin_index(cursor, name):
+    quote = cursor.db.ops.quote_name
+    cursor.execute(f'CREATE INDEX IF NOT EXISTS {quote(f"{name}_date_brin")} ON {quote(name)} USING brin (date)')
+
+
+def ensure_report_partitions(today=None, using=DEFAULT_DB_ALIAS):
+    """
+    Create the partitions for the coming months and for months that only
+    have rows in the default partition, and BRIN-index old partitions.
+    Returns the names of the partitions created and indexed.
+    """
+    connection = connections[using]
+    if not is_partitioned(connection):
+        return {'created': [], 'brin_indexed': []}
+    quote = connection.ops.quote_name
+    current = (today or timezone.localdate()).replace(day=1)
+    brin_before = add_months(current, -settings.REPORT_PARTITION_BRIN_AFTER_MONTHS)
+
+    with connection.cursor() as cursor:
+        existing = get_partitions(cursor)
+        cursor.execute(f"SELECT DISTINCT date_trunc('month', date)::date FROM {quote(DEFAULT_PARTITION)}")
+        months = {row[0] for row in cursor.fetchall()}
+    months.update(add_months(current, offset) for offset in range(settings.REPORT_PARTITION_MONTHS_AHEAD + 1))
+
+    created = []
+    for month in sorted(months):
+        if partition_name(month) not in existing:
+            with transaction.atomic(using=using), connection.cursor() as cursor:
+                created.append(create_partition(cursor, month))
+
+    brin_indexed = []
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT tablename FROM pg_indexes WHERE indexname = tablename || '_date_brin'")
+        indexed = {row[0] for row in cursor.fetchall()}
+        for name in sorted(existing | set(created)):
+            month = partition_month(name)
+            if month is not None and month < brin_before and name not in indexed:
+                add_brin_index(cursor, name)
+                brin_indexed.append(name)
+    return {'created': created, 'brin_indexed': brin_indexed}
@@ -147,3 +147,15 @@ class IsTeamManager(BasePermission):
         profile = request.user.profile
         return profile.role in ['team_manager', 'section_manager', 'branch_manager', 'unit_manager', 'admin', 'system_manager'] or request.user.is_superuser
 
+
+
+def visibility_scope(user):
+    """
+    Return a hashable key for what the user may see in scoped list endpoints.
+    Managers (and staff) with the same role and unit see the same rows, so they
+    share a scope; everyone else only sees their own data.
+    """
+    profile = getattr(user, 'profile', None) if user.is_authenticated else None
+    if not (user.is_staff or profile is not None and profile.is_manager()):
+        return ('user', user.pk)
+    return ('scope', user.is_staff, getattr(profile, 'role', None), getattr(profile, 'unit_id', None))
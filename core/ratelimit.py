@@ -0,0 +1,139 @@
+"""
+Atomic sliding-window rate limiting on the shared cache.
+
+Counts live in two fixed buckets (current and previous window) that are only
+ever changed with cache.add/cache.incr, which are atomic on every Django cache
+backend, so concurrent requests cannot race past the limit. The previous
+bucket is weighted by how much of it still overlaps the sliding window.
+
+The DRF throttle classes below plug the limiter into views. They run before
+the view body (and before any DB work for anonymous requests), and DRF turns
+a rejection into a 429 with a Retry-After header.
+"""
+import logging
+import math
+import time
+
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle, SimpleRateThrottle
+
+logger = logging.getLogger('core')
+
+
+def sliding_window_hit(key, limit, window, now=None):
+    """
+    Record one hit for `key` and check it against `limit` hits per `window` seconds.
+    Returns (allowed, retry_after_seconds).
+    """
+    now = time.time() if now is None else now
+    bucket = int(now // window)
+    current_key = f'ratelimit:{key}:{bucket}'
+    previous_key = f'ratelimit:{key}:{bucket - 1}'
+
+    cache.add(current_key, 0, window * 2)
+    try:
+        current = cache.incr(current_key)
+    except ValueError:
+        # Bucket expired between add and incr
+        cache.add(current_key, 1, window * 2)
+        current = 1
+    previous = cache.get(previous_key, 0)
+
+    elapsed = (now % window) / window
+    estimated = previous * (1 - elapsed) + current
+    if estimated <= limit:
+        return True, 0
+
+    if current >= limit or not previous:
+        retry_after = window - (now % window)
+    else:
+        # Wait until enough of the previous bucket has slid out of the window
+        retry_after = (1 - (limit - current) / previous - elapsed) * window
+    return False, max(1, math.ceil(retry_after))
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Base DRF throttle using sliding_window_hit instead of DRF's per-request history list.
+    Subclasses set `scope` (rate comes from DEFAULT_THROTTLE_RATES) and implement get_cache_key.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        allowed, self.retry_after = sliding_window_hit(self.key, self.num_requests, self.duration)
+        return allowed
+
+    def wait(self):
+        return getattr(self, 'retry_after', None)
+
+
+class IPRateThrottle(SlidingWindowThrottle):
+    """Limit by client IP"""
+    scope = 'auth_ip'
+
+    def get_cache_key(self, request, view):
+        return f'{self.scope}:ip:{self.get_ident(request)}'
+
+
+class EmailRateThrottle(SlidingWindowThrottle):
+    """Limit by the (normalized) email in the request body, across all IPs"""
+    scope = 'auth_email'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not email or not isinstance(email, str):
+            return None
+        return f'{self.scope}:email:{email.strip().lower()}'
+
+
+class GlobalAuthRateThrottle(SlidingWindowThrottle):
+    """
+    Alert on total auth traffic, shared by all clients. Off unless the
+    auth_global rate is set; going over it logs a warning (once per window)
+    but never rejects, so one client cannot lock everyone else out.
+    """
+    scope = 'auth_global'
+
+    def get_cache_key(self, request, view):
+        return f'{self.scope}:global'
+
+    def allow_request(self, request, view):
+        if not super().allow_request(request, view):
+            if cache.add(f'ratelimit:{self.key}:alerted', True, self.duration):
+                logger.warning(f"[RATELIMIT] Auth traffic above {self.rate} across all clients")
+        return True
+
+
+class AuthRateThrottle(BaseThrottle):
+    """
+    Per-IP and per-email auth limits, then the global traffic alert, checked
+    in that order. A request rejected by an earlier check is not counted by
+    the later ones, so clients hammering past their own limit do not trip the
+    global alert.
+    """
+    throttle_classes = (IPRateThrottle, EmailRateThrottle, GlobalAuthRateThrottle)
+
+    def allow_request(self, request, view):
+        self.retry_after = None
+        for throttle_class in self.throttle_classes:
+            throttle = throttle_class()
+            if not throttle.allow_request(request, view):
+                self.retry_after = throttle.wait()
+                return False
+        return True
+
+    def wait(self):
+        return self.retry_after
+
+
+class PublicIPRateThrottle(IPRateThrottle):
+    """Looser per-IP limit for public read-only endpoints (locations, unit tree, health)"""
+    scope = 'public_ip'
+
+
+AUTH_THROTTLES = [AuthRateThrottle]
+PUBLIC_THROTTLES = [PublicIPRateThrottle]
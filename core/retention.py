@@ -0,0 +1,116 @@
+"""
+Retention engine for tables that only ever grow (OTP tokens, access requests, ...).
+
+Each RetentionPolicy selects expired rows of one model. Purging walks the
+primary-key range of the matching rows in fixed-size windows, deleting one
+window per statement and sleeping between windows, so no single statement
+holds locks for long or touches an unbounded number of rows.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Min, Max
+from django.utils import timezone
+
+from core.models import OTPToken, AccessRequest, ReportTombstone, JobRun
+
+logger = logging.getLogger('core')
+
+
+class RetentionPolicy:
+    """Rows of `model` whose `date_field` is older than `max_age` (and match `filters`) expire"""
+
+    def __init__(self, name, model, date_field, max_age, filters=None):
+        self.name = name
+        self.model = model
+        self.date_field = date_field
+        self.max_age = max_age
+        self.filters = filters or {}
+
+    def cutoff(self, now=None):
+        return (now or timezone.now()) - self.max_age
+
+    def get_queryset(self, now=None):
+        return self.model.objects.filter(
+            **{f'{self.date_field}__lt': self.cutoff(now)},
+            **self.filters
+        )
+
+
+def get_retention_policies():
+    """Return the configured retention policies by name"""
+    policies = [
+        RetentionPolicy(
+            'otp_tokens', OTPToken, 'created_at',
+            timedelta(days=settings.RETENTION_OTP_TOKEN_DAYS),
+        ),
+        RetentionPolicy(
+            'rejected_access_requests', AccessRequest, 'submitted_at',
+            timedelta(days=settings.RETENTION_REJECTED_ACCESS_REQUEST_DAYS),
+            filters={'status': 'rejected'},
+        ),
+        RetentionPolicy(
+            'report_tombstones', ReportTombstone, 'deleted_at',
+            timedelta(days=settings.RETENTION_REPORT_TOMBSTONE_DAYS),
+        ),
+        RetentionPolicy(
+            'job_runs', JobRun, 'started_at',
+            timedelta(days=settings.RETENTION_JOB_RUN_DAYS),
+        ),
+    ]
+    return {policy.name: policy for policy in policies}
+
+
+def purge(policy, batch_size=None, sleep_seconds=None, dry_run=False, now=None):
+    """
+    Delete rows expired under `policy` in primary-key windows of `batch_size`.
+    With dry_run=True nothing is deleted and the matching rows are only counted.
+    Returns metrics: rows matched/deleted, batches, cutoff and duration.
+    """
+    batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+    sleep_seconds = settings.RETENTION_BATCH_SLEEP_SECONDS if sleep_seconds is None else sleep_seconds
+    now = now or timezone.now()
+    started = time.monotonic()
+
+    queryset = policy.get_queryset(now)
+    bounds = queryset.aggregate(low=Min('pk'), high=Max('pk'))
+    matched = 0
+    deleted = 0
+    batches = 0
+
+    window_start = bounds['low']
+    while window_start is not None and window_start <= bounds['high']:
+        window = queryset.filter(pk__gte=window_start, pk__lt=window_start + batch_size)
+        if dry_run:
+            window_rows = window.count()
+        else:
+            # Only count rows of this model, not cascaded rows
+            window_rows = window.delete()[1].get(policy.model._meta.label, 0)
+            deleted += window_rows
+        matched += window_rows
+        batches += 1
+        window_start += batch_size
+        if not window_rows:
+            # Sparse key range: jump straight to the next matching row
+            window_start = queryset.filter(pk__gte=window_start).aggregate(low=Min('pk'))['low']
+        elif sleep_seconds and not dry_run and window_start <= bounds['high']:
+            time.sleep(sleep_seconds)
+
+    metrics = {
+        'policy': policy.name,
+        'dry_run': dry_run,
+        'cutoff': policy.cutoff(now).isoformat(),
+        'matched': matched,
+        'deleted': deleted,
+        'batches': batches,
+        'duration_ms': int((time.monotonic() - started) * 1000),
+    }
+    logger.info(f"[RETENTION] {metrics}")
+    return metrics
+
+
+def purge_all(dry_run=False, **kwargs):
+    """Apply every retention policy, returns metrics per policy"""
+    return [purge(policy, dry_run=dry_run, **kwargs) for policy in get_retention_policies().values()]
@@ -0,0 +1,109 @@
+"""
+Primary/replica database routing with read-your-writes.
+
+When a `replica` database is configured (REPLICA_DATABASE_URL), reads made
+inside a use_replica() scope go to it: ReplicaRoutingMiddleware opens one
+for GET/HEAD/OPTIONS requests, and batch jobs such as exports can open their
+own. Everything else — writes, migrations, reads outside a scope — uses
+`default`.
+
+Any write pins the rest of the scope to the primary, as do reads inside a
+transaction on `default`. After a request that wrote, the middleware also
+pins the client's following requests to the primary for REPLICA_PIN_SECONDS,
+until the replica has caught up with what it just wrote. The pin goes out
+twice: as a short-lived cookie for same-site clients, and as the
+REPLICA_PIN_HEADER response header (value: seconds to stay pinned) for the
+cross-site frontend, which cannot rely on cookies and sends the header back
+on its requests until then.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+REPLICA_DB_ALIAS = 'replica'
+
+_scope = ContextVar('replica_scope', default=None)
+
+
+class _ReplicaScope:
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def use_replica(pinned=False):
+    """Send reads in this block to the replica until something writes"""
+    scope = _ReplicaScope(pinned)
+    token = _scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _scope.reset(token)
+
+
+def pin_primary():
+    """Send the remaining reads of the current scope to the primary"""
+    scope = _scope.get()
+    if scope is not None:
+        scope.pinned = True
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        scope = _scope.get()
+        if scope is None or scope.pinned or not replica_configured():
+            return DEFAULT_DB_ALIAS
+        # Reads inside a transaction must see its uncommitted writes and locks
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        scope = _scope.get()
+        if scope is not None:
+            scope.pinned = scope.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """Read from the replica on safe requests of clients that have not written recently"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.cookie_name = getattr(settings, 'REPLICA_PIN_COOKIE', 'pin_primary')
+        self.header_name = getattr(settings, 'REPLICA_PIN_HEADER', 'X-Pin-Primary')
+        self.pin_seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 10)
+
+    def __call__(self, request):
+        if not replica_configured():
+            return self.get_response(request)
+        pinned = (
+            request.method not in SAFE_METHODS
+            or self.cookie_name in request.COOKIES
+            or self.header_name in request.headers
+        )
+        with use_replica(pinned=pinned) as scope:
+            response = self.get_response(request)
+        if scope.wrote:
+            response[self.header_name] = str(self.pin_seconds)
+            response.set_cookie(
+                self.cookie_name, '1', max_age=self.pin_seconds, httponly=True,
+                secure=settings.SESSION_COOKIE_SECURE, samesite=settings.SESSION_COOKIE_SAMESITE,
+            )
+        return response
@@ -0,0 +1,209 @@
+"""
+Lightweight periodic job scheduler.
+
+Jobs are plain functions registered with @scheduled_job in core/jobs.py and
+run by `python manage.py run_scheduler`. Each run takes a lease on the job's
+ScheduledJob row, so any number of scheduler processes can run side by side
+and each job still runs on only one of them. No external broker is needed.
+"""
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import ScheduledJob, JobRun
+
+logger = logging.getLogger('core')
+
+_registry = {}
+
+
+class CronSchedule:
+    """
+    Minimal cron expression: "minute hour day month weekday".
+    Each field supports *, */n, a-b, a-b/n and comma-separated lists.
+    Weekday 0 is Sunday (as in cron). Unlike cron, when both day and weekday
+    are restricted a time must match both.
+    """
+    FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+    def __init__(self, expression):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = [
+            self._parse_field(part, low, high) for part, (low, high) in zip(parts, self.FIELD_RANGES)
+        ]
+
+    @staticmethod
+    def _parse_field(field, low, high):
+        values = set()
+        for item in field.split(','):
+            step = 1
+            if '/' in item:
+                item, step_text = item.split('/', 1)
+                step = int(step_text)
+            if item == '*':
+                start, end = low, high
+            elif '-' in item:
+                start, end = (int(value) for value in item.split('-', 1))
+            else:
+                start = end = int(item)
+            if start < low or end > high or start > end or step < 1:
+                raise ValueError(f"Invalid cron field: {field!r}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def matches(self, moment):
+        return (
+            moment.minute in self.minutes
+            and moment.hour in self.hours
+            and moment.day in self.days
+            and moment.month in self.months
+            and (moment.weekday() + 1) % 7 in self.weekdays
+        )
+
+    def next_after(self, moment):
+        """Return the first matching minute strictly after moment (in the current time zone)"""
+        candidate = timezone.localtime(moment).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 4)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                candidate = (candidate.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif candidate.day not in self.days or (candidate.weekday() + 1) % 7 not in self.weekdays:
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+
+class RegisteredJob:
+    def __init__(self, name, func, schedule):
+        self.name = name
+        self.func = func
+        self.schedule = CronSchedule(schedule)
+
+
+def scheduled_job(schedule, name=None):
+    """
+    Register a function as a periodic job.
+    Usage:
+        @scheduled_job('0 3 * * *')
+        def purge_something():
+            ...
+    The function's return value (JSON-serializable) is stored in the run history.
+    """
+    def decorator(func):
+        job_name = name or func.__name__
+        _registry[job_name] = RegisteredJob(job_name, func, schedule)
+        return func
+    return decorator
+
+
+def get_registered_jobs():
+    """Return registered jobs by name (importing core.jobs registers them)"""
+    import core.jobs  # noqa
+    return dict(_registry)
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def sync_jobs(now=None):
+    """
+    Create or update a ScheduledJob row for every registered job.
+    Safe to run from several workers starting at once: inserts skip names
+    another worker already created, and schedule changes are conditional updates.
+    """
+    now = now or timezone.now()
+    registered_jobs = get_registered_jobs()
+    ScheduledJob.objects.bulk_create([
+        ScheduledJob(
+            name=job_name,
+            schedule=registered.schedule.expression,
+            next_run_at=registered.schedule.next_after(now),
+        )
+        for job_name, registered in registered_jobs.items()
+    ], ignore_conflicts=True)
+    for job_name, registered in registered_jobs.items():
+        ScheduledJob.objects.filter(name=job_name).exclude(schedule=registered.schedule.expression).update(
+            schedule=registered.schedule.expression,
+            next_run_at=registered.schedule.next_after(now),
+        )
+
+
+def acquire_lease(job, worker_id, now=None, due_only=False):
+    """
+    Atomically take the job's lease. Returns True if this worker now owns it.
+    An expired lease (e.g. from a crashed worker) can be taken over.
+    With due_only, the job must also still be due or requested when the lease
+    is taken, so a worker whose snapshot of the job is stale cannot run it
+    again right after another worker finished it.
+    """
+    now = now or timezone.now()
+    lease_until = now + timedelta(seconds=settings.SCHEDULER_LEASE_SECONDS)
+    jobs = ScheduledJob.objects.filter(pk=job.pk).filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+    )
+    if due_only:
+        jobs = jobs.filter(Q(next_run_at__lte=now) | Q(run_requested=True))
+    return jobs.update(locked_by=worker_id, locked_until=lease_until) == 1
+
+
+def run_job(job, registered, worker_id, trigger='schedule'):
+    """Run a job that this worker holds the lease for, recording the run"""
+    run = JobRun.objects.create(job=job, trigger=trigger, worker=worker_id)
+    started = time.monotonic()
+    try:
+        result = registered.func()
+        run.status = 'succeeded'
+        run.result = result
+    except Exception:
+        logger.error(f"[SCHEDULER] Job {job.name} failed", exc_info=True)
+        run.status = 'failed'
+        run.error = traceback.format_exc()
+    finished_at = timezone.now()
+    run.finished_at = finished_at
+    run.duration_ms = int((time.monotonic() - started) * 1000)
+    run.save(update_fields=['status', 'result', 'error', 'finished_at', 'duration_ms'])
+
+    ScheduledJob.objects.filter(pk=job.pk, locked_by=worker_id).update(
+        last_run_at=finished_at,
+        next_run_at=registered.schedule.next_after(finished_at),
+        run_requested=False,
+        locked_by='',
+        locked_until=None,
+    )
+    logger.info(f"[SCHEDULER] Job {job.name} {run.status} in {run.duration_ms} ms")
+    return run
+
+
+def run_due_jobs(worker_id=None, now=None):
+    """Run every enabled job that is due or was requested manually. Returns the runs."""
+    worker_id = worker_id or default_worker_id()
+    now = now or timezone.now()
+    registry = get_registered_jobs()
+    due_jobs = ScheduledJob.objects.filter(enabled=True, name__in=list(registry)).filter(
+        Q(next_run_at__lte=now) | Q(run_requested=True)
+    )
+    runs = []
+    for job in due_jobs:
+        if not acquire_lease(job, worker_id, now, due_only=True):
+            continue
+        # Decide the trigger from the row as it was when the lease was taken
+        job.refresh_from_db()
+        trigger = 'manual' if job.run_requested and not (job.next_run_at and job.next_run_at <= now) else 'schedule'
+        runs.append(run_job(job, registry[job.name], worker_id, trigger))
+    return runs
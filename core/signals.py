@@ -1,6 +1,14 @@
-from django.db.models.signals import pre_save
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
-from .models import AccessRequest
+from .api.response_cache import invalidate_models
+from .events import report_events, report_event, tombstone_event
+from .models import AccessRequest, AvailabilityReport, ReportTombstone, User, Profile, Unit, Location
+
+# Models whose changes invalidate cached list responses (core.api.response_cache)
+RESPONSE_CACHE_MODELS = (AvailabilityReport, Profile, Unit, User, Location)
+# Saves touching only these fields do not change any cached response
+RESPONSE_CACHE_IGNORED_FIELDS = {'last_login'}
 
 
 @receiver(pre_save, sender=AccessRequest)
@@ -10,9 +18,13 @@ def send_otp_on_approval(sender, instance, **kwargs):
     """
     if instance.pk:  # Only for existing instances (updates)
         try:
-            old_instance = AccessRequest.objects.get(pk=instance.pk)
+            if hasattr(instance, '_loaded_values'):
+                # Loaded instance: compare against its snapshot instead of re-querying
+                old_status = instance.get_loaded_value('status')
+            else:
+                old_status = AccessRequest.objects.values_list('status', flat=True).get(pk=instance.pk)
             # Check if status is changing to 'approved'
-            if old_instance.status != 'approved' and instance.status == 'approved' and instance.approved_by:
+            if old_status != 'approved' and instance.status == 'approved' and instance.approved_by:
                 # Import here to avoid circular import
                 from core.api.views import generate_otp_token, send_otp_email, check_otp_rate_limit
                 from core.models import OTPToken
@@ -43,3 +55,41 @@ def send_otp_on_approval(sender, instance, **kwargs):
         except AccessRequest.DoesNotExist:
             pass
 
+
+@receiver(post_delete, sender=AvailabilityReport)
+def record_report_tombstone(sender, instance, **kwargs):
+    """
+    Signal to record deleted reports so the changes feed can report deletions.
+    """
+    tombstone = ReportTombstone.objects.create(
+        report_id=instance.pk,
+        user_id=instance.user_id,
+        date=instance.date
+    )
+    if report_events.has_subscribers():
+        event = tombstone_event(tombstone)
+        transaction.on_commit(lambda: report_events.publish(event))
+
+
+@receiver(post_save, sender=AvailabilityReport)
+def publish_report_event(sender, instance, created, **kwargs):
+    """
+    Signal to push saved reports to live dashboard streams once committed.
+    """
+    if report_events.has_subscribers():
+        event = report_event(instance, 'report.created' if created else 'report.updated')
+        transaction.on_commit(lambda: report_events.publish(event))
+
+
+def invalidate_response_cache(sender, update_fields=None, **kwargs):
+    """
+    Signal to drop cached list responses built from the changed model.
+    """
+    if update_fields and set(update_fields) <= RESPONSE_CACHE_IGNORED_FIELDS:
+        return
+    invalidate_models(sender)
+
+
+for model in RESPONSE_CACHE_MODELS:
+    post_save.connect(invalidate_response_cache, sender=model, dispatch_uid=f'response-cache-save-{model._meta.label_lower}')
+    post_delete.connect(invalidate_response_cache, sender=model, dispatch_uid=f'response-cache-delete-{model._meta.label_lower}')
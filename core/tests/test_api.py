@@ -1,11 +1,16 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hasher
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
-from core.models import Unit, Profile, AccessRequest, OTPToken, AvailabilityReport
+from core.models import Unit, Profile, Location, AccessRequest, OTPToken, AvailabilityReport
+from core.events import report_events, report_stream_slots, format_watermark
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from datetime import timedelta
+from unittest.mock import patch
 
 User = get_user_model()
 
@@ -32,6 +37,48 @@ class AuthAPITest(TestCase):
         self.assertTrue(User.objects.filter(username='newuser').exists())
         self.assertTrue(AccessRequest.objects.filter(user__username='newuser').exists())
 
+    def test_register_creates_profile_and_request_atomically(self):
+        city = Location.objects.create(name='Tel Aviv')
+        unit = Unit.objects.create(name='Test Unit')
+        User.objects.create_user(username='newuser', email='someone@example.com')
+        User.objects.create_user(username='newuser1', email='someone1@example.com')
+        url = reverse('register')
+        data = {
+            'email': 'newuser@example.com',
+            'password': 'newpass123',
+            'password2': 'newpass123',
+            'unit_id': unit.id,
+            'address': 'Main St 1',
+            'city_id': city.id,
+        }
+        with patch('django.contrib.auth.hashers.get_hasher', wraps=get_hasher) as hasher:
+            response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        # Password hashed exactly once
+        self.assertEqual(hasher.call_count, 1)
+        user = User.objects.get(email='newuser@example.com')
+        self.assertEqual(user.username, 'newuser2')
+        self.assertTrue(user.check_password('newpass123'))
+        self.assertFalse(user.is_approved)
+        self.assertEqual(user.profile.unit, unit)
+        self.assertEqual(user.profile.city, city)
+        self.assertEqual(response.data['access_request_id'], AccessRequest.objects.get(user=user).id)
+
+    def test_register_rolls_back_on_failure(self):
+        city = Location.objects.create(name='Tel Aviv')
+        url = reverse('register')
+        data = {
+            'email': 'newuser@example.com',
+            'password': 'newpass123',
+            'password2': 'newpass123',
+            'address': 'Main St 1',
+            'city_id': city.id,
+        }
+        with patch('core.api.serializers.AccessRequest.objects.create', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.post(url, data, format='json')
+        self.assertFalse(User.objects.filter(email='newuser@example.com').exists())
+
     def test_request_otp(self):
         self.user.is_approved = True
         self.user.save()
@@ -58,6 +105,12 @@ class AuthAPITest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('access', response.data)
         self.assertIn('refresh', response.data)
+        otp.refresh_from_db()
+        self.assertTrue(otp.used)
+        # The code cannot be replayed
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('token', response.data)
 
 
 class AccessRequestAPITest(TestCase):
@@ -96,6 +149,76 @@ class AccessRequestAPITest(TestCase):
         self.user.refresh_from_db()
         self.assertTrue(self.user.is_approved)
 
+    def test_approve_rejects_email_of_another_user(self):
+        self.client.force_authenticate(user=self.admin)
+        url = reverse('approve-access-request', args=[self.access_request.id])
+        response = self.client.post(url, {'email': 'ADMIN@example.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.access_request.refresh_from_db()
+        self.assertEqual(self.access_request.status, 'pending')
+
+    def test_profile_update_rejects_email_of_another_user(self):
+        profile = Profile.objects.create(user=self.user, city=Location.objects.create(name='Haifa'))
+        self.client.force_authenticate(user=self.user)
+        url = reverse('profile-detail', args=[profile.id])
+        response = self.client.patch(url, {'email': 'Admin@Example.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', response.data)
+        # Changing the case of one's own email is fine
+        response = self.client.patch(url, {'email': 'TEST@example.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.email, 'TEST@example.com')
+
+
+class AccessRequestBulkApproveAPITest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', is_staff=True)
+        self.users = [
+            User.objects.create_user(username=f'user{i}', email=f'user{i}@example.com')
+            for i in range(3)
+        ]
+        self.requests = [AccessRequest.objects.create(user=user, status='pending') for user in self.users]
+        self.requests[2].status = 'rejected'
+        self.requests[2].save()
+        self.url = reverse('bulk-approve-access-requests')
+
+    @patch('core.api.views.send_bulk_approval_emails')
+    def test_bulk_approve(self, send_emails):
+        self.client.force_authenticate(user=self.admin)
+        ids = [r.id for r in self.requests] + [999999]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['approved'], [self.requests[0].id, self.requests[1].id])
+        self.assertEqual(response.data['skipped'], [self.requests[2].id, 999999])
+        self.assertEqual(response.data['otp_count'], 2)
+        self.assertEqual(
+            AccessRequest.objects.filter(status='approved', approved_by=self.admin).count(), 2
+        )
+        self.assertEqual(set(User.objects.filter(is_approved=True).values_list('username', flat=True)), {'user0', 'user1'})
+        self.assertEqual(OTPToken.objects.count(), 2)
+        # One batched send with both notifications and OTPs
+        send_emails.assert_called_once()
+        users, user_tokens = send_emails.call_args.args
+        self.assertEqual({u.username for u in users}, {'user0', 'user1'})
+        self.assertEqual(len(user_tokens), 2)
+
+    @patch('core.api.views.send_bulk_approval_emails')
+    def test_bulk_approve_without_otp(self, send_emails):
+        self.client.force_authenticate(user=self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, {'ids': [self.requests[0].id], 'send_otp': False}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(OTPToken.objects.exists())
+        self.assertEqual(send_emails.call_args.args[1], [])
+
+    def test_requires_manager(self):
+        self.client.force_authenticate(user=self.users[0])
+        response = self.client.post(self.url, {'ids': [self.requests[0].id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
 
 class ReportsAPITest(TestCase):
     def setUp(self):
@@ -133,3 +256,359 @@ class ReportsAPITest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
 
+
+class ReportUpsertAPITest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123',
+            is_approved=True
+        )
+        self.client.force_authenticate(user=self.user)
+        self.today = timezone.now().date().isoformat()
+        self.url = reverse('upsert-my-report', args=[self.today])
+
+    def test_upsert_creates_then_updates(self):
+        response = self.client.put(self.url, {'status': 'available'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn('ETag', response)
+
+        response = self.client.put(self.url, {'status': 'unavailable', 'notes': 'Sick'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        report = AvailabilityReport.objects.get(user=self.user)
+        self.assertEqual(report.status, 'unavailable')
+        self.assertEqual(report.notes, 'Sick')
+
+    def test_if_match_rejects_stale_version(self):
+        response = self.client.put(self.url, {'status': 'available'}, format='json')
+        etag = response['ETag']
+        self.client.put(self.url, {'status': 'partial'}, format='json', HTTP_IF_MATCH=etag)
+
+        response = self.client.put(self.url, {'status': 'unavailable'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(AvailabilityReport.objects.get(user=self.user).status, 'partial')
+
+    def test_idempotency_key_replays_response(self):
+        first = self.client.put(self.url, {'status': 'available'}, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        AvailabilityReport.objects.filter(user=self.user).update(status='partial')
+        second = self.client.put(self.url, {'status': 'available'}, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        self.assertEqual(second.status_code, first.status_code)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(AvailabilityReport.objects.get(user=self.user).status, 'partial')
+
+    def test_idempotency_key_reused_for_other_request(self):
+        self.client.put(self.url, {'status': 'available'}, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        response = self.client.put(self.url, {'status': 'unavailable'}, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+        yesterday = (timezone.now().date() - timedelta(days=1)).isoformat()
+        response = self.client.put(
+            reverse('upsert-my-report', args=[yesterday]), {'status': 'available'},
+            format='json', HTTP_IDEMPOTENCY_KEY='abc'
+        )
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(AvailabilityReport.objects.get(user=self.user).status, 'available')
+
+    def test_future_date_rejected(self):
+        future = (timezone.now().date() + timedelta(days=1)).isoformat()
+        response = self.client.put(reverse('upsert-my-report', args=[future]), {'status': 'available'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_non_object_body_rejected(self):
+        for body in (['available'], 'available', 1):
+            response = self.client.put(self.url, body, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(AvailabilityReport.objects.exists())
+
+
+class ReportRangeAPITest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123',
+            is_approved=True
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('submit-report-range')
+
+    def test_range_creates_and_overwrites(self):
+        today = timezone.now().date()
+        AvailabilityReport.objects.create(user=self.user, date=today, status='available')
+        data = {
+            'date_from': (today - timedelta(days=4)).isoformat(),
+            'date_to': today.isoformat(),
+            'status': 'unavailable',
+            'notes': 'Leave',
+        }
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['created']), 4)
+        self.assertEqual(response.data['overwritten'], [today.isoformat()])
+        self.assertEqual(AvailabilityReport.objects.filter(user=self.user, status='unavailable').count(), 5)
+
+    def test_reversed_range_rejected(self):
+        today = timezone.now().date()
+        data = {
+            'date_from': today.isoformat(),
+            'date_to': (today - timedelta(days=1)).isoformat(),
+            'status': 'available',
+        }
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ReportSyncAPITest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123',
+            is_approved=True
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('sync-reports')
+
+    def test_sync_applies_batch_with_last_writer_wins(self):
+        today = timezone.now().date()
+        yesterday = today - timedelta(days=1)
+        AvailabilityReport.objects.create(user=self.user, date=today, status='available')
+        stale = (timezone.now() - timedelta(hours=1)).isoformat()
+        fresh = timezone.now().isoformat()
+        data = {'mutations': [
+            {'date': today.isoformat(), 'status': 'unavailable', 'client_updated_at': stale},
+            {'date': yesterday.isoformat(), 'status': 'partial', 'client_updated_at': stale},
+            {'date': yesterday.isoformat(), 'status': 'available', 'client_updated_at': fresh},
+        ]}
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['conflicts'], [today.isoformat()])
+        self.assertEqual(response.data['applied'], 1)
+        self.assertIn('watermark', response.data)
+        self.assertEqual(AvailabilityReport.objects.get(user=self.user, date=today).status, 'available')
+        self.assertEqual(AvailabilityReport.objects.get(user=self.user, date=yesterday).status, 'available')
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_sync_compares_edit_times_not_sync_times(self):
+        today = timezone.now().date()
+        edited_on_a = timezone.now() - timedelta(hours=3)
+        edited_on_b = edited_on_a + timedelta(minutes=5)
+        # Device A syncs its edit first, device B's later edit arrives afterwards
+        for status_value, edited_at in [('unavailable', edited_on_a), ('partial', edited_on_b)]:
+            response = self.client.post(self.url, {'mutations': [
+                {'date': today.isoformat(), 'status': status_value, 'client_updated_at': edited_at.isoformat()},
+            ]}, format='json')
+            self.assertEqual(response.data['conflicts'], [])
+        report = AvailabilityReport.objects.get(user=self.user, date=today)
+        self.assertEqual(report.status, 'partial')
+        self.assertEqual(report.client_updated_at, edited_on_b)
+        # A's edit replayed again still loses
+        response = self.client.post(self.url, {'mutations': [
+            {'date': today.isoformat(), 'status': 'unavailable', 'client_updated_at': edited_on_a.isoformat()},
+        ]}, format='json')
+        self.assertEqual(response.data['conflicts'], [today.isoformat()])
+
+    def test_sync_clamps_future_client_time(self):
+        today = timezone.now().date()
+        future = timezone.now() + timedelta(days=1)
+        self.client.post(self.url, {'mutations': [
+            {'date': today.isoformat(), 'status': 'partial', 'client_updated_at': future.isoformat()},
+        ]}, format='json')
+        report = AvailabilityReport.objects.get(user=self.user, date=today)
+        self.assertLessEqual(report.client_updated_at, report.updated_at)
+        # An online edit afterwards is newer than the synced one
+        report.status = 'available'
+        report.save()
+        report.refresh_from_db()
+        self.assertIsNone(report.client_updated_at)
+
+    def test_sync_deletes(self):
+        today = timezone.now().date()
+        AvailabilityReport.objects.create(user=self.user, date=today, status='available')
+        data = {'mutations': [
+            {'date': today.isoformat(), 'deleted': True, 'client_updated_at': timezone.now().isoformat()},
+        ]}
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.data['deleted'], [today.isoformat()])
+        self.assertFalse(AvailabilityReport.objects.filter(user=self.user).exists())
+
+
+class ReportChangesAPITest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123',
+            is_approved=True
+        )
+        self.other = User.objects.create_user(
+            username='other',
+            email='other@example.com',
+            password='testpass123',
+            is_approved=True
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('report-changes')
+
+    def test_changes_since_watermark(self):
+        today = timezone.now().date()
+        old = AvailabilityReport.objects.create(user=self.user, date=today - timedelta(days=2), status='available')
+        response = self.client.get(self.url, {'since': (timezone.now() - timedelta(days=1)).isoformat()})
+        self.assertEqual(response.data['count'], 1)
+        watermark = response.data['watermark']
+
+        AvailabilityReport.objects.create(user=self.user, date=today, status='partial')
+        AvailabilityReport.objects.create(user=self.other, date=today, status='available')
+        old_id = old.id
+        old.delete()
+
+        response = self.client.get(self.url, {'since': watermark})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([r['status'] for r in response.data['results']], ['partial'])
+        self.assertEqual([d['id'] for d in response.data['deleted']], [old_id])
+
+    def test_late_commit_seen_next_poll(self):
+        before_poll = timezone.now()
+        response = self.client.get(self.url, {'since': (before_poll - timedelta(days=1)).isoformat()})
+        self.assertEqual(response.data['count'], 0)
+        self.assertLess(parse_datetime(response.data['watermark']), before_poll)
+
+        # A write stamped before the poll that only commits after it
+        report = AvailabilityReport.objects.create(user=self.user, date=timezone.now().date(), status='partial')
+        AvailabilityReport.objects.filter(pk=report.pk).update(updated_at=before_poll - timedelta(seconds=1))
+
+        response = self.client.get(self.url, {'since': response.data['watermark']})
+        self.assertEqual([r['id'] for r in response.data['results']], [report.id])
+
+    def test_since_required(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(RETENTION_REPORT_TOMBSTONE_DAYS=30)
+    def test_since_before_retention_requires_resync(self):
+        response = self.client.get(self.url, {'since': (timezone.now() - timedelta(days=31)).isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        self.assertTrue(response.data['resync_required'])
+
+        response = self.client.get(self.url, {'since': (timezone.now() - timedelta(days=29)).isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class ReportStreamAPITest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123',
+            is_approved=True
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('report-stream')
+
+    @override_settings(REPORT_STREAM_HEARTBEAT_SECONDS=0.01, REPORT_STREAM_MAX_SECONDS=0.05)
+    def test_stream_replays_since_last_event_id(self):
+        since = timezone.now() - timedelta(minutes=1)
+        AvailabilityReport.objects.create(user=self.user, date=timezone.now().date(), status='available')
+        response = self.client.get(
+            self.url, HTTP_ACCEPT='text/event-stream', HTTP_LAST_EVENT_ID=format_watermark(since)
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = b''.join(response.streaming_content).decode()
+        self.assertIn('event: report.updated', body)
+        self.assertIn(': heartbeat', body)
+        response.close()
+
+    @override_settings(REPORT_STREAM_MAX_CONNECTIONS=1)
+    def test_stream_limit_per_process(self):
+        first = self.client.get(self.url, HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        refused = self.client.get(self.url, HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(refused.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn('Retry-After', refused)
+        # Closing the first stream, even unread, frees its slot
+        first.close()
+        second = self.client.get(self.url, HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        second.close()
+        self.assertEqual(report_stream_slots.active, 0)
+
+    def test_hub_fans_out_to_subscribers(self):
+        first = report_events.subscribe()
+        second = report_events.subscribe()
+        try:
+            report_events.publish({'id': '1', 'event': 'report.updated', 'user_id': self.user.id, 'data': {}})
+            self.assertEqual(len(first.get(timeout=0.01)), 1)
+            self.assertEqual(len(second.get(timeout=0.01)), 1)
+        finally:
+            first.close()
+            second.close()
+        self.assertFalse(report_events.has_subscribers())
+
+    def test_report_save_publishes_after_commit(self):
+        subscription = report_events.subscribe()
+        try:
+            with self.captureOnCommitCallbacks(execute=True):
+                AvailabilityReport.objects.create(user=self.user, date=timezone.now().date(), status='available')
+            events = subscription.get(timeout=0.01)
+            self.assertEqual([e['event'] for e in events], ['report.created'])
+        finally:
+            subscription.close()
+
+
+class ReportReminderAPITest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.city = Location.objects.create(name='Tel Aviv')
+        self.unit = Unit.objects.create(name='Test Unit')
+        self.manager = User.objects.create_user(
+            username='manager',
+            email='manager@example.com',
+            is_approved=True
+        )
+        Profile.objects.create(user=self.manager, unit=self.unit, role='unit_manager', city=self.city)
+        self.reporter = User.objects.create_user(username='reporter', email='reporter@example.com', is_approved=True)
+        self.slacker = User.objects.create_user(username='slacker', email='slacker@example.com', is_approved=True)
+        for user in (self.reporter, self.slacker):
+            Profile.objects.create(user=user, unit=self.unit, role='user', city=self.city)
+        AvailabilityReport.objects.create(user=self.reporter, date=timezone.now().date(), status='available')
+        AvailabilityReport.objects.create(user=self.manager, date=timezone.now().date(), status='available')
+        self.client.force_authenticate(user=self.manager)
+
+    @patch('core.api.views.send_bulk_otp_emails')
+    def test_remind_only_non_reporters(self, send_bulk):
+        response = self.client.post(reverse('remind-non-reporters'), {'unit_ids': [self.unit.id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['queued_count'], 1)
+        self.assertEqual(list(OTPToken.objects.values_list('user__username', flat=True)), ['slacker'])
+        user_tokens = send_bulk.call_args[0][0]
+        self.assertEqual([user.username for user, _ in user_tokens], ['slacker'])
+
+    @patch('core.api.views.send_bulk_otp_emails')
+    def test_remind_includes_child_units_once_per_cooldown(self, send_bulk):
+        # Commit callbacks bump the unit tree's cache version, as a real commit would
+        with self.captureOnCommitCallbacks(execute=True):
+            child = Unit.objects.create(name='Child Unit', parent=self.unit)
+        nested = User.objects.create_user(username='nested', email='nested@example.com', is_approved=True)
+        Profile.objects.create(user=nested, unit=child, role='user', city=self.city)
+        url = reverse('remind-non-reporters')
+        response = self.client.post(url, {'unit_ids': [self.unit.id]}, format='json')
+        self.assertEqual(response.data['queued_count'], 2)
+        self.assertEqual(set(OTPToken.objects.values_list('user__username', flat=True)), {'slacker', 'nested'})
+
+        response = self.client.post(url, {'unit_ids': [self.unit.id]}, format='json')
+        self.assertEqual(response.data['queued_count'], 0)
+        self.assertEqual(response.data['rate_limited_count'], 2)
+
+    def test_regular_user_forbidden(self):
+        self.client.force_authenticate(user=self.slacker)
+        response = self.client.post(reverse('remind-non-reporters'), {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,84 @@
+import tempfile
+from datetime import date
+from io import BytesIO, StringIO
+
+import pandas as pd
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from core.archive import CSV, archive_reports, archived_months, month_directory, read_archived_reports
+from core.models import User, Unit, Location, Profile, AvailabilityReport, ReportTombstone
+
+
+class ReportArchiveTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        override = override_settings(REPORT_ARCHIVE_DIR=directory.name)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.city = Location.objects.create(name='Haifa')
+        # Commit callbacks bump the unit tree's cache version, as a real commit would
+        with self.captureOnCommitCallbacks(execute=True):
+            self.unit = Unit.objects.create(name='Unit')
+            self.other_unit = Unit.objects.create(name='Other Unit')
+        self.member = self.add_user('member', self.unit)
+        self.outsider = self.add_user('outsider', self.other_unit)
+        self.manager = self.add_user('manager', self.unit, 'branch_manager')
+        for day in (date(2026, 1, 10), date(2026, 2, 10), date(2026, 3, 10)):
+            AvailabilityReport.objects.create(user=self.member, date=day, status='available', location=self.city)
+            AvailabilityReport.objects.create(user=self.outsider, date=day, status='partial', notes='a, "quoted"\nnote')
+
+    def add_user(self, username, unit, role='user'):
+        user = User.objects.create_user(username=username, email=f'{username}@example.com', is_approved=True)
+        Profile.objects.create(user=user, unit=unit, city=self.city, role=role)
+        return user
+
+    def test_archive_whole_months(self):
+        expected = list(AvailabilityReport.objects.filter(date__lt=date(2026, 3, 1)).order_by('date', 'user_id').values())
+        # Mid-March: only months that have ended move
+        moved = archive_reports(before=date(2026, 3, 20), file_format=CSV)
+        self.assertEqual(moved, {date(2026, 1, 1): 2, date(2026, 2, 1): 2})
+        self.assertEqual(archived_months(), [date(2026, 1, 1), date(2026, 2, 1)])
+        self.assertTrue((month_directory(date(2026, 1, 1)) / 'reports.csv.gz').exists())
+        self.assertEqual(set(AvailabilityReport.objects.values_list('date', flat=True)), {date(2026, 3, 10)})
+        # Archiving is not a deletion for sync clients
+        self.assertFalse(ReportTombstone.objects.exists())
+
+        archived = sorted(read_archived_reports(), key=lambda row: (row['date'], row['user_id']))
+        self.assertEqual(archived, [{column: row[column] for column in archived[0]} for row in expected])
+        self.assertEqual(len(read_archived_reports(date(2026, 2, 1), date(2026, 2, 28), {self.member.id})), 1)
+
+    def test_rearchive_merges(self):
+        archive_reports(before=date(2026, 1, 31), file_format=CSV)
+        # A report backfilled into an archived month is added to its file
+        AvailabilityReport.objects.create(user=self.manager, date=date(2026, 1, 11), status='available')
+        self.assertEqual(archive_reports(before=date(2026, 1, 31), file_format=CSV), {date(2026, 1, 1): 1})
+        self.assertEqual(len(read_archived_reports(date(2026, 1, 1), date(2026, 1, 31))), 3)
+
+    def test_dry_run_command(self):
+        output = StringIO()
+        call_command('archive_reports', '--before', '2026-02-28', '--format', 'csv', '--dry-run', stdout=output)
+        self.assertIn('2026-02: would archive 2 reports', output.getvalue())
+        self.assertEqual(AvailabilityReport.objects.count(), 6)
+        self.assertEqual(archived_months(), [])
+
+    def test_export_reads_archived_months(self):
+        archive_reports(before=date(2026, 2, 28), file_format=CSV)
+        client = APIClient()
+
+        def export(user, **params):
+            client.force_authenticate(user=user)
+            response = client.get(reverse('export-reports'), params)
+            self.assertEqual(response.status_code, 200)
+            return pd.read_excel(BytesIO(response.content))
+
+        frame = export(self.manager, **{'from': '2026-01-01', 'to': '2026-03-31'})
+        # The manager's unit only, newest first, archived months included
+        self.assertEqual(list(frame['User']), ['member'] * 3)
+        self.assertEqual([str(day)[:10] for day in frame['Date']], ['2026-03-10', '2026-02-10', '2026-01-10'])
+
+        frame = export(self.outsider, **{'from': '2026-02-01'})
+        self.assertEqual(list(frame['Notes']), ['a, "quoted"\nnote'] * 2)
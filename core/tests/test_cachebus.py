@@ -0,0 +1,111 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from core.cachebus import CacheVersionBus, ProcessCache, cache_bus
+from core.models import User, Unit, Location, Profile, AvailabilityReport, CacheVersion
+from core.units import unit_subtree_ids
+
+
+class CacheVersionBusTest(TestCase):
+    def bump(self, *namespaces):
+        with self.captureOnCommitCallbacks(execute=True):
+            cache_bus.bump(*namespaces)
+
+    def test_bump(self):
+        self.assertEqual(cache_bus.version('test.thing'), 0)
+        self.bump('test.thing')
+        first = cache_bus.version('test.thing')
+        self.assertNotEqual(first, 0)
+        self.bump('test.thing', 'test.other')
+        self.assertEqual(cache_bus.version('test.thing'), first + 1)
+        self.assertEqual(CacheVersion.objects.count(), 2)
+
+    def test_bump_waits_for_commit(self):
+        cache_bus.invalidate()
+        with self.captureOnCommitCallbacks() as callbacks:
+            with CaptureQueriesContext(connection) as queries:
+                cache_bus.bump('test.thing')
+            # Nothing locks the counter row inside the writer's transaction
+            self.assertEqual(len(queries), 0)
+        self.assertEqual(cache_bus.version('test.thing'), 0)
+        callbacks[0]()
+        self.assertNotEqual(cache_bus.version('test.thing'), 0)
+
+    def test_reads_are_batched(self):
+        cache_bus.refresh()
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(10):
+                cache_bus.versions(['core.unit', 'core.user'])
+        self.assertEqual(len(queries), 0)
+
+    @override_settings(CACHE_BUS_CHECK_INTERVAL_MS=0)
+    def test_other_worker_sees_bump(self):
+        # A second bus stands in for another worker's process
+        worker = CacheVersionBus()
+        before = worker.version('core.unit')
+        self.bump('core.unit')
+        self.assertNotEqual(worker.version('core.unit'), before)
+
+    @override_settings(CACHE_BUS_CHECK_INTERVAL_MS=60000)
+    def test_staleness_is_bounded_by_interval(self):
+        worker = CacheVersionBus()
+        before = worker.version('core.unit')
+        self.bump('core.unit')
+        self.assertEqual(worker.version('core.unit'), before)
+        with override_settings(CACHE_BUS_CHECK_INTERVAL_MS=0):
+            self.assertNotEqual(worker.version('core.unit'), before)
+
+    def test_process_cache(self):
+        calls = []
+        process_cache = ProcessCache('test.thing')
+        compute = lambda: calls.append(1) or len(calls)
+        self.assertEqual(process_cache.get('key', compute), 1)
+        self.assertEqual(process_cache.get('key', compute), 1)
+        self.bump('test.thing')
+        self.assertEqual(process_cache.get('key', compute), 2)
+
+
+class UnitSubtreeTest(TestCase):
+    def test_subtree_follows_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            root = Unit.objects.create(name='Root')
+            branch = Unit.objects.create(name='Branch', parent=root)
+            team = Unit.objects.create(name='Team', parent=branch)
+        self.assertEqual(set(unit_subtree_ids(root.pk)), {root.pk, branch.pk, team.pk})
+        with CaptureQueriesContext(connection) as queries:
+            unit_subtree_ids(branch.pk)
+        self.assertEqual(len(queries), 0)
+
+        team.parent = root
+        with self.captureOnCommitCallbacks(execute=True):
+            team.save()
+        self.assertEqual(unit_subtree_ids(branch.pk), [branch.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            team.delete()
+        self.assertEqual(set(unit_subtree_ids(root.pk)), {root.pk, branch.pk})
+
+
+class CrossWorkerResponseCacheTest(TestCase):
+    @override_settings(CACHE_BUS_CHECK_INTERVAL_MS=0)
+    def test_bump_from_another_worker_invalidates(self):
+        cache.clear()
+        admin = User.objects.create_user(username='admin', email='admin@example.com', is_staff=True, is_approved=True)
+        member = User.objects.create_user(username='member', email='member@example.com', is_approved=True)
+        Profile.objects.create(user=member, unit=Unit.objects.create(name='Unit'),
+                               city=Location.objects.create(name='Haifa'))
+        client = APIClient()
+        client.force_authenticate(user=admin)
+        self.assertEqual(client.get(reverse('list-reports')).data['count'], 0)
+
+        # Another worker writes without going through this process's signals
+        AvailabilityReport.objects.bulk_create([
+            AvailabilityReport(user=member, date=timezone.now().date(), status='available')
+        ])
+        self.assertEqual(client.get(reverse('list-reports')).data['count'], 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            CacheVersionBus().bump('core.availabilityreport')
+        self.assertEqual(client.get(reverse('list-reports')).data['count'], 1)
@@ -0,0 +1,87 @@
+import json
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from core.api.renderers import to_columnar
+from core.models import User, Unit, Location, Profile, AvailabilityReport
+
+
+def decode(payload):
+    """Python twin of decodeColumnar in frontend/lib/api.ts"""
+    results = []
+    for row in payload['rows']:
+        item = {}
+        for name, value in zip(payload['columns'], row):
+            if value is not None and name in payload['dictionaries']:
+                value = payload['dictionaries'][name][value]
+            *parents, key = name.split('.')
+            target = item
+            for parent in parents:
+                target = target.setdefault(parent, {})
+            target[key] = value
+        for key, value in item.items():
+            if isinstance(value, dict) and all(field is None for field in value.values()):
+                item[key] = None
+        results.append(item)
+    return results
+
+
+class ColumnarRendererTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com',
+                                              is_staff=True, is_approved=True)
+        self.client.force_authenticate(user=self.admin)
+        city = Location.objects.create(name='Haifa')
+        unit = Unit.objects.create(name='Test Unit')
+        for index in range(4):
+            user = User.objects.create_user(username=f'user{index}', email=f'user{index}@example.com',
+                                            is_approved=True)
+            Profile.objects.create(user=user, unit=unit, city=city)
+            AvailabilityReport.objects.create(user=user, date=timezone.now().date(), status='available')
+
+    def assertRoundTrip(self, url, params=None, smaller=True):
+        default = self.client.get(url, params)
+        columnar = self.client.get(url, {**(params or {}), 'format': 'columnar'})
+        self.assertEqual(columnar.status_code, 200)
+        payload = json.loads(columnar.content)
+        expected = json.loads(default.content)
+        self.assertEqual(decode(payload), expected['results'])
+        self.assertEqual(payload['count'], expected['count'])
+        if smaller:
+            self.assertLess(len(columnar.content), len(default.content))
+        return payload
+
+    def test_list_endpoints_round_trip(self):
+        payload = self.assertRoundTrip(reverse('list-reports'))
+        self.assertEqual(payload['dictionaries']['status'], ['available'])
+        self.assertEqual({row[payload['columns'].index('status')] for row in payload['rows']}, {0})
+
+        payload = self.assertRoundTrip(reverse('user-approved'))
+        self.assertIn('profile.role', payload['dictionaries'])
+        self.assertIn('profile.unit_name', payload['dictionaries'])
+
+        # A single unit: no gain over the header overhead, but the same data
+        self.assertRoundTrip(reverse('unit-list'), smaller=False)
+        Location.objects.bulk_create([Location(name=f'Town {index}') for index in range(5)])
+        payload = self.assertRoundTrip(reverse('location-list'))
+        self.assertIn('location_type', payload['dictionaries'])
+
+    def test_default_shape_and_errors_unchanged(self):
+        response = self.client.get(reverse('list-reports'))
+        self.assertIn('results', response.json())
+        # Non-list payloads render as plain JSON
+        member = APIClient()
+        member.force_authenticate(user=User.objects.get(username='user0'))
+        response = member.get(reverse('user-approved'), {'format': 'columnar'})
+        self.assertEqual(response.status_code, 403)
+        self.assertIn('error', response.json())
+
+    def test_high_cardinality_strings_stay_inline(self):
+        table = to_columnar([{'name': f'n{index}', 'kind': 'a', 'obj': None} for index in range(4)])
+        self.assertEqual(table['dictionaries'], {'kind': ['a']})
+        self.assertEqual(table['rows'][1], ['n1', 0, None])
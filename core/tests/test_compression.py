@@ -0,0 +1,117 @@
+import gzip
+import io
+import json
+import unittest
+import uuid
+from datetime import datetime, date, timezone as dt_timezone
+from decimal import Decimal
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import TestCase, RequestFactory, override_settings
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from core.api.renderers import FastJSONRenderer, FastJSONParser, orjson
+from core.middleware import CompressionMiddleware, choose_encoding, brotli
+from core.models import User, Location
+
+
+@unittest.skipIf(orjson is None, 'orjson is not installed')
+class FastJSONTest(TestCase):
+    def test_output_matches_json_renderer(self):
+        data = {
+            'when': datetime(2024, 5, 1, 12, 30, 45, 123456, tzinfo=dt_timezone.utc),
+            'day': date(2024, 5, 1),
+            'amount': Decimal('12.50'),
+            'label': gettext_lazy('Available'),
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'text': 'שלום ',
+            1: [None, True, 1.5],
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        # Indented output is left to the stock renderer
+        self.assertEqual(
+            FastJSONRenderer().render(data, 'application/json; indent=2'),
+            JSONRenderer().render(data, 'application/json; indent=2'),
+        )
+
+    def test_parser(self):
+        parser = FastJSONParser()
+        self.assertEqual(parser.parse(io.BytesIO('{"name": "חיפה"}'.encode())), {'name': 'חיפה'})
+        with self.assertRaises(ParseError):
+            parser.parse(io.BytesIO(b'{"value": NaN}'))
+
+
+@override_settings(COMPRESSION_MIN_SIZE=100)
+class CompressionMiddlewareTest(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.body = json.dumps([{'id': index, 'status': 'available'} for index in range(50)]).encode()
+
+    def respond(self, response, accept_encoding='gzip, deflate, br', path='/'):
+        request = self.factory.get(path, HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_negotiation(self):
+        self.assertEqual(choose_encoding('gzip;q=0.5, br', ('br', 'gzip')), 'br')
+        self.assertEqual(choose_encoding('br;q=0, gzip', ('br', 'gzip')), 'gzip')
+        self.assertEqual(choose_encoding('*', ('gzip',)), 'gzip')
+        self.assertIsNone(choose_encoding('identity', ('br', 'gzip')))
+        self.assertIsNone(choose_encoding('', ('gzip',)))
+
+    def test_compresses_json(self):
+        response = HttpResponse(self.body, content_type='application/json')
+        response['ETag'] = '"abc"'
+        response = self.respond(response, 'gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), self.body)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertEqual(response['ETag'], 'W/"abc"')
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    @unittest.skipIf(brotli is None, 'brotli is not installed')
+    def test_prefers_brotli(self):
+        response = self.respond(HttpResponse(self.body, content_type='application/json'))
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), self.body)
+
+    def test_skips(self):
+        cases = [
+            HttpResponse(self.body[:50], content_type='application/json'),
+            HttpResponse(self.body, content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+            StreamingHttpResponse(iter([self.body]), content_type='text/event-stream'),
+        ]
+        for response in cases:
+            self.assertFalse(self.respond(response).has_header('Content-Encoding'))
+        not_accepted = self.respond(HttpResponse(self.body, content_type='application/json'), 'identity')
+        self.assertFalse(not_accepted.has_header('Content-Encoding'))
+        self.assertEqual(not_accepted.content, self.body)
+
+    def test_skips_responses_with_secrets(self):
+        token = self.respond(HttpResponse(self.body, content_type='application/json'), path='/api/auth/token/refresh/')
+        self.assertFalse(token.has_header('Content-Encoding'))
+        self.assertEqual(token.content, self.body)
+
+        response = HttpResponse(self.body, content_type='application/json')
+        response.set_cookie('pin', '1')
+        self.assertFalse(self.respond(response).has_header('Content-Encoding'))
+
+    def test_login_response_not_compressed(self):
+        User.objects.create_user(username='member', email='member@example.com', password='testpass123', is_approved=True)
+        response = APIClient().post(
+            reverse('login'), {'email': 'member@example.com', 'password': 'testpass123'},
+            format='json', HTTP_ACCEPT_ENCODING='gzip',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.json())
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_api_response(self):
+        Location.objects.bulk_create([Location(name=f'Town {index}') for index in range(20)])
+        client = APIClient()
+        client.force_authenticate(user=User.objects.create_user(username='member', is_approved=True))
+        response = client.get(reverse('location-list'), {'page_size': 100}, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.content))['count'], 20)
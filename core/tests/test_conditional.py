@@ -0,0 +1,93 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from core.approvals import bulk_approve_access_requests
+from core.models import User, Unit, Location, Profile, AvailabilityReport, AccessRequest
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com',
+                                              is_staff=True, is_approved=True)
+        self.client.force_authenticate(user=self.admin)
+        self.unit = Unit.objects.create(name='Test Unit')
+        self.user = User.objects.create_user(username='member', email='member@example.com', is_approved=True)
+        Profile.objects.create(user=self.user, unit=self.unit, city=Location.objects.create(name='Haifa'))
+        self.report = AvailabilityReport.objects.create(
+            user=self.user, date=timezone.now().date(), status='available'
+        )
+
+    def revalidate(self, url, response, **params):
+        return self.client.get(url, params, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_not_modified_skips_serialization(self):
+        url = reverse('list-reports')
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('no-cache', first['Cache-Control'])
+        self.assertIn('Last-Modified', first)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.revalidate(url, first)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b'')
+        self.assertEqual(second['ETag'], first['ETag'])
+        # One aggregate query (plus the scope lookup), no report rows fetched
+        self.assertFalse(any('"core_availabilityreport"."notes"' in query['sql'] for query in queries))
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_changes_invalidate(self):
+        url = reverse('list-reports')
+        first = self.client.get(url)
+        # A change in a joined table shows up in the output, so it must change the ETag
+        self.user.username = 'renamed'
+        # Versions are bumped on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        second = self.revalidate(url, first)
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second['ETag'], first['ETag'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.report.delete()
+        self.assertEqual(self.revalidate(url, second).status_code, 200)
+        # Another query string or format is another representation
+        self.assertEqual(self.revalidate(url, second, format='columnar').status_code, 200)
+
+    def test_approved_users_see_bulk_approval(self):
+        url = reverse('user-approved')
+        first = self.client.get(url)
+        self.assertEqual(self.revalidate(url, first).status_code, 304)
+        pending = User.objects.create_user(username='pending', email='pending@example.com')
+        access_request = AccessRequest.objects.create(user=pending)
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_approve_access_requests([access_request.id], self.admin, send_otp=False)
+        response = self.revalidate(url, first)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], first.data['count'] + 1)
+
+    def test_viewsets(self):
+        for url in [reverse('unit-list'), reverse('profile-list')]:
+            first = self.client.get(url)
+            self.assertEqual(self.revalidate(url, first).status_code, 304)
+        url = reverse('unit-list')
+        first = self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Unit.objects.create(name='Child', parent=self.unit)
+        self.assertEqual(self.revalidate(url, first).status_code, 200)
+
+        url = reverse('profile-list')
+        first = self.client.get(url)
+        self.unit.name = 'Renamed Unit'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.unit.save()
+        self.assertEqual(self.revalidate(url, first).status_code, 200)
+
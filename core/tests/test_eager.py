@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from core.cachebus import cache_bus
+from core.models import User, Unit, Location, Profile, AccessRequest
+from core.api.serializers import AccessRequestSerializer, UserSerializer
+
+
+class EagerLoadingTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.city = Location.objects.create(name='Tel Aviv')
+        self.unit = Unit.objects.create(name='Test Unit')
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', is_staff=True)
+        self.client.force_authenticate(user=self.admin)
+
+    def add_users(self, count):
+        for _ in range(count):
+            index = User.objects.count()
+            user = User.objects.create_user(
+                username=f'user{index}', email=f'user{index}@example.com', is_approved=True
+            )
+            Profile.objects.create(user=user, unit=self.unit, city=self.city, address='Main St 1')
+            AccessRequest.objects.create(user=user, approved_by=self.admin)
+
+    def count_queries(self, url):
+        # Measure the uncached path with a fresh cache bus snapshot
+        cache.clear()
+        cache_bus.refresh()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_paths_follow_sources(self):
+        select, prefetch = AccessRequestSerializer.get_eager_paths()
+        self.assertEqual(select, ['approved_by', 'user', 'user__profile', 'user__profile__city', 'user__profile__unit'])
+        self.assertEqual(prefetch, [])
+        # The nested profile's user.* fields point back at the parent and need no join
+        self.assertEqual(UserSerializer.get_eager_paths(), (['profile', 'profile__city', 'profile__unit'], []))
+
+    def test_list_endpoints_use_constant_queries(self):
+        urls = [reverse('list-access-requests'), reverse('user-approved'), reverse('user-list'), reverse('profile-list')]
+        self.add_users(1)
+        # Warm up per-request lookups on the authenticated user
+        [self.count_queries(url) for url in urls]
+        baseline = [self.count_queries(url) for url in urls]
+        self.add_users(5)
+        self.assertEqual([self.count_queries(url) for url in urls], baseline)
+
+    @override_settings(SERIALIZER_QUERY_CHECKS=True)
+    def test_lazy_relation_fails_in_test_mode(self):
+        self.add_users(2)
+        rows = list(AccessRequest.objects.all())
+        with self.assertRaises(AssertionError):
+            AccessRequestSerializer(rows, many=True).data
@@ -0,0 +1,143 @@
+import io
+import tempfile
+from unittest.mock import patch
+from django.contrib.auth.hashers import check_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from openpyxl import Workbook
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.models import User, Unit, Location, AccessRequest
+from core.enrollment import read_user_rows, import_users, hash_passwords
+
+CSV_CONTENT = (
+    "email,first_name,unit_code,city,address,service_type,role,password\n"
+    "alice@example.com,Alice,U1,תל אביב,Main St 1,מילואים,,secret123\n"
+    "BOB@example.com,Bob,,Tel Aviv,Main St 2,,team_manager,\n"
+    "existing@example.com,Eve,U1,Tel Aviv,Main St 3,,,\n"
+    "carol@example.com,Carol,NOPE,Haifa,,bad,,\n"
+    "alice@example.com,Alice again,U1,Tel Aviv,Main St 4,,,\n"
+)
+
+
+class UserImportTest(TestCase):
+    def setUp(self):
+        self.unit = Unit.objects.create(name='Unit 1', code='U1')
+        self.city = Location.objects.create(name='Tel Aviv', name_he='תל אביב')
+        User.objects.create_user(username='alice', email='Existing@example.com')
+
+    def rows(self):
+        return read_user_rows(io.BytesIO(CSV_CONTENT.encode('utf-8-sig')), 'users.csv')
+
+    def test_import_creates_valid_rows_and_reports_errors(self):
+        report = import_users(self.rows(), batch_size=1)
+        self.assertEqual(report['total'], 5)
+        self.assertEqual(report['created'], 2)
+        errors = {error['row']: error['errors'] for error in report['errors']}
+        self.assertEqual(set(errors), {4, 5, 6})
+        self.assertIn('email', errors[4])
+        self.assertEqual(set(errors[5]), {'unit_code', 'city', 'address', 'service_type'})
+        self.assertIn('Duplicate', errors[6]['email'])
+
+        alice = User.objects.get(email='alice@example.com')
+        # "alice" is taken, so a suffix is generated
+        self.assertEqual(alice.username, 'alice1')
+        self.assertTrue(alice.check_password('secret123'))
+        self.assertFalse(alice.is_approved)
+        self.assertEqual(alice.profile.unit, self.unit)
+        self.assertEqual(alice.profile.city, self.city)
+        self.assertEqual(alice.profile.role, 'user')
+
+        bob = User.objects.get(email='bob@example.com')
+        self.assertFalse(bob.has_usable_password())
+        self.assertEqual(bob.profile.role, 'team_manager')
+        self.assertEqual(AccessRequest.objects.filter(status='pending').count(), 2)
+
+    def test_dry_run_creates_nothing(self):
+        report = import_users(self.rows(), dry_run=True)
+        self.assertEqual(report['valid'], 2)
+        self.assertEqual(report['created'], 0)
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_approve(self):
+        import_users(self.rows(), approve=True)
+        self.assertTrue(User.objects.get(email='bob@example.com').is_approved)
+        self.assertEqual(AccessRequest.objects.filter(status='approved').count(), 2)
+
+    def test_read_xlsx(self):
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(['Email', 'City', 'Address', 'Phone'])
+        sheet.append(['dana@example.com', 'Tel Aviv', 'Main St 1', 501234567])
+        output = io.BytesIO()
+        workbook.save(output)
+        output.seek(0)
+        rows = read_user_rows(output, 'users.xlsx')
+        self.assertEqual(rows, [{'email': 'dana@example.com', 'city': 'Tel Aviv', 'address': 'Main St 1', 'phone': '501234567'}])
+
+    def test_parallel_hashing(self):
+        with patch('core.enrollment.PARALLEL_HASH_THRESHOLD', 0):
+            hashes = hash_passwords(['one', '', 'two'], workers=2)
+        self.assertTrue(check_password('one', hashes[0]))
+        self.assertFalse(check_password('', hashes[1]))
+        self.assertTrue(check_password('two', hashes[2]))
+
+    def test_command(self):
+        out = io.StringIO()
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', encoding='utf-8') as f:
+            f.write(CSV_CONTENT)
+            f.flush()
+            call_command('import_users', f.name, stdout=out)
+        self.assertIn('2 of 5 users created', out.getvalue())
+
+
+class UserImportAPITest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        Location.objects.create(name='Tel Aviv')
+        self.staff = User.objects.create_user(username='staff', email='staff@example.com', is_staff=True)
+        self.user = User.objects.create_user(username='user', email='user@example.com')
+
+    def upload(self):
+        return SimpleUploadedFile(
+            'users.csv', b"email,city,address\nnew@example.com,Tel Aviv,Main St 1\n", content_type='text/csv'
+        )
+
+    def test_staff_only(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(reverse('import-users'), {'file': self.upload()}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_import(self):
+        self.client.force_authenticate(user=self.staff)
+        response = self.client.post(reverse('import-users'), {'file': self.upload(), 'approve': 'true'}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 1)
+        request = AccessRequest.objects.get(user__email='new@example.com')
+        self.assertEqual(request.status, 'approved')
+        self.assertEqual(request.approved_by, self.staff)
+
+    def test_api_hashes_in_process(self):
+        self.client.force_authenticate(user=self.staff)
+        lines = [f"user{index}@example.com,Tel Aviv,Main St 1,secret-{index}" for index in range(60)]
+        upload = SimpleUploadedFile(
+            'users.csv', ("email,city,address,password\n" + "\n".join(lines)).encode(), content_type='text/csv'
+        )
+        with patch('core.enrollment.ProcessPoolExecutor', side_effect=AssertionError('forked a pool')):
+            response = self.client.post(reverse('import-users'), {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 60)
+
+    @override_settings(USER_IMPORT_API_MAX_PASSWORDS=0)
+    def test_api_refuses_large_password_files(self):
+        self.client.force_authenticate(user=self.staff)
+        upload = SimpleUploadedFile(
+            'users.csv', b"email,city,address,password\nnew@example.com,Tel Aviv,Main St 1,secret\n",
+            content_type='text/csv'
+        )
+        response = self.client.post(reverse('import-users'), {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('manage.py import_users', response.data['error'])
+        self.assertFalse(User.objects.filter(email='new@example.com').exists())
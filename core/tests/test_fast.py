@@ -0,0 +1,59 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from core.models import User, Unit, Location, Profile, AvailabilityReport
+from core.api.serializers import (
+    AvailabilityReportSerializer, AvailabilityReportFastSerializer,
+    UserSerializer, UserFastSerializer,
+    LocationSerializer, LocationFastSerializer,
+)
+
+
+class FastReadSerializerTest(TestCase):
+    def setUp(self):
+        self.city = Location.objects.create(name='Haifa', name_he='חיפה', location_type='kibbutz')
+        self.unit = Unit.objects.create(name='Test Unit')
+        self.user = User.objects.create_user(username='member', email='member@example.com', is_approved=True)
+        Profile.objects.create(user=self.user, unit=self.unit, city=self.city, role='team_manager')
+        # Approved user without a profile: the nested profile must come out as None
+        User.objects.create_user(username='bare', email='bare@example.com', is_approved=True)
+        today = timezone.now().date()
+        AvailabilityReport.objects.create(user=self.user, date=today, status='available', location=self.city)
+        AvailabilityReport.objects.create(
+            user=self.user, date=today - timezone.timedelta(days=1), status='sick', location_text='Home'
+        )
+
+    def assertSameOutput(self, serializer_class, fast_class, queryset):
+        expected = [dict(item) for item in serializer_class(queryset, many=True).data]
+        self.assertEqual(fast_class.serialize(queryset), expected)
+
+    def test_matches_model_serializers(self):
+        self.assertSameOutput(AvailabilityReportSerializer, AvailabilityReportFastSerializer,
+                              AvailabilityReport.objects.order_by('-date'))
+        self.assertSameOutput(LocationSerializer, LocationFastSerializer, Location.objects.order_by('id'))
+        users = User.objects.order_by('id')
+        expected = [dict(item) for item in UserSerializer(users, many=True).data]
+        for item in expected:
+            item['profile'] = dict(item['profile']) if item['profile'] else None
+        self.assertEqual(UserFastSerializer.serialize(users), expected)
+
+    def test_single_query_projection(self):
+        with self.assertNumQueries(1):
+            rows = UserFastSerializer.serialize(User.objects.all())
+        profile = next(row['profile'] for row in rows if row['username'] == 'member')
+        self.assertEqual(profile['role_display'], str(dict(Profile.ROLE_CHOICES)['team_manager']))
+        self.assertEqual(profile['city_name_he'], 'חיפה')
+
+    def test_list_endpoints(self):
+        client = APIClient()
+        client.force_authenticate(user=User.objects.create_user(username='admin', email='admin@example.com',
+                                                                is_staff=True, is_approved=True))
+        response = client.get(reverse('list-reports'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['status'] for row in response.data['results']], ['available', 'sick'])
+
+        response = client.get(reverse('location-list'), {'search': 'Haifa'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['location_type'], 'kibbutz')
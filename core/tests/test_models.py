@@ -109,6 +109,44 @@ class AccessRequestModelTest(TestCase):
         self.assertEqual(self.access_request.rejection_reason, 'Test rejection')
 
 
+class DirtyFieldsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        AccessRequest.objects.create(user=self.user, status='pending')
+
+    def test_changed_fields(self):
+        access_request = AccessRequest.objects.get(user=self.user)
+        self.assertEqual(access_request.changed_fields, [])
+        access_request.rejection_reason = 'Missing details'
+        self.assertEqual(access_request.changed_fields, ['rejection_reason'])
+
+    def test_unchanged_save_skips_write(self):
+        access_request = AccessRequest.objects.get(user=self.user)
+        with self.assertNumQueries(0):
+            access_request.save()
+
+    def test_save_writes_only_changed_fields(self):
+        access_request = AccessRequest.objects.get(user=self.user)
+        # A concurrent change to another column is not overwritten
+        AccessRequest.objects.filter(pk=access_request.pk).update(status='approved')
+        access_request.rejection_reason = 'Missing details'
+        with self.assertNumQueries(1):
+            access_request.save()
+        access_request.refresh_from_db()
+        self.assertEqual(access_request.status, 'approved')
+        self.assertEqual(access_request.rejection_reason, 'Missing details')
+        self.assertEqual(access_request.changed_fields, [])
+
+    def test_approval_signal_uses_snapshot(self):
+        admin = User.objects.create_user(username='admin', email='admin@example.com', is_staff=True)
+        access_request = AccessRequest.objects.select_related('user').get(user=self.user)
+        # No SELECT of the old row: approve() only issues the two UPDATEs and the OTP insert
+        # (the cache bus bump for User runs after commit)
+        with self.assertNumQueries(3):
+            access_request.approve(admin)
+        self.assertTrue(OTPToken.objects.filter(user=self.user).exists())
+
+
 class OTPTokenModelTest(TestCase):
     def setUp(self):
         self.user = User.objects.create_user(
@@ -135,6 +173,26 @@ class OTPTokenModelTest(TestCase):
         self.otp.mark_as_used()
         self.assertTrue(self.otp.used)
 
+    def test_consume_once(self):
+        with self.assertNumQueries(1):
+            user = OTPToken.consume('TEST@example.com', '123456')
+        self.assertEqual(user, self.user)
+        self.assertEqual(user.email, 'test@example.com')
+        self.assertEqual(user.date_joined, self.user.date_joined)
+        # Loaded like a queried instance: saving it writes only what changed
+        self.assertEqual(user.changed_fields, [])
+        self.otp.refresh_from_db()
+        self.assertTrue(self.otp.used)
+        # A second verification with the same code fails
+        self.assertIsNone(OTPToken.consume('test@example.com', '123456'))
+
+    def test_consume_rejects_wrong_or_expired(self):
+        self.assertIsNone(OTPToken.consume('test@example.com', '654321'))
+        self.assertIsNone(OTPToken.consume('other@example.com', '123456'))
+        self.assertIsNone(OTPToken.consume('test@example.com', '123456', now=timezone.now() + timedelta(minutes=11)))
+        self.otp.refresh_from_db()
+        self.assertFalse(self.otp.used)
+
 
 class AvailabilityReportModelTest(TestCase):
     def setUp(self):
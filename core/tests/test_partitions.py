@@ -0,0 +1,123 @@
+from datetime import date
+from unittest import skipIf, skipUnless
+
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from core.models import User, AvailabilityReport, Location
+from core.partitions import (
+    DEFAULT_PARTITION, add_months, ensure_report_partitions, is_partitioned, partition_month, partition_name,
+)
+
+
+class PartitionNamingTest(TestCase):
+    def test_months(self):
+        self.assertEqual(add_months(date(2026, 11, 1), 2), date(2027, 1, 1))
+        self.assertEqual(add_months(date(2026, 1, 1), -1), date(2025, 12, 1))
+        name = partition_name(date(2026, 3, 1))
+        self.assertEqual(name, 'core_availabilityreport_p2026_03')
+        self.assertEqual(partition_month(name), date(2026, 3, 1))
+        self.assertIsNone(partition_month(DEFAULT_PARTITION))
+
+
+class ReportPartitionTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com',
+                                              is_staff=True, is_approved=True)
+        self.client.force_authenticate(user=self.admin)
+        for month in (date(2026, 1, 1), date(2026, 2, 1), date(2026, 3, 1)):
+            AvailabilityReport.objects.create(user=self.admin, date=month.replace(day=15), status='available')
+
+    def report_query(self, **params):
+        """SQL of the rows query list_reports_view runs for `params`"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('list-reports'), params)
+        self.assertEqual(response.status_code, 200)
+        return next(query['sql'] for query in queries if '"core_availabilityreport"."notes"' in query['sql'])
+
+    def test_from_to_filter_is_a_plain_range(self):
+        sql = self.report_query(**{'from': '2026-02-01', 'to': '2026-02-28'})
+        # A bare range on the partition key is what lets the planner prune
+        self.assertIn('"core_availabilityreport"."date" >= ', sql)
+        self.assertIn('"core_availabilityreport"."date" <= ', sql)
+
+    @skipIf(connection.vendor == 'postgresql', 'Partitioned on PostgreSQL')
+    def test_fallback_is_noop(self):
+        self.assertFalse(is_partitioned(connection))
+        self.assertEqual(ensure_report_partitions(), {'created': [], 'brin_indexed': []})
+
+    @skipUnless(connection.vendor == 'postgresql', 'Partitioning needs PostgreSQL')
+    def test_from_to_filter_prunes_partitions(self):
+        result = ensure_report_partitions(today=date(2026, 6, 1))
+        # The test months were routed to the default partition and now have their own
+        self.assertIn(partition_name(date(2026, 1, 1)), result['created'])
+        self.assertIn(partition_name(date(2026, 9, 1)), result['created'])
+        self.assertIn(partition_name(date(2026, 2, 1)), result['brin_indexed'])
+        self.assertNotIn(partition_name(date(2026, 5, 1)), result['brin_indexed'])
+
+        sql = self.report_query(**{'from': '2026-02-01', 'to': '2026-02-28'})
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN {sql}')
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        self.assertIn(partition_name(date(2026, 2, 1)), plan)
+        self.assertNotIn(partition_name(date(2026, 1, 1)), plan)
+        self.assertNotIn(partition_name(date(2026, 3, 1)), plan)
+        self.assertNotIn(DEFAULT_PARTITION, plan)
+
+        response = self.client.get(reverse('list-reports'), {'from': '2026-02-01', 'to': '2026-02-28'})
+        self.assertEqual([report['date'] for report in response.data['results']], ['2026-02-15'])
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Table rebuild runs on PostgreSQL only')
+class ReportTableRebuildTest(TestCase):
+    """The reports table as left by migration 0022"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='member', email='member@example.com', is_approved=True)
+        self.location = Location.objects.create(name='Haifa')
+
+    def test_foreign_keys_survive_rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_get_constraintdef(oid) FROM pg_constraint "
+                "WHERE conrelid = 'core_availabilityreport'::regclass AND contype = 'f'"
+            )
+            definitions = ' '.join(row[0] for row in cursor.fetchall())
+        self.assertIn('REFERENCES core_user(id)', definitions)
+        self.assertIn('REFERENCES core_location(id)', definitions)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+            AvailabilityReport.objects.create(user_id=self.user.id + 1000, date=date(2026, 2, 15), status='available')
+
+    def test_on_delete_behaviour(self):
+        report = AvailabilityReport.objects.create(
+            user=self.user, date=date(2026, 2, 15), status='available', location=self.location
+        )
+        self.location.delete()
+        report.refresh_from_db()
+        self.assertIsNone(report.location_id)
+
+        self.user.delete()
+        self.assertFalse(AvailabilityReport.objects.filter(pk=report.pk).exists())
+
+    def test_orm_reads_and_writes_by_id(self):
+        report = AvailabilityReport.objects.create(user=self.user, date=date(2026, 2, 15), status='available')
+        self.assertEqual(AvailabilityReport.objects.get(pk=report.pk).date, date(2026, 2, 15))
+
+        report.status = 'partial'
+        report.save()
+        self.assertEqual(AvailabilityReport.objects.get(id=report.id).status, 'partial')
+        self.assertEqual(AvailabilityReport.objects.filter(pk=report.pk).update(notes='Late'), 1)
+
+        # New ids keep coming from the sequence carried over from the old table
+        other = AvailabilityReport.objects.create(user=self.user, date=date(2026, 3, 15), status='available')
+        self.assertGreater(other.id, report.id)
+        AvailabilityReport.objects.get(pk=report.pk).delete()
+        self.assertEqual(list(AvailabilityReport.objects.values_list('id', flat=True)), [other.id])
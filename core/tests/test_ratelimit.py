@@ -0,0 +1,87 @@
+from django.core.cache import cache
+from unittest.mock import patch
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.ratelimit import sliding_window_hit, SlidingWindowThrottle
+
+
+class SlidingWindowTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_limit_within_window(self):
+        now = 1000.0
+        for _ in range(3):
+            self.assertEqual(sliding_window_hit('test', 3, 60, now=now), (True, 0))
+        allowed, retry_after = sliding_window_hit('test', 3, 60, now=now)
+        self.assertFalse(allowed)
+        self.assertGreater(retry_after, 0)
+
+    def test_previous_window_slides_out(self):
+        for _ in range(3):
+            sliding_window_hit('test', 3, 60, now=1000.0)
+        # Just after the bucket boundary most of the previous window still counts
+        self.assertFalse(sliding_window_hit('test', 3, 60, now=1021.0)[0])
+        # Near the end of the next bucket the previous hits have mostly slid out
+        self.assertTrue(sliding_window_hit('test', 3, 60, now=1075.0)[0])
+
+
+class AuthThrottleTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_email_throttle_returns_retry_after(self):
+        rates = {'auth_ip': '100/min', 'auth_email': '2/min', 'auth_global': '100/min'}
+        url = reverse('login')
+        data = {'email': 'Nobody@example.com', 'password': 'wrong'}
+        with patch.object(SlidingWindowThrottle, 'THROTTLE_RATES', rates):
+            for _ in range(2):
+                response = self.client.post(url, data, format='json')
+                self.assertNotEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            # Same address with different case counts against the same bucket
+            response = self.client.post(url, {**data, 'email': 'nobody@example.com'}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertIn('Retry-After', response)
+            # Other addresses are not affected
+            response = self.client.post(url, {**data, 'email': 'other@example.com'}, format='json')
+            self.assertNotEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_global_limit_only_alerts(self):
+        rates = {'auth_ip': '100/min', 'auth_email': '100/min', 'auth_global': '2/min'}
+        url = reverse('login')
+        with patch.object(SlidingWindowThrottle, 'THROTTLE_RATES', rates):
+            with self.assertLogs('core', 'WARNING') as logs:
+                for index in range(4):
+                    response = self.client.post(url, {'email': f'user{index}@example.com', 'password': 'wrong'},
+                                                format='json', REMOTE_ADDR=f'10.0.0.{index}')
+                    self.assertNotEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            # Once per window, not once per request
+            self.assertEqual(len(logs.records), 1)
+
+    def test_forwarded_for_does_not_dodge_ip_limit(self):
+        rates = {'auth_ip': '2/min', 'auth_email': '100/min', 'auth_global': None}
+        url = reverse('login')
+        with patch.object(SlidingWindowThrottle, 'THROTTLE_RATES', rates):
+            statuses = [
+                self.client.post(url, {'email': f'user{index}@example.com', 'password': 'wrong'}, format='json',
+                                 REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR=f'192.0.2.{index}').status_code
+                for index in range(3)
+            ]
+        self.assertEqual(statuses[-1], status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_token_refresh_is_throttled(self):
+        rates = {'auth_ip': '2/min', 'auth_email': '100/min', 'auth_global': '100/min'}
+        url = reverse('token-refresh')
+        with patch.object(SlidingWindowThrottle, 'THROTTLE_RATES', rates):
+            for _ in range(2):
+                response = self.client.post(url, {'refresh': 'invalid'}, format='json')
+                self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+            response = self.client.post(url, {'refresh': 'invalid'}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertIn('Retry-After', response)
@@ -0,0 +1,93 @@
+from django.contrib.auth.models import update_last_login
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from core.api.response_cache import get_model_versions
+from core.api.views import bulk_upsert_reports
+from core.models import User, Unit, Location, Profile, AvailabilityReport
+
+
+class ResponseCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.city = Location.objects.create(name='Haifa')
+        # Commit callbacks bump the unit tree's cache version, as a real commit would
+        with self.captureOnCommitCallbacks(execute=True):
+            self.branch = Unit.objects.create(name='Branch')
+            self.other_branch = Unit.objects.create(name='Other Branch')
+        self.managers = [self.add_user(f'manager{index}', self.branch, 'branch_manager') for index in range(2)]
+        self.other_manager = self.add_user('other', self.other_branch, 'branch_manager')
+        self.member = self.add_user('member', self.branch)
+        self.today = timezone.now().date()
+        AvailabilityReport.objects.create(user=self.member, date=self.today, status='available')
+
+    def add_user(self, username, unit, role='user'):
+        user = User.objects.create_user(username=username, email=f'{username}@example.com', is_approved=True)
+        Profile.objects.create(user=user, unit=unit, city=self.city, role=role)
+        return user
+
+    def get(self, user, url=None, **extra):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url or reverse('list-reports'), **extra)
+        report_queries = [query for query in queries if 'core_availabilityreport' in query['sql']]
+        return response, report_queries
+
+    def test_managers_of_same_unit_share_entry(self):
+        first, queries = self.get(self.managers[0])
+        self.assertTrue(queries)
+        second, queries = self.get(self.managers[1])
+        self.assertEqual(queries, [])
+        self.assertEqual(second.data, first.data)
+        # Cached responses still answer conditional requests
+        response, queries = self.get(self.managers[1], HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        other, queries = self.get(self.other_manager)
+        self.assertTrue(queries)
+        self.assertEqual(other.data['count'], 0)
+        # Regular users get their own entries
+        own, queries = self.get(self.member)
+        self.assertTrue(queries)
+
+    def test_model_changes_invalidate(self):
+        self.get(self.managers[0])
+        # Versions are bumped on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            AvailabilityReport.objects.create(user=self.managers[1], date=self.today, status='sick')
+        response, queries = self.get(self.managers[0])
+        self.assertTrue(queries)
+        self.assertEqual(response.data['count'], 2)
+
+        # Bulk writes send no signals and bump the version themselves
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_upsert_reports([AvailabilityReport(user=self.member, date=self.today, status='home')])
+        response, queries = self.get(self.managers[0])
+        self.assertIn('home', [row['status'] for row in response.data['results']])
+
+        # Moving a member to another unit changes both scopes
+        self.get(self.other_manager)
+        profile = self.member.profile
+        profile.unit = self.other_branch
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.save()
+        response, queries = self.get(self.other_manager)
+        self.assertEqual(response.data['count'], 1)
+
+    def test_login_does_not_invalidate(self):
+        versions = get_model_versions([User])
+        update_last_login(None, self.managers[0])
+        self.assertEqual(get_model_versions([User]), versions)
+
+    def test_approved_users(self):
+        url = reverse('user-approved')
+        first, queries = self.get(self.managers[0], url)
+        with CaptureQueriesContext(connection) as queries:
+            second, report_queries = self.get(self.managers[1], url)
+        self.assertFalse(any('core_user' in query['sql'] and 'is_approved' in query['sql'] for query in queries))
+        self.assertEqual(second.data, first.data)
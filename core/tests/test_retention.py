@@ -0,0 +1,39 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from core.models import OTPToken, AccessRequest
+from core.retention import get_retention_policies, purge
+
+User = get_user_model()
+
+
+class RetentionTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        self.policies = get_retention_policies()
+        old = timezone.now() - timedelta(days=365)
+        for i in range(5):
+            OTPToken.objects.create(user=self.user, token=f'{i:06d}', expires_at=old)
+        OTPToken.objects.update(created_at=old)
+        self.fresh = OTPToken.objects.create(user=self.user, token='999999', expires_at=timezone.now())
+
+    def test_purge_in_chunks(self):
+        metrics = purge(self.policies['otp_tokens'], batch_size=2, sleep_seconds=0)
+        self.assertEqual(metrics['deleted'], 5)
+        self.assertEqual(metrics['batches'], 3)
+        self.assertEqual(list(OTPToken.objects.all()), [self.fresh])
+
+    def test_dry_run_deletes_nothing(self):
+        metrics = purge(self.policies['otp_tokens'], batch_size=2, sleep_seconds=0, dry_run=True)
+        self.assertEqual(metrics['matched'], 5)
+        self.assertEqual(metrics['deleted'], 0)
+        self.assertEqual(OTPToken.objects.count(), 6)
+
+    def test_only_rejected_access_requests_purged(self):
+        old = timezone.now() - timedelta(days=365)
+        AccessRequest.objects.create(user=self.user, status='rejected')
+        AccessRequest.objects.create(user=self.user, status='approved')
+        AccessRequest.objects.update(submitted_at=old)
+        purge(self.policies['rejected_access_requests'], sleep_seconds=0)
+        self.assertEqual(list(AccessRequest.objects.values_list('status', flat=True)), ['approved'])
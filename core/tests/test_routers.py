@@ -0,0 +1,105 @@
+import warnings
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from core.models import AvailabilityReport
+from core.routers import ReplicaRoutingMiddleware, use_replica
+
+
+@contextmanager
+def databases(**extra):
+    # DATABASES is overridden only for the router's lookup; no query is run
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', 'Overriding setting DATABASES')
+        with override_settings(DATABASES={'default': settings.DATABASES['default'], **extra}):
+            yield
+
+
+def read_db():
+    return AvailabilityReport.objects.all().db
+
+
+def write_db():
+    # What save() and queryset.update() ask the router for
+    return router.db_for_write(AvailabilityReport)
+
+
+class PrimaryReplicaRouterTest(SimpleTestCase):
+    def setUp(self):
+        replica = databases(replica=settings.DATABASES['default'])
+        replica.__enter__()
+        self.addCleanup(replica.__exit__, None, None, None)
+
+    def test_reads_use_replica_until_write(self):
+        self.assertEqual(read_db(), 'default')
+        with use_replica() as scope:
+            self.assertEqual(read_db(), 'replica')
+            self.assertEqual(write_db(), 'default')
+            self.assertTrue(scope.wrote)
+            self.assertEqual(read_db(), 'default')
+        with use_replica(pinned=True):
+            self.assertEqual(read_db(), 'default')
+        self.assertFalse(router.allow_migrate('replica', 'core'))
+
+    def test_without_replica(self):
+        with databases(), use_replica():
+            self.assertEqual(read_db(), 'default')
+
+    def test_middleware(self):
+        seen = []
+
+        def view(request):
+            seen.append(read_db())
+            if request.GET.get('write'):
+                write_db()
+                seen.append(read_db())
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(view)
+        factory = RequestFactory()
+        response = middleware(factory.get('/'))
+        self.assertEqual(seen, ['replica'])
+        self.assertNotIn('pin_primary', response.cookies)
+
+        # A write pins the rest of the request and, via the cookie, the client's next reads
+        seen.clear()
+        response = middleware(factory.get('/', {'write': 1}))
+        self.assertEqual(seen, ['replica', 'default'])
+        cookie = response.cookies['pin_primary']
+        self.assertEqual(cookie['max-age'], settings.REPLICA_PIN_SECONDS)
+
+        seen.clear()
+        request = factory.get('/')
+        request.COOKIES['pin_primary'] = cookie.value
+        middleware(request)
+        self.assertEqual(seen, ['default'])
+
+        seen.clear()
+        response = middleware(factory.post('/', {'write': 1}, QUERY_STRING='write=1'))
+        self.assertEqual(seen, ['default', 'default'])
+        self.assertIn('pin_primary', response.cookies)
+
+    def test_middleware_pin_header(self):
+        seen = []
+
+        def view(request):
+            seen.append(read_db())
+            if request.method == 'POST':
+                write_db()
+            return HttpResponse()
+
+        # Cross-site clients get the pin as a header and echo it back
+        middleware = ReplicaRoutingMiddleware(view)
+        factory = RequestFactory()
+        response = middleware(factory.post('/'))
+        self.assertEqual(response['X-Pin-Primary'], str(settings.REPLICA_PIN_SECONDS))
+        self.assertNotIn('X-Pin-Primary', middleware(factory.get('/')))
+
+        seen.clear()
+        middleware(factory.get('/', HTTP_X_PIN_PRIMARY='1'))
+        self.assertEqual(seen, ['default'])
+        self.assertIn('x-pin-primary', settings.CORS_ALLOW_HEADERS)
+        self.assertIn('x-pin-primary', settings.CORS_EXPOSE_HEADERS)
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.test import TestCase
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from core.models import OTPToken, ScheduledJob, JobRun
+from core.scheduler import CronSchedule, sync_jobs, acquire_lease, run_due_jobs
+
+User = get_user_model()
+
+
+class CronScheduleTest(TestCase):
+    def test_next_after(self):
+        moment = datetime(2026, 1, 5, 10, 7, tzinfo=dt_timezone.utc)
+        self.assertEqual(CronSchedule('*/15 * * * *').next_after(moment), moment.replace(minute=15))
+        self.assertEqual(CronSchedule('30 2 * * *').next_after(moment), datetime(2026, 1, 6, 2, 30, tzinfo=dt_timezone.utc))
+        # 2026-01-05 is a Monday; next Sunday (weekday 0) at midnight
+        self.assertEqual(CronSchedule('0 0 * * 0').next_after(moment), datetime(2026, 1, 11, 0, 0, tzinfo=dt_timezone.utc))
+
+    def test_invalid_expression(self):
+        with self.assertRaises(ValueError):
+            CronSchedule('61 * * * *')
+        with self.assertRaises(ValueError):
+            CronSchedule('* * *')
+
+
+class SchedulerTest(TestCase):
+    def setUp(self):
+        sync_jobs()
+        self.job = ScheduledJob.objects.get(name='purge_expired_otp_tokens')
+
+    def test_sync_jobs_keeps_existing_rows(self):
+        count = ScheduledJob.objects.count()
+        ScheduledJob.objects.filter(pk=self.job.pk).update(enabled=False, schedule='0 0 1 1 *')
+        # A second worker starting up re-syncs the same jobs
+        sync_jobs()
+        sync_jobs()
+        self.assertEqual(ScheduledJob.objects.count(), count)
+        job = ScheduledJob.objects.get(pk=self.job.pk)
+        self.assertFalse(job.enabled)
+        self.assertNotEqual(job.schedule, '0 0 1 1 *')
+        self.assertIsNotNone(job.next_run_at)
+
+    def test_lease_is_exclusive(self):
+        self.assertTrue(acquire_lease(self.job, 'worker-a'))
+        self.assertFalse(acquire_lease(self.job, 'worker-b'))
+        # An expired lease can be taken over
+        later = timezone.now() + timedelta(days=1)
+        self.assertTrue(acquire_lease(self.job, 'worker-b', now=later))
+
+    def test_stale_snapshot_does_not_rerun_job(self):
+        ScheduledJob.objects.filter(pk=self.job.pk).update(next_run_at=timezone.now() - timedelta(minutes=1))
+        # Worker B listed the job as due before worker A ran it
+        stale = ScheduledJob.objects.get(pk=self.job.pk)
+
+        self.assertEqual(len(run_due_jobs('worker-a')), 1)
+        self.assertFalse(acquire_lease(stale, 'worker-b', due_only=True))
+        self.assertEqual(run_due_jobs('worker-b'), [])
+        self.assertEqual(JobRun.objects.filter(job=self.job).count(), 1)
+
+    def test_manual_run_records_history(self):
+        user = User.objects.create_user(username='testuser', email='test@example.com')
+        otp = OTPToken.objects.create(user=user, token='123456', expires_at=timezone.now())
+        OTPToken.objects.filter(pk=otp.pk).update(created_at=timezone.now() - timedelta(days=30))
+        ScheduledJob.objects.filter(pk=self.job.pk).update(run_requested=True)
+
+        runs = run_due_jobs('worker-a')
+        self.assertEqual([run.job.name for run in runs], ['purge_expired_otp_tokens'])
+        run = JobRun.objects.get(job=self.job)
+        self.assertEqual(run.status, 'succeeded')
+        self.assertEqual(run.trigger, 'manual')
+        self.assertEqual(run.result['deleted'], 1)
+        self.job.refresh_from_db()
+        self.assertFalse(self.job.run_requested)
+        self.assertEqual(self.job.locked_by, '')
+        self.assertFalse(OTPToken.objects.exists())
@@ -0,0 +1,76 @@
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.models import User, OTPToken
+from core.users import get_user_by_email, get_users_by_email, users_by_email_queryset
+
+
+class UserEmailLookupTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='Test@Example.com')
+
+    def test_lookup_ignores_case(self):
+        self.assertEqual(get_user_by_email('test@example.com'), self.user)
+        self.assertEqual(get_user_by_email(' TEST@example.COM '), self.user)
+        self.assertIsNone(get_user_by_email('missing@example.com'))
+
+    def test_lookup_is_memoized_per_request(self):
+        request = RequestFactory().get('/')
+        with self.assertNumQueries(1):
+            self.assertEqual(get_user_by_email('test@example.com', request), self.user)
+            self.assertEqual(get_user_by_email('TEST@example.com', request), self.user)
+        with self.assertNumQueries(1):
+            self.assertIsNone(get_user_by_email('missing@example.com', request))
+            self.assertIsNone(get_user_by_email('missing@example.com', request))
+
+    @skipUnless(connection.vendor == 'postgresql', 'Partial expression index needs PostgreSQL')
+    def test_lookups_use_email_index(self):
+        OTPToken.objects.create(user=self.user, token='123456', expires_at=timezone.now() + timedelta(minutes=5))
+        with CaptureQueriesContext(connection) as queries:
+            OTPToken.consume('test@example.com', '000000')
+        with connection.cursor() as cursor:
+            # The table is tiny; make sure the index is chosen whenever it is usable at all
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(f"EXPLAIN {queries[-1]['sql']}")
+            consume_plan = '\n'.join(row[0] for row in cursor.fetchall())
+        self.assertIn('core_user_email_ci_unique', consume_plan)
+        self.assertIn('core_user_email_ci_unique', users_by_email_queryset(['test@example.com']).explain())
+
+    def test_bulk_lookup(self):
+        other = User.objects.create_user(username='other', email='other@example.com')
+        with self.assertNumQueries(1):
+            users = get_users_by_email(['TEST@example.com', 'other@example.com', 'missing@example.com'])
+        self.assertEqual(users, {'test@example.com': self.user, 'other@example.com': other})
+
+    def test_email_unique_regardless_of_case(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.create_user(username='dup', email='test@EXAMPLE.com')
+        # Users without an email are not affected
+        User.objects.create_user(username='blank1', email='')
+        User.objects.create_user(username='blank2', email='')
+
+
+class CaseInsensitiveAuthTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpass123', is_approved=True
+        )
+
+    def test_login_with_different_case(self):
+        response = self.client.post(reverse('login'), {
+            'email': 'Test@Example.com', 'password': 'testpass123'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_request_otp_with_different_case(self):
+        response = self.client.post(reverse('request-otp'), {'email': 'TEST@example.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(self.user.otp_tokens.exists())
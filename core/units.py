@@ -0,0 +1,28 @@
+"""
+Process-cached unit hierarchy.
+
+Unit.get_descendants() walks the tree one query per node. The tree is small
+and rarely changes, so every worker keeps the whole parent map in memory
+and drops it whenever a Unit is saved or deleted anywhere (the cache bus
+namespace is bumped by core.signals).
+"""
+from core.cachebus import ProcessCache, model_namespace
+from core.models import Unit
+
+_children = ProcessCache(model_namespace(Unit))
+
+
+def _load_children():
+    children = {}
+    for unit_id, parent_id in Unit.objects.values_list('id', 'parent_id'):
+        children.setdefault(parent_id, []).append(unit_id)
+    return children
+
+
+def unit_subtree_ids(unit_id):
+    """Return the id of the unit and of all its descendants"""
+    children = _children.get('children', _load_children)
+    ids = [unit_id]
+    for current in ids:
+        ids.extend(children.get(current, ()))
+    return ids
@@ -0,0 +1,60 @@
+"""
+Case-insensitive user lookup by email.
+
+Emails are unique per lower(email) (see User.Meta.constraints), so every
+lookup filters on Lower('email') to hit that index. The index is partial
+(blank emails are excluded), so lookups also exclude blank emails, or the
+planner cannot use it. Lookups are memoized on the request, so the
+serializer and the view handling the same request share a single query.
+"""
+from django.db.models.functions import Lower
+
+from core.models import User
+
+
+def normalize_email(email):
+    return (email or '').strip().lower()
+
+
+def users_by_email_queryset(emails):
+    """Users whose lower(email) is in `emails` (already normalized), via core_user_email_ci_unique"""
+    return User.objects.exclude(email='').annotate(email_lower=Lower('email')).filter(email_lower__in=emails)
+
+
+def _request_cache(request):
+    if request is None:
+        return None
+    # Memoize on the underlying HttpRequest so DRF and Django views share it
+    request = getattr(request, '_request', request)
+    if not hasattr(request, '_users_by_email'):
+        request._users_by_email = {}
+    return request._users_by_email
+
+
+def get_users_by_email(emails, request=None):
+    """Return {normalized email: User} for the given emails in a single query"""
+    cache = _request_cache(request)
+    wanted = {normalize_email(email) for email in emails} - {''}
+    found = {email: cache[email] for email in wanted if cache is not None and email in cache}
+    missing = wanted - set(found)
+    if missing:
+        users = {
+            user.email_lower: user
+            for user in users_by_email_queryset(missing)
+        }
+        for email in missing:
+            if cache is not None:
+                cache[email] = users.get(email)
+            found[email] = users.get(email)
+    return {email: user for email, user in found.items() if user is not None}
+
+
+def get_user_by_email(email, request=None):
+    """Return the user with this email (any case), or None"""
+    return get_users_by_email([email], request).get(normalize_email(email))
+
+
+def email_taken(email, user=None):
+    """Whether a user other than `user` has this email (any case); blank emails never clash"""
+    other = get_user_by_email(email)
+    return other is not None and (user is None or other.pk != user.pk)
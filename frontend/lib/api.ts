@@ -3,8 +3,48 @@ import Cookies from 'js-cookie';
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
+const isAllNull = (value: any): boolean =>
+  value === null || (typeof value === 'object' && Object.values(value).every(isAllNull));
+
+// Turn a ?format=columnar payload back into the default { ...meta, results: [...] } shape.
+// Dotted columns ('profile.role') become nested objects; an all-null nested object is null.
+export function decodeColumnar(data: any) {
+  if (!data || !Array.isArray(data.columns) || !Array.isArray(data.rows)) return data;
+  const { columns, dictionaries = {}, rows, ...meta } = data;
+  const paths: string[][] = columns.map((name: string) => name.split('.'));
+  const lookups: (any[] | undefined)[] = columns.map((name: string) => dictionaries[name]);
+  const nestedKeys = Array.from(new Set(paths.filter((path) => path.length > 1).map((path) => path[0])));
+  const results = rows.map((row: any[]) => {
+    const item: any = {};
+    row.forEach((value, index) => {
+      const path = paths[index];
+      const lookup = lookups[index];
+      let target = item;
+      for (const key of path.slice(0, -1)) target = target[key] ??= {};
+      target[path[path.length - 1]] = value !== null && lookup ? lookup[value] : value;
+    });
+    for (const key of nestedKeys) {
+      if (isAllNull(item[key])) item[key] = null;
+    }
+    return item;
+  });
+  return { ...meta, results };
+}
+
+// Header the API sets after a write (value: seconds to keep reading from the primary database)
+const PIN_PRIMARY_HEADER = 'x-pin-primary';
+
 class ApiClient {
   private client: AxiosInstance;
+  // Until when requests carry the primary pin; the API's pin cookie is not kept cross-site
+  private pinPrimaryUntil = 0;
+
+  private rememberPrimaryPin(headers: any) {
+    const seconds = Number(headers?.[PIN_PRIMARY_HEADER]);
+    if (seconds > 0) {
+      this.pinPrimaryUntil = Math.max(this.pinPrimaryUntil, Date.now() + seconds * 1000);
+    }
+  }
 
   constructor() {
     this.client = axios.create({
@@ -13,6 +53,8 @@ class ApiClient {
         'Content-Type': 'application/json',
       },
       timeout: 60000, // 60 seconds timeout for large responses
+      // Send the API's primary-pin cookie so reads right after a write see it
+      withCredentials: true,
     });
 
     // Request interceptor to add auth token
@@ -28,6 +70,9 @@ class ApiClient {
             console.warn('API: Request to protected endpoint without token:', config.url);
           }
         }
+        if (Date.now() < this.pinPrimaryUntil) {
+          config.headers[PIN_PRIMARY_HEADER] = '1';
+        }
         // Log request for debugging
         if (config.url?.includes('/locations/')) {
           console.log('API: Request to /locations/', { url: config.url, hasToken: !!token });
@@ -40,6 +85,7 @@ class ApiClient {
     // Response interceptor to handle token refresh
     this.client.interceptors.response.use(
       (response) => {
+        this.rememberPrimaryPin(response.headers);
         // Log response for debugging
         if (response.config.url?.includes('/locations/')) {
           console.log('API: Response from /locations/', { status: response.status, dataLength: Array.isArray(response.data) ? response.data.length : 'N/A' });
@@ -48,6 +94,7 @@ class ApiClient {
       },
       async (error: AxiosError) => {
         const originalRequest = error.config as any;
+        this.rememberPrimaryPin(error.response?.headers);
         
         // Log error for debugging
         if (originalRequest?.url?.includes('/locations/')) {
@@ -160,19 +207,55 @@ class ApiClient {
     return this.client.post(`/access-requests/${id}/approve/`, data);
   }
 
+  async bulkApproveAccessRequests(ids: number[], sendOtp: boolean = true) {
+    return this.client.post('/access-requests/bulk-approve/', { ids, send_otp: sendOtp });
+  }
+
   async rejectAccessRequest(id: number, reason?: string) {
     return this.client.post(`/access-requests/${id}/reject/`, { reason });
   }
 
+  // Bulk lists can be fetched as ?format=columnar (smaller, faster to parse) and decoded to the usual shape
+  private getList(url: string, params?: any, columnar?: boolean) {
+    if (!columnar) return this.client.get(url, { params });
+    return this.client.get(url, {
+      params: { ...params, format: 'columnar' },
+      transformResponse: [...(axios.defaults.transformResponse as any[]), decodeColumnar],
+    });
+  }
+
   // Reports
-  async listReports(params?: any) {
-    return this.client.get('/reports/', { params });
+  async listReports(params?: any, options?: { columnar?: boolean }) {
+    return this.getList('/reports/', params, options?.columnar);
   }
 
   async createReport(data: any) {
     return this.client.post('/reports/create/', data);
   }
 
+  async upsertMyReport(date: string, data: any, options?: { ifMatch?: string; idempotencyKey?: string }) {
+    const headers: any = {};
+    if (options?.ifMatch) headers['If-Match'] = options.ifMatch;
+    if (options?.idempotencyKey) headers['Idempotency-Key'] = options.idempotencyKey;
+    return this.client.put(`/reports/me/${date}/`, data, { headers });
+  }
+
+  async submitReportRange(data: { date_from: string; date_to: string; status: string; location?: number | null; location_text?: string; notes?: string }) {
+    return this.client.post('/reports/range/', data);
+  }
+
+  async syncReports(mutations: any[]) {
+    return this.client.post('/reports/sync/', { mutations });
+  }
+
+  async getReportChanges(since: string) {
+    return this.client.get('/reports/changes/', { params: { since } });
+  }
+
+  async remindNonReporters(data: { date?: string; unit_ids?: number[] }) {
+    return this.client.post('/reports/remind/', data);
+  }
+
   async exportReports(params?: any) {
     return this.client.get('/reports/export/', {
       params,
@@ -191,8 +274,8 @@ class ApiClient {
   }
 
   // Units
-  async listUnits(params?: { parent_id?: number | null; unit_type?: string; id?: number; page?: number; page_size?: number }) {
-    return this.client.get('/units/', { params });
+  async listUnits(params?: { parent_id?: number | null; unit_type?: string; id?: number; page?: number; page_size?: number }, options?: { columnar?: boolean }) {
+    return this.getList('/units/', params, options?.columnar);
   }
 
   async getUnit(id: number) {
@@ -214,8 +297,8 @@ class ApiClient {
   }
 
   // Locations (Cities, Towns, Settlements)
-  async listLocations(params?: any) {
-    return this.client.get('/locations/', { params });
+  async listLocations(params?: any, options?: { columnar?: boolean }) {
+    return this.getList('/locations/', params, options?.columnar);
   }
 
   // Users
@@ -227,8 +310,8 @@ class ApiClient {
     return this.client.patch(`/profiles/${profileId}/`, data);
   }
 
-  async listApprovedUsers() {
-    return this.client.get('/users/approved/');
+  async listApprovedUsers(options?: { columnar?: boolean }) {
+    return this.getList('/users/approved/', undefined, options?.columnar);
   }
 
   async updateUserPermissions(userId: number, data: { role?: string; unit_id?: number | null }) {
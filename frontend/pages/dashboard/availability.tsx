@@ -554,23 +554,31 @@ export default function AvailabilityDashboard() {
     }
 
     setSendingOTPToAll(true);
-    let successCount = 0;
-    let failCount = 0;
-
-    for (const user of usersWithoutReports) {
-      try {
-        await api.requestOTP({ email: user.email });
-        successCount++;
-        // Small delay to avoid rate limiting
-        await new Promise(resolve => setTimeout(resolve, 200));
-      } catch (err: any) {
-        console.error(`Failed to send OTP to ${user.email}:`, err);
-        failCount++;
+    try {
+      // Same hierarchy as the filters: Team > Section > Branch > Unit
+      let unitIds: number[] = [];
+      if (selectedTeams.size > 0) {
+        unitIds = Array.from(selectedTeams);
+      } else if (selectedSections.size > 0) {
+        unitIds = Array.from(selectedSections);
+      } else if (selectedBranches.size > 0) {
+        unitIds = Array.from(selectedBranches);
+      } else if (selectedUnits.size > 0) {
+        unitIds = Array.from(selectedUnits);
+      } else if (selectedUnit) {
+        unitIds = [Number(selectedUnit)];
       }
-    }
 
-    alert(`קוד OTP נשלח ל-${successCount} משתמשים${failCount > 0 ? `. ${failCount} נכשלו` : ''}`);
-    setSendingOTPToAll(false);
+      // The server finds non-reporters and sends all codes in one batch
+      const response = await api.remindNonReporters(unitIds.length > 0 ? { unit_ids: unitIds } : {});
+      const { queued_count, rate_limited_count } = response.data;
+      alert(`קוד OTP נשלח ל-${queued_count} משתמשים${rate_limited_count > 0 ? `. ${rate_limited_count} דולגו עקב הגבלת קצב` : ''}`);
+    } catch (err: any) {
+      console.error('Failed to send OTP reminders:', err);
+      alert(`שגיאה בשליחת קוד OTP: ${err.response?.data?.error || err.message}`);
+    } finally {
+      setSendingOTPToAll(false);
+    }
   };
 
   const getStatusColor = (status: string) => {
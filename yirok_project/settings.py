@@ -51,6 +51,10 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    # gzip/brotli for API responses (static files are precompressed by WhiteNoise)
+    'core.middleware.CompressionMiddleware',
+    # Replica reads for safe requests; must wrap everything that touches the database
+    'core.routers.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -185,6 +189,41 @@ DATABASES = {
 
 logger.info(f"[DB CONFIG] Database configured: {DB_USER}@{DB_HOST}:{DB_PORT}/{DB_NAME} (SSL: {sslmode}, Pool: transaction)")
 
+# Optional read replica (core.routers): GET requests and export jobs read from it,
+# the primary is pinned after writes. Same URL format as DATABASE_URL; missing
+# parts default to the primary's.
+REPLICA_DATABASE_URL = os.getenv('REPLICA_DATABASE_URL')
+if REPLICA_DATABASE_URL:
+    import urllib.parse
+    try:
+        replica = urllib.parse.urlparse(REPLICA_DATABASE_URL)
+        DATABASES['replica'] = {
+            **DATABASES['default'],
+            'NAME': replica.path[1:] or DB_NAME,
+            'USER': replica.username or DB_USER,
+            'PASSWORD': replica.password or DB_PASS,
+            'HOST': replica.hostname or DB_HOST,
+            'PORT': str(replica.port) if replica.port else DB_PORT,
+            'OPTIONS': {
+                **DATABASES['default']['OPTIONS'],
+                'sslmode': urllib.parse.parse_qs(replica.query).get('sslmode', [sslmode])[0],
+            },
+            # Tests create only the primary; the replica alias reads the same test database
+            'TEST': {'MIRROR': 'default'},
+        }
+    except Exception as e:
+        logger.error(f"[DB CONFIG] Failed to parse REPLICA_DATABASE_URL: {e}")
+        raise ValueError(f"Invalid REPLICA_DATABASE_URL format: {e}")
+    logger.info(f"[DB CONFIG] Read replica configured: {DATABASES['replica']['HOST']}:{DATABASES['replica']['PORT']}")
+
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+# How long a client keeps reading from the primary after a write (should exceed replication lag)
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 10))
+REPLICA_PIN_COOKIE = 'pin_primary'
+# The same pin as a header, for the cross-site frontend: browsers do not keep SameSite=Lax
+# cookies from cross-site XHR, so the client echoes this header back instead
+REPLICA_PIN_HEADER = 'X-Pin-Primary'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -254,16 +293,34 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    # orjson-backed when orjson is installed, stock json otherwise (same output)
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'core.api.renderers.FastJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
+        'core.api.renderers.FastJSONParser',
         'rest_framework.parsers.FormParser',
         'rest_framework.parsers.MultiPartParser',
     ],
+    # Rates for core.ratelimit throttles on public endpoints
+    'DEFAULT_THROTTLE_RATES': {
+        'auth_ip': os.getenv('THROTTLE_AUTH_IP', '30/min'),
+        'auth_email': os.getenv('THROTTLE_AUTH_EMAIL', '10/min'),
+        # Opt-in alert on total auth traffic; it logs but never rejects (see GlobalAuthRateThrottle)
+        'auth_global': os.getenv('THROTTLE_AUTH_GLOBAL') or None,
+        'public_ip': os.getenv('THROTTLE_PUBLIC_IP', '300/min'),
+    },
+    # Number of trusted proxies in front of the app (for client IP detection). Render and
+    # Railway put one proxy in front that appends the real client IP to X-Forwarded-For;
+    # elsewhere default to 0 (REMOTE_ADDR), since None would trust a client-supplied header
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES') or (1 if os.getenv('RENDER') or os.getenv('RAILWAY_ENVIRONMENT') else 0)),
 }
 
+# Response compression (core.middleware.CompressionMiddleware)
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+# Never compressed: these return JWTs, which a compression side channel (BREACH) could leak
+COMPRESSION_EXCLUDE_PATHS = ('/api/auth/',)
+
 # JWT Settings
 from rest_framework_simplejwt.settings import api_settings
 
@@ -318,6 +375,14 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'if-match',
+    'idempotency-key',
+    'last-event-id',
+    'x-pin-primary',
+]
+CORS_EXPOSE_HEADERS = [
+    'etag',
+    'x-pin-primary',
 ]
 
 # Log CORS configuration
@@ -406,13 +471,80 @@ if SENTRY_DSN:
     )
 
 # Rate Limiting (simple in-memory cache for OTP)
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+# Set REDIS_URL to share rate-limit counters between workers/instances (requires the redis package)
+REDIS_URL = os.getenv('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+        }
     }
-}
+
+# Scoped response cache for list endpoints (core.api.response_cache); entries are
+# invalidated on model changes, the timeout only bounds how long dead entries linger
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', 300))
+
+# Cross-worker cache invalidation bus (core.cachebus): workers re-read the
+# CacheVersion counters at most this often, which bounds how stale they can be
+CACHE_BUS_CHECK_INTERVAL_MS = int(os.getenv('CACHE_BUS_CHECK_INTERVAL_MS', 1000))
+# PostgreSQL only: push bumps with LISTEN/NOTIFY and poll only as a safety net
+CACHE_BUS_LISTEN = os.getenv('CACHE_BUS_LISTEN', 'False').lower() == 'true'
+CACHE_BUS_LISTEN_POLL_MS = int(os.getenv('CACHE_BUS_LISTEN_POLL_MS', 30000))
 
 # OTP Rate Limiting
 OTP_RATE_LIMIT = int(os.getenv('OTP_RATE_LIMIT', 5))  # Max 5 OTP requests per hour per user
 OTP_EXPIRY_MINUTES = int(os.getenv('OTP_EXPIRY_MINUTES', 10))
+
+# Staff user import endpoint: hashes passwords in the request thread, so files with more
+# passwords than this must go through `python manage.py import_users` (process pool)
+USER_IMPORT_API_MAX_PASSWORDS = int(os.getenv('USER_IMPORT_API_MAX_PASSWORDS', 100))
+# A user gets at most one non-reporter reminder per cooldown, however many managers send them
+REPORT_REMINDER_COOLDOWN_SECONDS = int(os.getenv('REPORT_REMINDER_COOLDOWN_SECONDS', 3600))
+
+# Live report stream (Server-Sent Events)
+# Watermarks returned by /reports/changes/ and /reports/sync/ lag the server clock by this
+# much, so a write whose updated_at was stamped before a poll but committed after it is
+# still seen by the next poll. Must exceed the longest report write transaction; clients
+# may receive a row twice and dedupe by id + updated_at.
+REPORT_CHANGES_SAFETY_LAG_SECONDS = int(os.getenv('REPORT_CHANGES_SAFETY_LAG_SECONDS', 60))
+REPORT_STREAM_HEARTBEAT_SECONDS = int(os.getenv('REPORT_STREAM_HEARTBEAT_SECONDS', 15))
+REPORT_STREAM_MAX_SECONDS = int(os.getenv('REPORT_STREAM_MAX_SECONDS', 300))  # Client reconnects with Last-Event-ID
+REPORT_STREAM_RETRY_MS = int(os.getenv('REPORT_STREAM_RETRY_MS', 3000))
+# Each open stream holds a worker thread, so this per-process cap must stay below the
+# server's thread count (gunicorn --threads 32 in render.yaml/railway.json), leaving
+# threads for regular requests. Streams past the cap get 503 with Retry-After.
+REPORT_STREAM_MAX_CONNECTIONS = int(os.getenv('REPORT_STREAM_MAX_CONNECTIONS', 24))
+REPORT_STREAM_BUSY_RETRY_SECONDS = int(os.getenv('REPORT_STREAM_BUSY_RETRY_SECONDS', 15))
+
+# Periodic job scheduler (python manage.py run_scheduler)
+SCHEDULER_TICK_SECONDS = int(os.getenv('SCHEDULER_TICK_SECONDS', 30))
+SCHEDULER_LEASE_SECONDS = int(os.getenv('SCHEDULER_LEASE_SECONDS', 600))  # Must exceed the longest job run
+
+# Retention (python manage.py purge_retention, and scheduled purge jobs)
+RETENTION_OTP_TOKEN_DAYS = int(os.getenv('RETENTION_OTP_TOKEN_DAYS', 7))
+RETENTION_REJECTED_ACCESS_REQUEST_DAYS = int(os.getenv('RETENTION_REJECTED_ACCESS_REQUEST_DAYS', 180))
+RETENTION_REPORT_TOMBSTONE_DAYS = int(os.getenv('RETENTION_REPORT_TOMBSTONE_DAYS', 30))
+RETENTION_JOB_RUN_DAYS = int(os.getenv('RETENTION_JOB_RUN_DAYS', 30))
+RETENTION_BATCH_SIZE = int(os.getenv('RETENTION_BATCH_SIZE', 1000))  # Primary-key window per DELETE
+RETENTION_BATCH_SLEEP_SECONDS = float(os.getenv('RETENTION_BATCH_SLEEP_SECONDS', 0.2))
+
+# Monthly report partitions on PostgreSQL (core.partitions, maintained by a daily job)
+REPORT_PARTITION_MONTHS_AHEAD = int(os.getenv('REPORT_PARTITION_MONTHS_AHEAD', 3))
+REPORT_PARTITION_BRIN_AFTER_MONTHS = int(os.getenv('REPORT_PARTITION_BRIN_AFTER_MONTHS', 2))
+
+# Cold storage for old reports (python manage.py archive_reports, core.archive)
+REPORT_ARCHIVE_DIR = os.getenv('REPORT_ARCHIVE_DIR', str(BASE_DIR / 'archive' / 'reports'))
+REPORT_ARCHIVE_AFTER_DAYS = int(os.getenv('REPORT_ARCHIVE_AFTER_DAYS', 180))
+
+# Fail list serialization that issues per-row queries (core.api.eager); on by default under tests
+import sys
+TESTING = (len(sys.argv) > 1 and sys.argv[1] == 'test') or 'pytest' in sys.modules
+SERIALIZER_QUERY_CHECKS = os.getenv('SERIALIZER_QUERY_CHECKS', str(TESTING)).lower() == 'true'